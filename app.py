@@ -3,6 +3,14 @@ import pandas as pd
 import random
 from datetime import datetime, date, timedelta
 import time
+import os
+from src.occupancy import OccupancyGrid, free_starts
+from src.jobs import JobRunner, DONE, FAILED
+from src.schedule_store import ScheduleStore
+from src.schema import load_courses
+from src.constraints import CLASS, DEFAULT_CONSTRAINTS, FACULTY, MAX_CLASS_HOURS, MAX_FACULTY_HOURS, ROOM
+from src.availability import AVAILABILITY_CONFIG, Availability
+from src.timegrid import clock_floor, parse_clock
 
 # Page Configuration
 st.set_page_config(
@@ -13,18 +21,43 @@ st.set_page_config(
 )
 
 # ================== DATA LOADING FUNCTIONS ==================
+DATA_FILES = ['timetable_data.csv', 'rooms_config.csv', 'time_config.csv', 'days_config.csv', AVAILABILITY_CONFIG]
+
+def file_signature(path):
+    """(mtime, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+def dataset_signature():
+    """Signature of all input files; changes whenever any of them is edited"""
+    return tuple((path, file_signature(path)) for path in DATA_FILES)
+
+@st.cache_data(show_spinner=False)
+def _read_csv_cached(path, signature):
+    return pd.read_csv(path)
+
+def read_csv_cached(path):
+    """Read a CSV once per file version instead of on every rerun"""
+    return _read_csv_cached(path, file_signature(path))
+
+@st.cache_data(show_spinner=False)
+def _load_courses_cached(path, signature):
+    return load_courses(path)
+
 def load_courses_data():
-    """Load courses data from CSV"""
+    """Load courses data through the typed course schema"""
     try:
-        df = pd.read_csv('timetable_data.csv')
-        # Ensure required columns exist
+        df = _load_courses_cached('timetable_data.csv', file_signature('timetable_data.csv'))
+        # The portals also need Code and Type beyond the schema's required columns
         required_columns = ['Class', 'Subject', 'Hours', 'Faculty', 'Code', 'Type']
         for col in required_columns:
             if col not in df.columns:
                 st.error(f"Required column '{col}' not found in timetable_data.csv")
                 return pd.DataFrame()
         
-        df['Hours'] = pd.to_numeric(df['Hours'], errors='coerce').fillna(0).astype(int)
         return df
     except Exception as e:
         st.error(f"Error loading timetable_data.csv: {e}")
@@ -33,7 +66,7 @@ def load_courses_data():
 def load_rooms_config():
     """Load rooms configuration"""
     try:
-        return pd.read_csv('rooms_config.csv')
+        return read_csv_cached('rooms_config.csv')
     except:
         st.warning("Using default rooms configuration")
         return pd.DataFrame({
@@ -49,7 +82,7 @@ def load_rooms_config():
 def load_time_config():
     """Load time slots configuration from 8 AM to 5 PM"""
     try:
-        time_df = pd.read_csv('time_config.csv')
+        time_df = read_csv_cached('time_config.csv')
         return time_df
     except:
         st.warning("Using default time configuration (8 AM - 5 PM)")
@@ -65,7 +98,7 @@ def load_time_config():
 def load_days_config():
     """Load working days configuration"""
     try:
-        days_df = pd.read_csv('days_config.csv')
+        days_df = read_csv_cached('days_config.csv')
         return days_df[days_df['Working'] == 'Yes']['Day'].tolist()
     except:
         st.warning("Using default days configuration")
@@ -100,6 +133,10 @@ def initialize_session_state():
         st.session_state.timetable_data = None
     if 'generation_attempts' not in st.session_state:
         st.session_state.generation_attempts = 0
+    if 'generation_seed' not in st.session_state:
+        st.session_state.generation_seed = 0
+    if 'reported_job_failure' not in st.session_state:
+        st.session_state.reported_job_failure = None
 
 # ================== HELPER FUNCTIONS ==================
 def get_unique_faculty(df):
@@ -240,158 +277,160 @@ def get_unique_semesters(df):
 
 # ================== IMPROVED CLASH RESOLVER ==================
 class AdvancedClashResolver:
-    def __init__(self):
-        self.room_schedule = {}  # (day, time, room) -> class
-        self.faculty_schedule = {}  # (day, time, faculty) -> class
-        self.class_schedule = {}  # (day, time, class) -> room
-        self.subject_day_schedule = {}  # (class, subject, day) -> count
-        self.daily_class_hours = {}  # (class, day) -> hours
-        self.daily_faculty_hours = {}  # (faculty, day) -> hours
-        self.room_utilization = {}  # room -> list of (day, time)
-        self.faculty_workload = {}  # faculty -> total hours
+    def __init__(self, time_slots=None, availability=None, earliest=None):
+        # Bookings live only on the bitmask grids; daily hours are their popcounts
+        self.time_slots = list(time_slots or [])
+        self.slot_index = {slot: i for i, slot in enumerate(self.time_slots)}
+        self.room_grid = OccupancyGrid(len(self.slot_index))
+        self.faculty_grid = OccupancyGrid(len(self.slot_index))
+        self.class_grid = OccupancyGrid(len(self.slot_index))
+        self.subject_days = set()  # (class, subject, day) already taught
+        # Fixed lectures and unavailability / blackout windows (availability_config.csv)
+        self.availability = availability or Availability()
+        self.slot_minutes = {}  # time slot -> (start, end) minutes
+        self.earliest = earliest  # first start of a 12-hour time config (src.timegrid.clock_floor)
+    
+    def _slot(self, time_slot):
+        """Index of a time slot string on the occupancy grids"""
+        if time_slot not in self.slot_index:
+            self.slot_index[time_slot] = len(self.slot_index)
+            self.time_slots.append(time_slot)
+        return self.slot_index[time_slot]
+    
+    def _minutes(self, time_slot):
+        """(start, end) minutes after midnight of a 'start-end' time slot string"""
+        if time_slot not in self.slot_minutes:
+            start_text, end_text = time_slot.split('-')
+            start = parse_clock(start_text, earliest=self.earliest)
+            self.slot_minutes[time_slot] = (start, parse_clock(end_text, after=start, earliest=self.earliest))
+        return self.slot_minutes[time_slot]
+    
+    def is_allowed(self, day, time_slot, room, faculty, class_name):
+        """False if the availability config rules the slot out for this room, faculty or class"""
+        if not self.availability.windows:
+            return True
+        start, end = self._minutes(time_slot)
+        return not (self.availability.is_blocked(ROOM, room, day, start, end)
+                    or self.availability.is_blocked(FACULTY, faculty, day, start, end)
+                    or self.availability.is_blocked(CLASS, class_name, day, start, end))
     
     def check_and_resolve_clash(self, day, time_slot, room, faculty, class_name, subject):
         """Check for clashes and suggest alternatives"""
         clashes = []
+        slot = self._slot(time_slot)
         
         # Check room availability
-        room_key = (day, time_slot, room)
-        if room_key in self.room_schedule:
-            clashes.append(f"Room {room} already occupied by {self.room_schedule[room_key]}")
+        if not self.room_grid.is_free(room, day, slot):
+            clashes.append(f"Room {room} already occupied on {day} at {time_slot}")
         
         # Check faculty availability
-        faculty_key = (day, time_slot, faculty)
-        if faculty_key in self.faculty_schedule:
-            clashes.append(f"Faculty {faculty} already teaching {self.faculty_schedule[faculty_key]}")
+        if not self.faculty_grid.is_free(faculty, day, slot):
+            clashes.append(f"Faculty {faculty} already teaching on {day} at {time_slot}")
         
         # Check class availability
-        class_key = (day, time_slot, class_name)
-        if class_key in self.class_schedule:
-            clashes.append(f"Class {class_name} already has class in {self.class_schedule[class_key]}")
+        if not self.class_grid.is_free(class_name, day, slot):
+            clashes.append(f"Class {class_name} already has a class on {day} at {time_slot}")
         
         # Check subject per day limit (max 1 per day)
-        subject_key = (class_name, subject, day)
-        if subject_key in self.subject_day_schedule:
+        if (class_name, subject, day) in self.subject_days:
             clashes.append(f"Subject {subject} already scheduled for {class_name} on {day}")
         
-        # Check daily class limit (max 4 hours per day)
-        class_day_key = (class_name, day)
-        if class_day_key in self.daily_class_hours and self.daily_class_hours[class_day_key] >= 4:
-            clashes.append(f"Class {class_name} already has 4 hours on {day}")
+        # Check daily class limit (class_hours rule)
+        max_class_hours = DEFAULT_CONSTRAINTS.limit('class_hours', MAX_CLASS_HOURS)
+        if self.class_grid.hours(class_name, day) >= max_class_hours:
+            clashes.append(f"Class {class_name} already has {max_class_hours} hours on {day}")
         
-        # Check daily faculty limit (max 5 hours per day)
-        faculty_day_key = (faculty, day)
-        if faculty_day_key in self.daily_faculty_hours and self.daily_faculty_hours[faculty_day_key] >= 5:
-            clashes.append(f"Faculty {faculty} already has 5 hours on {day}")
+        # Check daily faculty limit (faculty_hours rule)
+        max_faculty_hours = DEFAULT_CONSTRAINTS.limit('faculty_hours', MAX_FACULTY_HOURS)
+        if self.faculty_grid.hours(faculty, day) >= max_faculty_hours:
+            clashes.append(f"Faculty {faculty} already has {max_faculty_hours} hours on {day}")
         
         return clashes
     
     def add_schedule(self, day, time_slot, room, faculty, class_name, subject):
         """Add schedule to tracker"""
-        room_key = (day, time_slot, room)
-        faculty_key = (day, time_slot, faculty)
-        class_key = (day, time_slot, class_name)
-        subject_key = (class_name, subject, day)
-        class_day_key = (class_name, day)
-        faculty_day_key = (faculty, day)
-        
-        # Add to trackers
-        self.room_schedule[room_key] = class_name
-        self.faculty_schedule[faculty_key] = class_name
-        self.class_schedule[class_key] = room
-        self.subject_day_schedule[subject_key] = 1
-        
-        # Update daily hours
-        if class_day_key not in self.daily_class_hours:
-            self.daily_class_hours[class_day_key] = 0
-        self.daily_class_hours[class_day_key] += 1
-        
-        if faculty_day_key not in self.daily_faculty_hours:
-            self.daily_faculty_hours[faculty_day_key] = 0
-        self.daily_faculty_hours[faculty_day_key] += 1
-        
-        # Update faculty workload
-        if faculty not in self.faculty_workload:
-            self.faculty_workload[faculty] = 0
-        self.faculty_workload[faculty] += 1
-        
-        # Update room utilization
-        if room not in self.room_utilization:
-            self.room_utilization[room] = []
-        self.room_utilization[room].append((day, time_slot))
+        slot = self._slot(time_slot)
+        self.room_grid.occupy(room, day, slot)
+        self.faculty_grid.occupy(faculty, day, slot)
+        self.class_grid.occupy(class_name, day, slot)
+        self.subject_days.add((class_name, subject, day))
     
-    def find_alternative_slot(self, course, days_list, time_slots, rooms_by_type, used_slots):
-        """Find alternative slot for a course"""
-        course_type = course['Type']
+    def find_alternative_slot(self, course, days_list, rooms_by_type, used_slots):
+        """Find alternative slot for a course from the occupancy grids
+        
+        Days are tried least loaded first for the class; on each day only the
+        slots free for both the class and the faculty member (free_starts of
+        their combined masks) are tried, each with the first free, allowed
+        room of the course's type. Without a clash-free option the allowed
+        option with the fewest clashes is returned (None if there is none).
+        """
         subject = course['Subject']
         class_name = course['Class']
+        if course['Type'] == 'Lab':
+            rooms = rooms_by_type['lab'] or ['Lab-001']
+        else:
+            rooms = rooms_by_type['lecture'] or ['Room-001']
         
         # Get faculty (handle multiple faculty)
-        faculty_str = str(course['Faculty'])
-        if ';' in faculty_str:
-            faculty_options = [f.strip() for f in faculty_str.split(';')]
-        else:
-            faculty_options = [faculty_str.strip()]
+        faculty_options = [f.strip() for f in str(course['Faculty']).split(';')]
         
-        max_attempts_per_faculty = 50
-        best_slot = None
-        min_clashes = float('inf')
+        def option(day, time_slot, room, faculty, clashes):
+            start_text, end_text = time_slot.split('-')
+            return {
+                'day': day,
+                'time_slot': time_slot,
+                'time_display': f"{start_text} to {end_text}",
+                'room': room,
+                'faculty': faculty,
+                'clashes': clashes
+            }
         
+        n_slots = len(self.time_slots)
+        days = sorted(days_list, key=lambda day: self.class_grid.hours(class_name, day))
         for faculty in faculty_options:
-            for attempt in range(max_attempts_per_faculty):
-                # Try different days
-                for day in random.sample(days_list, len(days_list)):
-                    # Try different time slots
-                    for time_idx in random.sample(range(len(time_slots)), len(time_slots)):
-                        time_slot = time_slots[time_idx]
-                        time_display = f"{time_slot.split('-')[0]} to {time_slot.split('-')[1]}"
-                        
-                        # Check if this slot already tried
-                        slot_key = (day, time_slot, class_name, subject)
-                        if slot_key in used_slots:
+            for day in days:
+                busy = self.class_grid.mask(class_name, day) | self.faculty_grid.mask(faculty, day)
+                for slot in free_starts(busy, 1, n_slots):
+                    time_slot = self.time_slots[slot]
+                    if (day, time_slot, class_name, subject) in used_slots:
+                        continue
+                    for room in rooms:
+                        if not self.room_grid.is_free(room, day, slot):
+                            continue
+                        if not self.is_allowed(day, time_slot, room, faculty, class_name):
+                            continue
+                        if not self.check_and_resolve_clash(day, time_slot, room, faculty, class_name, subject):
+                            return option(day, time_slot, room, faculty, [])
+        
+        # No clash-free slot: fall back to the allowed option with the fewest clashes
+        best_slot = None
+        for faculty in faculty_options:
+            for day in days:
+                for time_slot in self.time_slots:
+                    if (day, time_slot, class_name, subject) in used_slots:
+                        continue
+                    for room in rooms:
+                        if not self.is_allowed(day, time_slot, room, faculty, class_name):
                             continue
-                        
-                        # Select appropriate room
-                        if course_type == 'Lab':
-                            room = random.choice(rooms_by_type['lab']) if rooms_by_type['lab'] else 'Lab-001'
-                        else:
-                            room = random.choice(rooms_by_type['lecture']) if rooms_by_type['lecture'] else 'Room-001'
-                        
-                        # Check for clashes
                         clashes = self.check_and_resolve_clash(day, time_slot, room, faculty, class_name, subject)
-                        
-                        if not clashes:
-                            return {
-                                'day': day,
-                                'time_slot': time_slot,
-                                'time_display': time_display,
-                                'room': room,
-                                'faculty': faculty,
-                                'clashes': []
-                            }
-                        elif len(clashes) < min_clashes:
-                            min_clashes = len(clashes)
-                            best_slot = {
-                                'day': day,
-                                'time_slot': time_slot,
-                                'time_display': time_display,
-                                'room': room,
-                                'faculty': faculty,
-                                'clashes': clashes
-                            }
-                        
-                        used_slots.add(slot_key)
+                        if best_slot is None or len(clashes) < len(best_slot['clashes']):
+                            best_slot = option(day, time_slot, room, faculty, clashes)
         
         return best_slot
 
 # ================== IMPROVED TIMETABLE GENERATOR ==================
-def generate_optimized_timetable(courses_df, rooms_df, time_df, days_list, class_name=None, faculty_name=None):
-    """Generate optimized timetable with advanced clash resolution"""
+def generate_optimized_timetable(courses_df, rooms_df, time_df, days_list, class_name=None, faculty_name=None, seed=None, progress=None, availability=None):
+    """Generate optimized timetable with advanced clash resolution
+    
+    progress, if given, is called as progress(courses_done=..., courses_total=...)
+    after each course is scheduled. availability (src.availability.Availability)
+    fixes lectures before anything else is placed and rules out the slots its
+    unavailability and blackout windows cover.
+    """
     if courses_df.empty or rooms_df.empty or time_df.empty:
         return pd.DataFrame()
     
-    # Initialize clash resolver
-    resolver = AdvancedClashResolver()
+    rng = random.Random(seed)
     
     # Filter courses
     if class_name:
@@ -412,6 +451,9 @@ def generate_optimized_timetable(courses_df, rooms_df, time_df, days_list, class
         time_slots.append(f"{slot['Start_Time']}-{slot['End_Time']}")
         time_display_list.append(f"{slot['Start_Time']} to {slot['End_Time']}")
     
+    # Initialize clash resolver
+    resolver = AdvancedClashResolver(time_slots, availability, clock_floor(time_df.to_dict('records')))
+    
     # Get rooms by type
     rooms_by_type = {
         'lecture': rooms_df[rooms_df['Type'] == 'Lecture']['Room'].tolist(),
@@ -425,24 +467,64 @@ def generate_optimized_timetable(courses_df, rooms_df, time_df, days_list, class
     
     timetable = []
     clash_log = []
+    warnings = []  # shown by the caller; this may run in a background job thread
     used_slots = set()
     
+    # Fixed lectures: one session per matching course at the slot starting at Start_Time
+    fixed_hours = {}  # (class, subject) -> sessions already fixed
+    for entry in resolver.availability.fixed():
+        time_idx = next((i for i, slot in enumerate(time_slots) if resolver._minutes(slot)[0] == entry.start), None)
+        if entry.day not in days_list or time_idx is None:
+            continue
+        matches = class_courses[class_courses['Subject'] == entry.subject]
+        if entry.class_name:
+            matches = matches[matches['Class'] == entry.class_name]
+        for _, course in matches.iterrows():
+            time_slot = time_slots[time_idx]
+            faculty = str(course['Faculty']).split(';')[0].strip()
+            candidates = [entry.room] if entry.room else (
+                rooms_by_type['lab'] if course['Type'] == 'Lab' else rooms_by_type['lecture'])
+            # The fixed time wins over people's windows; rooms still avoid blackouts when they can
+            start, end = resolver._minutes(time_slot)
+            open_rooms = [r for r in candidates
+                          if not resolver.availability.is_blocked(ROOM, r, entry.day, start, end)] or candidates
+            room = next((r for r in open_rooms if not resolver.check_and_resolve_clash(
+                entry.day, time_slot, r, faculty, course['Class'], course['Subject'])),
+                open_rooms[0] if open_rooms else 'Room-001')
+            
+            resolver.add_schedule(entry.day, time_slot, room, faculty, course['Class'], course['Subject'])
+            timetable.append({
+                'Class': course['Class'],
+                'Subject': course['Subject'],
+                'Faculty': course['Faculty'],
+                'Code': course['Code'],
+                'Type': course['Type'],
+                'Day': entry.day,
+                'Time': time_display_list[time_idx],
+                'Time_Slot': time_slot,
+                'Room': room,
+                'Status': '📌 Fixed'
+            })
+            key = (course['Class'], course['Subject'])
+            fixed_hours[key] = fixed_hours.get(key, 0) + 1
+            used_slots.add((entry.day, time_slot, course['Class'], course['Subject']))
+    
     # First pass: Schedule all courses without clashes if possible
-    for _, course in class_courses.iterrows():
+    for course_number, (_, course) in enumerate(class_courses.iterrows(), start=1):
         hours_needed = int(course['Hours'])
         subject = course['Subject']
         class_name_course = course['Class']
         course_type = course['Type']
         
         # Track scheduled hours for this course
-        scheduled_hours = 0
+        scheduled_hours = fixed_hours.get((class_name_course, subject), 0)
         
         while scheduled_hours < hours_needed:
             # Get faculty (handle multiple faculty)
             faculty_str = str(course['Faculty'])
             if ';' in faculty_str:
                 faculty_options = [f.strip() for f in faculty_str.split(';')]
-                faculty = random.choice(faculty_options)
+                faculty = rng.choice(faculty_options)
             else:
                 faculty = faculty_str.strip()
             
@@ -455,18 +537,22 @@ def generate_optimized_timetable(courses_df, rooms_df, time_df, days_list, class
                 attempts += 1
                 
                 # Try different days
-                day = random.choice(days_list)
+                day = rng.choice(days_list)
                 
                 # Try different time slots
-                time_idx = random.randint(0, len(time_slots) - 1)
+                time_idx = rng.randint(0, len(time_slots) - 1)
                 time_slot = time_slots[time_idx]
                 time_display = time_display_list[time_idx]
                 
                 # Select appropriate room
                 if course_type == 'Lab':
-                    room = random.choice(rooms_by_type['lab']) if rooms_by_type['lab'] else 'Lab-001'
+                    room = rng.choice(rooms_by_type['lab']) if rooms_by_type['lab'] else 'Lab-001'
                 else:
-                    room = random.choice(rooms_by_type['lecture']) if rooms_by_type['lecture'] else 'Room-001'
+                    room = rng.choice(rooms_by_type['lecture']) if rooms_by_type['lecture'] else 'Room-001'
+                
+                # Unavailable / blacked-out slots are never used
+                if not resolver.is_allowed(day, time_slot, room, faculty, class_name_course):
+                    continue
                 
                 # Check for clashes
                 clashes = resolver.check_and_resolve_clash(day, time_slot, room, faculty, class_name_course, subject)
@@ -474,7 +560,7 @@ def generate_optimized_timetable(courses_df, rooms_df, time_df, days_list, class
                 if not clashes:
                     # Check if this subject already scheduled for this class on this day
                     subject_key = (class_name_course, subject, day)
-                    if subject_key in resolver.subject_day_schedule:
+                    if subject_key in resolver.subject_days:
                         continue
                     
                     resolver.add_schedule(day, time_slot, room, faculty, class_name_course, subject)
@@ -499,7 +585,7 @@ def generate_optimized_timetable(courses_df, rooms_df, time_df, days_list, class
             # If no slot found after attempts, use alternative method
             if not slot_found:
                 alt_slot = resolver.find_alternative_slot(
-                    course, days_list, time_slots, rooms_by_type, used_slots
+                    course, days_list, rooms_by_type, used_slots
                 )
                 
                 if alt_slot:
@@ -540,15 +626,85 @@ def generate_optimized_timetable(courses_df, rooms_df, time_df, days_list, class
                     used_slots.add((alt_slot['day'], alt_slot['time_slot'], class_name_course, subject))
                 else:
                     # Force schedule with minimum clashes
-                    st.warning(f"Could not find suitable slot for {subject} in {class_name_course}")
+                    warnings.append(f"Could not find suitable slot for {subject} in {class_name_course}")
                     break
+        
+        if progress:
+            progress(courses_done=course_number, courses_total=len(class_courses))
     
-    # Create DataFrame
+    # Create DataFrame; the clash log and warnings travel with it so cached results keep them
     timetable_df = pd.DataFrame(timetable) if timetable else pd.DataFrame()
+    timetable_df.attrs['clash_log'] = clash_log
+    timetable_df.attrs['warnings'] = warnings
+    
+    return timetable_df
+
+@st.cache_resource
+def get_job_runner():
+    """Background scheduling pool shared by every session of this server process"""
+    return JobRunner(max_workers=2)
+
+def get_schedule_store(courses_df, rooms_df, time_df, days_list):
+    """The global schedule for the current dataset version, built in the background.
+    
+    Shows live progress and reruns the script until the job is done; returns
+    None if generation failed. The job's warnings are shown here, in the
+    script thread. A failed job's error is shown once; the next run retries
+    with the next seed.
+    """
+    runner = get_job_runner()
+    key = ('global_schedule', dataset_signature(), st.session_state.generation_seed, tuple(days_list))
+    
+    job_id = runner.latest(key)
+    if job_id is not None and job_id == st.session_state.reported_job_failure:
+        st.session_state.generation_seed += 1
+        key = ('global_schedule', dataset_signature(), st.session_state.generation_seed, tuple(days_list))
+        job_id = runner.latest(key)
+    seed = st.session_state.generation_seed
+    
+    if job_id is None:
+        def task(report):
+            timetable_df = generate_optimized_timetable(courses_df, rooms_df, time_df, days_list,
+                                                        seed=seed, progress=report,
+                                                        availability=Availability.from_config(
+                                                            AVAILABILITY_CONFIG, clock_floor(time_df.to_dict('records'))))
+            return ScheduleStore(timetable_df, timetable_df.attrs.get('clash_log'), timetable_df.attrs.get('warnings'))
+        job_id = runner.submit(task, key=key)
+    
+    job = runner.status(job_id)
+    if job['status'] == DONE:
+        store = runner.result(job_id)
+        for warning in store.warnings:
+            st.warning(warning)
+        return store
+    if job['status'] == FAILED:
+        st.session_state.reported_job_failure = job_id
+        st.error(f"Schedule generation failed: {job['error'].splitlines()[0]}")
+        return None
+    
+    progress = job['progress']
+    done = progress.get('courses_done', 0)
+    total = progress.get('courses_total', 0)
+    st.progress(done / total if total else 0.0,
+                text=f"Building the institution-wide schedule... {done}/{total or '?'} courses")
+    time.sleep(0.5)
+    st.rerun()
+
+def get_timetable(courses_df, rooms_df, time_df, days_list, class_name=None, faculty_name=None):
+    """Class or faculty view sliced from the global schedule"""
+    store = get_schedule_store(courses_df, rooms_df, time_df, days_list)
+    if store is None:
+        return pd.DataFrame()
+    if class_name:
+        timetable_df = store.for_class(class_name)
+    elif faculty_name:
+        timetable_df = store.for_faculty(faculty_name)
+    else:
+        timetable_df = store.timetable
     
     # Store clash log in session state
-    if clash_log:
-        st.session_state.clash_log = clash_log
+    if timetable_df.attrs.get('clash_log'):
+        st.session_state.clash_log = timetable_df.attrs['clash_log']
     
     return timetable_df
 
@@ -712,11 +868,11 @@ def show_student_portal(courses_df, rooms_df, time_df, days_list):
         
         st.header(f"📋 Timetable for Class {selected_class}")
         st.write("AI-Generated Clash-Free Schedule")
-        st.write("✅ One subject per day | ⏰ 8:00 AM to 5:00 PM | 📌 Max 4 hours per day per class")
+        st.write(f"✅ One subject per day | ⏰ 8:00 AM to 5:00 PM | 📌 Max {MAX_CLASS_HOURS} hours per day per class")
         
         with st.spinner(f"Generating optimal timetable for {selected_class}..."):
             # Generate timetable
-            timetable_df = generate_optimized_timetable(
+            timetable_df = get_timetable(
                 courses_df, rooms_df, time_df, days_list, selected_class
             )
             
@@ -901,7 +1057,7 @@ def show_teacher_profile(courses_df, rooms_df, time_df, days_list):
         # Generate and display schedule
         if generate_clicked:
             with st.spinner(f"Generating schedule for {selected_faculty}..."):
-                faculty_timetable = generate_optimized_timetable(
+                faculty_timetable = get_timetable(
                     courses_df, rooms_df, time_df, days_list, faculty_name=selected_faculty
                 )
                 
@@ -910,19 +1066,19 @@ def show_teacher_profile(courses_df, rooms_df, time_df, days_list):
                     st.session_state.view_faculty_schedule[selected_faculty] = faculty_timetable
                     
                     # Display schedule
-                    display_faculty_schedule(faculty_timetable, selected_faculty, view_option)
+                    display_faculty_schedule(faculty_timetable, selected_faculty, view_option, days_list)
                 else:
                     st.warning(f"No schedule could be generated for {selected_faculty}")
         
         # Display existing schedule if available
         elif selected_faculty in st.session_state.view_faculty_schedule:
             faculty_timetable = st.session_state.view_faculty_schedule[selected_faculty]
-            display_faculty_schedule(faculty_timetable, selected_faculty, view_option)
+            display_faculty_schedule(faculty_timetable, selected_faculty, view_option, days_list)
     
     else:
         st.info(f"No teaching assignments found for {selected_faculty}")
 
-def display_faculty_schedule(timetable_df, faculty_name, view_option):
+def display_faculty_schedule(timetable_df, faculty_name, view_option, days_list):
     """Display faculty schedule"""
     if timetable_df.empty:
         return
@@ -966,7 +1122,6 @@ def display_faculty_schedule(timetable_df, faculty_name, view_option):
             st.info("No classes scheduled for today!")
         
         # Tomorrow's preview
-        days_list = load_days_config()
         if today in days_list:
             today_index = days_list.index(today)
             tomorrow_index = (today_index + 1) % len(days_list)
@@ -987,7 +1142,6 @@ def display_faculty_schedule(timetable_df, faculty_name, view_option):
     else:
         st.subheader("📅 Weekly Teaching Schedule")
         
-        days_list = load_days_config()
         for day in days_list:
             st.write(f"#### {day}")
             day_classes = timetable_df[timetable_df['Day'] == day]
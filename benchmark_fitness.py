@@ -0,0 +1,141 @@
+import argparse
+import random
+import time
+from collections import Counter
+
+from src.constraints import CLASS, FACULTY, ROOM, Coverage, DailyLimit, OncePerDay, SlotClash
+from src.ga_timetable import GeneticAlgorithmTimetable
+
+
+def reference_fitness(ga, individual):
+    """Reference scoring: a plain scan of one timetable, independent of the rule kernels.
+
+    Counts bookings per (entity, day, slot), lectures per (class, subject,
+    day), periods per (entity, day) and per (class, subject), then charges
+    each active rule of ga.constraints by its type, scope, weight and limit.
+    """
+    blocks = ga.problem.blocks
+    placed = individual.placed_blocks()
+    if len(placed) == 0:
+        return 0
+
+    bookings = {ROOM: Counter(), FACULTY: Counter(), CLASS: Counter()}
+    daily = {FACULTY: Counter(), CLASS: Counter()}
+    subject_days = Counter()
+    scheduled = Counter()
+    for b in placed:
+        block = blocks[b]
+        day, start, room = int(individual.day[b]), int(individual.slot[b]), int(individual.room[b])
+        entities = {ROOM: [room], FACULTY: block.faculty, CLASS: [block.class_id]}
+        for scope, ids in entities.items():
+            for entity in ids:
+                for slot in range(start, start + block.duration):
+                    bookings[scope][(entity, day, slot)] += 1
+                if scope in daily:
+                    daily[scope][(entity, day)] += block.duration
+        subject_days[(block.class_id, block.subject_id, day)] += 1
+        scheduled[(block.class_id, block.subject_id)] += block.duration
+
+    penalty = 0
+    for rule in ga.constraints:
+        if isinstance(rule, SlotClash):
+            penalty += rule.weight * sum(count - 1 for count in bookings[rule.scope].values())
+        elif isinstance(rule, OncePerDay):
+            penalty += rule.weight * sum(count - 1 for count in subject_days.values())
+        elif isinstance(rule, DailyLimit):
+            limit = ga.problem.periods(rule.limit)
+            penalty += rule.weight * sum(max(periods - limit, 0) for periods in daily[rule.scope].values())
+        elif isinstance(rule, Coverage):
+            penalty += rule.weight * sum(max(required - scheduled[key], 0)
+                                         for key, required in ga.problem.required_periods.items())
+        else:
+            raise ValueError(f"No reference scoring for rule {rule!r}")
+    return max(1000 - penalty, 1)
+
+
+def random_move(ga, individual, rng=random):
+    block = rng.randrange(len(individual))
+    if rng.random() < 0.1:
+        return (block, -1, -1, -1)
+    duration = ga.problem.blocks[block].duration
+    return (block,
+            rng.randrange(ga.grid.n_days),
+            rng.choice(ga.grid.starts(duration)),
+            rng.choice(ga.problem.blocks[block].rooms))
+
+
+def check_delta_evaluator(ga, population, moves):
+    """Apply random moves through DeltaEvaluator and compare with full re-scoring."""
+    mismatches = 0
+    delta_time = 0.0
+    full_time = 0.0
+    for individual in population:
+        individual = individual.copy()
+        evaluator = ga.make_evaluator(individual)
+        for _ in range(moves):
+            move = random_move(ga, individual)
+
+            started = time.perf_counter()
+            predicted = evaluator.delta(move)
+            before = evaluator.penalty
+            evaluator.apply(move)
+            delta_time += time.perf_counter() - started
+
+            started = time.perf_counter()
+            full = ga.calculate_fitness(individual)
+            full_time += time.perf_counter() - started
+
+            if evaluator.penalty - before != predicted or evaluator.fitness() != full:
+                mismatches += 1
+    return mismatches, delta_time, full_time
+
+
+def timed(fn, population, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        results = [fn(individual) for individual in population]
+    return results, (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-check fast fitness paths against reference scoring")
+    parser.add_argument("--csv", default="timetable_data.csv")
+    parser.add_argument("--population", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--moves", type=int, default=200, help="random moves per individual for the delta check")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    ga = GeneticAlgorithmTimetable(csv_file=args.csv)
+    print(f"Problem: {ga.problem.summary()}")
+
+    population = [ga.create_individual() for _ in range(args.population)]
+    # Drop some genes so the coverage rule is exercised
+    for individual in population[::2]:
+        for b in random.sample(range(len(individual)), len(individual) // 5):
+            individual.day[b] = -1
+
+    reference, reference_time = timed(lambda ind: reference_fitness(ga, ind), population, args.repeat)
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        batch = ga.calculate_fitness_batch(population)
+    batch_time = (time.perf_counter() - started) / args.repeat
+    mismatches = sum(1 for a, b in zip(reference, batch) if a != b)
+    print(f"Reference scan : {reference_time * 1000:8.2f} ms / population")
+    print(f"Batch fitness  : {batch_time * 1000:8.2f} ms / population")
+    print(f"Speedup        : {reference_time / max(batch_time, 1e-9):8.1f}x")
+    print(f"Mismatches     : {mismatches} / {len(population)}")
+
+    move_mismatches, delta_time, full_time = check_delta_evaluator(ga, population, args.moves)
+    n_moves = len(population) * args.moves
+    print(f"Delta moves    : {delta_time / n_moves * 1e6:8.2f} us / move")
+    print(f"Full re-score  : {full_time / n_moves * 1e6:8.2f} us / move")
+    print(f"Move mismatches: {move_mismatches} / {n_moves}")
+
+    if mismatches or move_mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
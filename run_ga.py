@@ -1,25 +1,100 @@
-from src.ga_timetable import GeneticAlgorithmTimetable
+import argparse
+import time
+from src.engines import ENGINES, ENGINE_LABELS
+from src.reschedule import Rescheduler, load_changeset
+from src.result_cache import ResultCache
 import pandas as pd
 
+def reschedule(changeset_file):
+    """Update final_timetable.csv for a changeset instead of regenerating it."""
+    print(f"♻️ Rescheduling final_timetable.csv with changes from {changeset_file}...")
+    previous = pd.read_csv("final_timetable.csv")
+    rescheduler = Rescheduler.from_csv("timetable_data.csv", load_changeset(changeset_file))
+    timetable, fitness, diff = rescheduler.run(previous)
+    
+    summary = rescheduler.last_reschedule
+    print(f"✅ Re-solved {summary['resolved']} blocks ({summary['displaced']} displaced), "
+          f"{summary['pinned']} pinned, in {summary['elapsed_ms']} ms. Fitness Score: {fitness}")
+    
+    pd.DataFrame(timetable).to_csv("final_timetable.csv", index=False)
+    diff.to_csv("timetable_diff.csv", index=False)
+    changes = diff[diff['Change'] != 'unchanged']
+    print(f"📄 Timetable saved as final_timetable.csv; {len(changes)} changed lectures in timetable_diff.csv\n")
+    if len(changes):
+        print(changes.to_string(index=False))
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate final_timetable.csv from timetable_data.csv")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="ga",
+                        help="ga: genetic algorithm; sa: simulated annealing; "
+                             "cp: backtracking search that can prove feasibility")
+    parser.add_argument("--polish", type=int, default=0, metavar="ITERATIONS",
+                        help="anneal the GA's best timetable for this many iterations")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always run the GA instead of reusing a stored result for the same inputs")
+    parser.add_argument("--reschedule", metavar="CHANGESET",
+                        help="JSON changeset to apply to final_timetable.csv without a full run")
+    args = parser.parse_args()
+    
+    if args.reschedule:
+        reschedule(args.reschedule)
+        return
+    
     print("======================================================================")
     print("INTELLIGENT TIMETABLE SCHEDULING SYSTEM")
     print("Using Genetic Algorithm with Clash Resolution")
     print("======================================================================\n")
     
-    ga = GeneticAlgorithmTimetable(csv_file="timetable_data.csv")
+    ga = ENGINES[args.engine](csv_file="timetable_data.csv")
     
     print("📂 Loading data from timetable_data.csv...")
     print(f"Columns loaded: {ga.df.columns.tolist()}\n")
     
-    print("🧬 Running Genetic Algorithm...")
-    timetable, fitness = ga.run(generations=150, population_size=50)
+    domains = ga.domains.summary()
+    if domains['pinned'] or domains['restricted']:
+        print(f"📌 availability_config.csv: {domains['pinned']} fixed lectures, "
+              f"{domains['restricted']} with restricted slots or rooms\n")
+    for problem in ga.domains.unmatched:
+        print(f"⚠️ availability_config.csv: {problem} (row ignored)")
+    for problem in ga.domains.pin_problems(ga.constraints):
+        print(f"⚠️ availability_config.csv: {problem} (scored as a penalty)")
+    
+    print(f"🧬 Running {ENGINE_LABELS[args.engine]}...")
+    started = time.perf_counter()
+    cache = None if args.no_cache else ResultCache()
+    timetable, fitness = ga.run(generations=150, population_size=50, polish_iterations=args.polish, cache=cache)
+    print(f"⏱️ {args.engine} engine finished in {time.perf_counter() - started:.2f}s")
+    
+    cached = getattr(ga, 'last_cache', None)
+    if cached == 'hit':
+        print("💾 Same inputs and parameters as a stored run: reused its timetable (--no-cache to re-run)")
+    elif cached == 'warm':
+        print("💾 Warm-started from the best stored timetable for these inputs")
+    
+    if args.engine == 'cp':
+        search = ga.last_search
+        print(f"🔎 Search {search['status']}: {search['nodes']} nodes, "
+              f"{search['unplaced_periods']} unplaced periods (lower bound {search['lower_bound']})")
+    if (args.engine == 'sa' or args.polish) and cached != 'hit':
+        anneal = ga.last_anneal
+        print(f"🔥 Annealing: {anneal['evaluations']} move evaluations, "
+              f"fitness {anneal['start_fitness']} → {anneal['best_fitness']} ({anneal['elapsed_ms']} ms)")
     
     if timetable:
         print(f"\n✅ Timetable generated successfully! Fitness Score: {fitness}")
+        if args.engine == 'ga' and cached != 'hit':
+            repair = ga.last_repair
+            print(f"🔧 Repair removed {repair['clashes_removed']} clashes in {repair['moves']} moves ({repair['elapsed_ms']} ms)")
         df_tt = pd.DataFrame(timetable)
         df_tt.to_csv("final_timetable.csv", index=False)
-        print("📄 Timetable saved as final_timetable.csv\n")
+        print("📄 Timetable saved as final_timetable.csv")
+        
+        if args.engine == 'ga' and cached != 'hit':
+            print(f"📈 Run: {ga.last_report.summary()}")
+            ga.last_report.to_json("run_report.json")
+            ga.last_report.to_csv("run_report.csv")
+            print("📄 Run report saved as run_report.json / run_report.csv")
+        print()
         
         # Show timetable per class
         print("📊 Daily Timetable per Class:\n")
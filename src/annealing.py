@@ -0,0 +1,165 @@
+import math
+import random
+import time
+
+from src.ga_timetable import GeneticAlgorithmTimetable
+from src.genome import UNPLACED
+from src.operators import random_placement
+
+# on_checkpoint (and the engine's on_generation) is called every CHECKPOINT iterations
+CHECKPOINT = 500
+
+
+class SimulatedAnnealing:
+    """Single-solution search on a DeltaEvaluator.
+
+    Each iteration proposes a relocation of one block to a random
+    (day, start, room), a swap of the time slots of two blocks of equal
+    duration, or (drop_rate) taking a block out of the timetable, which
+    pays when its missing hours cost less than the limits it breaks. The
+    move is scored incrementally by DeltaEvaluator.apply (O(block
+    duration) instead of a full fitness pass, undone if rejected) and
+    accepted by the Metropolis rule.
+    The temperature cools geometrically from initial_temperature to
+    final_temperature over the run. Recently moved blocks are tabu for
+    tabu_tenure iterations unless the move beats the best penalty so far.
+    """
+
+    def __init__(self, ga, iterations=20000, initial_temperature=60.0, final_temperature=0.5,
+                 swap_rate=0.3, drop_rate=0.05, tabu_tenure=10):
+        self.ga = ga
+        self.iterations = iterations
+        self.initial_temperature = initial_temperature
+        self.final_temperature = final_temperature
+        self.swap_rate = swap_rate
+        self.drop_rate = drop_rate
+        self.tabu_tenure = tabu_tenure
+
+    def search(self, individual, rng=None, time_limit_s=None, on_checkpoint=None, movable=None):
+        """Anneal a copy of individual; returns (best individual, stats dict).
+
+        movable restricts the moves to those block ids; the rest stay pinned.
+        Fixed lectures of the availability config never move.
+        """
+        rng = rng or random
+        started = time.perf_counter()
+        deadline = started + time_limit_s if time_limit_s is not None else None
+
+        current = individual.copy()
+        evaluator = self.ga.make_evaluator(current)
+        best, best_penalty = current.copy(), evaluator.penalty
+        start_fitness = evaluator.fitness()
+
+        blocks = self.ga.problem.blocks
+        domains = self.ga.domains
+        if movable is None:
+            movable = domains.movable
+        elif domains.restricted:
+            allowed = set(domains.movable)
+            movable = [b for b in movable if b in allowed]
+        else:
+            movable = [b for b in movable if blocks[b].rooms]
+        by_duration = {}
+        for b in movable:
+            by_duration.setdefault(blocks[b].duration, []).append(b)
+
+        temperature = self.initial_temperature
+        cooling = (self.final_temperature / self.initial_temperature) ** (1.0 / max(self.iterations, 1))
+        tabu_until = {}
+        evaluations = accepted = 0
+        iteration = 0
+
+        for iteration in range(1, self.iterations + 1):
+            if deadline is not None and iteration % 64 == 0 and time.perf_counter() >= deadline:
+                break
+
+            moves = self.propose(current, movable, by_duration, rng)
+            if moves is None:
+                continue
+            evaluations += 1
+
+            # Score the (one- or two-block) move by applying it; undone below if rejected
+            undo = [(b, int(current.day[b]), int(current.slot[b]), int(current.room[b])) for b, *_ in moves]
+            change = sum(evaluator.apply(move) for move in moves)
+
+            is_tabu = any(tabu_until.get(b, 0) > iteration for b, *_ in moves)
+            aspiration = evaluator.penalty < best_penalty
+            if (not is_tabu or aspiration) and (
+                    change <= 0 or rng.random() < math.exp(-change / temperature)):
+                accepted += 1
+                for b, *_ in moves:
+                    tabu_until[b] = iteration + self.tabu_tenure
+                if evaluator.penalty < best_penalty:
+                    best, best_penalty = current.copy(), evaluator.penalty
+            else:
+                for move in reversed(undo):
+                    evaluator.apply(move)
+
+            temperature *= cooling
+            if on_checkpoint and iteration % CHECKPOINT == 0:
+                on_checkpoint(iteration, max(1000 - best_penalty, 1), evaluator.fitness())
+
+        stats = {
+            'iterations': iteration,
+            'evaluations': evaluations,
+            'accepted': accepted,
+            'start_fitness': start_fitness,
+            'best_fitness': max(1000 - best_penalty, 1),
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+        }
+        return best, stats
+
+    def propose(self, individual, movable, by_duration, rng):
+        """A list of moves (block, day, slot, room) changing one or two blocks."""
+        if not movable:
+            return None
+
+        b = rng.choice(movable)
+        domains = self.ga.domains
+        placed = int(individual.day[b]) != UNPLACED
+        if placed and b not in domains.pinned and rng.random() < self.drop_rate:
+            return [(b, UNPLACED, UNPLACED, UNPLACED)]
+
+        if placed and rng.random() < self.swap_rate:
+            partners = by_duration[self.ga.problem.blocks[b].duration]
+            other = rng.choice(partners)
+            if other != b and int(individual.day[other]) != UNPLACED:
+                moves = [
+                    (b, int(individual.day[other]), int(individual.slot[other]), int(individual.room[b])),
+                    (other, int(individual.day[b]), int(individual.slot[b]), int(individual.room[other])),
+                ]
+                if not domains.restricted or all(domains.allows(*move) for move in moves):
+                    return moves
+
+        day, slot, room = random_placement(self.ga, b, rng)
+        return [(b, day, slot, room)]
+
+
+class AnnealingTimetable(GeneticAlgorithmTimetable):
+    """Simulated annealing engine with the GA's interface and output format.
+
+    Starts from one constructive-greedy individual and anneals it with
+    the same penalties as calculate_fitness.
+    """
+
+    def run(self, iterations=20000, seed=None, time_budget_s=None, on_generation=None, **ignored):
+        """Anneal one timetable; returns (timetable, fitness) like the GA.
+
+        on_generation receives a progress dict every CHECKPOINT iterations;
+        a summary is kept in self.last_anneal.
+        """
+        rng = random.Random(seed)
+        individual = self.create_greedy_individual(rng)
+
+        def on_checkpoint(iteration, best_fitness, current_fitness):
+            if on_generation:
+                on_generation({
+                    'generation': iteration // CHECKPOINT - 1,
+                    'generations': iterations // CHECKPOINT,
+                    'best_fitness': best_fitness,
+                    'current_fitness': current_fitness,
+                })
+
+        best = self.polish(individual, iterations, rng, time_budget_s, on_checkpoint)
+        fitness = self.calculate_fitness(best)
+        return (self.decode(best) if len(best.placed_blocks()) else None), fitness
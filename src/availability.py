@@ -0,0 +1,374 @@
+import os
+from collections import namedtuple
+
+import pandas as pd
+
+from src.constraints import CLASS, FACULTY, ROOM
+from src.occupancy import OccupancyGrid, free_starts, span_mask
+from src.timegrid import format_clock, parse_clock
+
+AVAILABILITY_CONFIG = 'availability_config.csv'
+
+# Kind column of availability_config.csv
+FIXED = 'fixed'              # one lecture pinned to a day, start (and room)
+UNAVAILABLE = 'unavailable'  # a faculty member or class cannot be scheduled in a window
+BLACKOUT = 'blackout'        # a room cannot be used in a window
+KINDS = (FIXED, UNAVAILABLE, BLACKOUT)
+
+# One config row; start / end are minutes after midnight, None (and '' for names) where left open
+Entry = namedtuple('Entry', ['kind', 'class_name', 'subject', 'faculty', 'room', 'day', 'start', 'end'])
+
+
+def _parse_entry(row, path, line, earliest=None):
+    def field(name):
+        return str(row.get(name, '')).strip()
+
+    def error(message):
+        return ValueError(f"❌ {path} line {line}: {message}")
+
+    kind = field('Kind').lower()
+    if kind not in KINDS:
+        raise error(f"unknown Kind {field('Kind')!r} (expected one of {list(KINDS)})")
+    try:
+        start = parse_clock(field('Start_Time'), earliest=earliest) if field('Start_Time') else None
+        end = parse_clock(field('End_Time'), after=start, earliest=earliest) if field('End_Time') else None
+    except ValueError:
+        raise error(f"bad time {field('Start_Time')!r} / {field('End_Time')!r}")
+    if start is not None and end is not None and end <= start:
+        raise error("window ends before it starts")
+
+    entry = Entry(kind, field('Class'), field('Subject'), field('Faculty'), field('Room'),
+                  field('Day') or None, start, end)
+    if kind == FIXED and not (entry.subject and entry.day and start is not None):
+        raise error("a fixed lecture needs Subject, Day and Start_Time")
+    if kind == UNAVAILABLE and not (entry.faculty or entry.class_name):
+        raise error("an unavailable window needs Faculty or Class")
+    if kind == BLACKOUT and not entry.room:
+        raise error("a blackout needs Room")
+    return entry
+
+
+class Availability:
+    """Pinned and forbidden assignments read from availability_config.csv.
+
+    Columns: Kind, Class, Subject, Faculty, Room, Day, Start_Time, End_Time.
+
+    - fixed: one lecture of Subject (for Class, or for every class taking
+      it) starts on Day at Start_Time; End_Time selects the lecture by
+      length and Room pins the room as well;
+    - unavailable: Faculty (or Class) cannot be scheduled on Day between
+      Start_Time and End_Time;
+    - blackout: Room cannot be used on Day between Start_Time and End_Time.
+
+    A blank Day means every day and blank times the whole day. Entries
+    are kept by name; Domains applies them to a compiled problem.
+    """
+
+    def __init__(self, entries=()):
+        self.entries = tuple(entries)
+
+        # (scope, name) -> [(day or None, start or None, end or None)]
+        self.windows = {}
+        for entry in self.entries:
+            if entry.kind == UNAVAILABLE:
+                targets = [(FACULTY, entry.faculty)] if entry.faculty else [(CLASS, entry.class_name)]
+            elif entry.kind == BLACKOUT:
+                targets = [(ROOM, entry.room)]
+            else:
+                continue
+            for target in targets:
+                self.windows.setdefault(target, []).append((entry.day, entry.start, entry.end))
+
+    @classmethod
+    def from_config(cls, path=AVAILABILITY_CONFIG, earliest=None):
+        """Entries of an availability config; none if the file is missing.
+
+        earliest is the time grid's clock_floor, so bare times are read
+        as 12-hour exactly when time_config.csv is.
+        """
+        if not os.path.exists(path):
+            return cls()
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        return cls(_parse_entry(row, path, line, earliest) for line, row in enumerate(df.to_dict('records'), start=2))
+
+    def fixed(self):
+        return [entry for entry in self.entries if entry.kind == FIXED]
+
+    def is_blocked(self, scope, name, day, start, end):
+        """True if an unavailable / blackout window of name overlaps [start, end) on day."""
+        for window_day, window_start, window_end in self.windows.get((scope, name), ()):
+            if window_day is not None and window_day != day:
+                continue
+            if (window_end is None or start < window_end) and (window_start is None or end > window_start):
+                return True
+        return False
+
+    def key(self):
+        """Plain description of the entries for hashing (see src.result_cache)."""
+        return [list(entry) for entry in self.entries]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def availability_for(csv_file, grid=None):
+    """Availability from the availability_config.csv next to a course CSV, read with grid's clock."""
+    earliest = grid.clock_floor if grid is not None else None
+    return Availability.from_config(os.path.join(os.path.dirname(csv_file), AVAILABILITY_CONFIG), earliest)
+
+
+def _mask(starts):
+    mask = 0
+    for start in starts:
+        mask |= 1 << start
+    return mask
+
+
+def _starts(mask):
+    starts = []
+    while mask:
+        low = mask & -mask
+        starts.append(low.bit_length() - 1)
+        mask ^= low
+    return starts
+
+
+class Domains:
+    """Per-block domains of (day, start, room) values, reduced by an Availability before search.
+
+    A fixed entry reduces one lecture block to a single (day, start) and,
+    with a room, a single room. Faculty and class windows remove the
+    starts that overlap them; room blackouts take the room out for the
+    window and drop starts with no eligible room left. masks[b] holds
+    the allowed starts of block b per day as bitmasks, or None when the
+    block keeps the whole time grid, so engines without a config take
+    their usual paths. Every engine draws and checks placements here,
+    so pinned and forbidden assignments are never generated or mutated.
+    Entries that match nothing in the problem or grid are listed in
+    unmatched.
+    """
+
+    def __init__(self, problem, grid, availability=None):
+        self.availability = availability if availability is not None else Availability()
+        self.problem = problem
+        self.blocks = problem.blocks
+        self.grid = grid
+        self.n_days = grid.n_days
+        self.n_slots = grid.n_slots
+        self.unmatched = []
+
+        day_index = {day: i for i, day in enumerate(grid.days)}
+        room_index = {name: i for i, name in enumerate(problem.room_names)}
+        class_index = {name: i for i, name in enumerate(problem.class_names)}
+        faculty_index = self._faculty_index(problem)
+
+        # (entity id, day) -> slots a window takes, per scope
+        busy = {CLASS: {}, FACULTY: {}, ROOM: {}}
+        for (scope, name), windows in self.availability.windows.items():
+            if scope == FACULTY:
+                ids = faculty_index.get(name, ())
+            else:
+                index = class_index if scope == CLASS else room_index
+                ids = (index[name],) if name in index else ()
+            if not ids:
+                self.unmatched.append(f"{scope} {name!r} is not in the course or room data")
+                continue
+            for day, start, end in windows:
+                # Days off the grid (non-working) have nothing to block
+                days = range(self.n_days) if day is None else [day_index[day]] if day in day_index else []
+                mask = self.window_mask(start, end)
+                for entity in ids:
+                    for d in days:
+                        busy[scope][(entity, d)] = busy[scope].get((entity, d), 0) | mask
+
+        self.room_busy = busy[ROOM]
+        self.masks = [None] * len(self.blocks)
+        if busy[CLASS] or busy[FACULTY] or self.room_busy:
+            reduced = {}
+            for block in self.blocks:
+                key = (block.duration, block.class_id, block.faculty, block.rooms)
+                if key not in reduced:
+                    reduced[key] = self._reduce(block, busy[CLASS], busy[FACULTY])
+                self.masks[block.id] = reduced[key]
+
+        # block id -> (day, start, room id or None)
+        self.pinned = {}
+        for entry in self.availability.fixed():
+            self._pin(entry, problem, day_index, room_index)
+        self.fixed = {b: pin for b, pin in self.pinned.items() if pin[2] is not None}
+
+        self.movable = tuple(block.id for block in self.blocks if block.rooms and block.id not in self.fixed
+                             and (self.masks[block.id] is None or any(self.masks[block.id])))
+        self.restricted = bool(self.pinned or self.room_busy or any(m is not None for m in self.masks))
+        self._placements = {}
+
+    @staticmethod
+    def _faculty_index(problem):
+        """Faculty name or id -> faculty ids; courses list names and ids in the same order."""
+        index = {name: {i} for i, name in enumerate(problem.faculty_names)}
+        for course in problem.courses:
+            names = [name.strip() for name in course.faculty_name.split(';')]
+            if len(names) == len(course.faculty):
+                for name, f in zip(names, course.faculty):
+                    index.setdefault(name, set()).add(f)
+        return index
+
+    def window_mask(self, start=None, end=None):
+        """Bitmask of the grid slots overlapping [start, end) minutes; None leaves a side open."""
+        mask = 0
+        for i, (slot_start, slot_end) in enumerate(self.grid.slots):
+            if (end is None or slot_start < end) and (start is None or slot_end > start):
+                mask |= 1 << i
+        return mask
+
+    def _reduce(self, block, class_busy, faculty_busy):
+        """Allowed start masks per day for block, or None if nothing is removed."""
+        base = self.grid.start_masks.get(block.duration, 0)
+        blacked_out = [r for r in block.rooms if any((r, d) in self.room_busy for d in range(self.n_days))]
+        masks = []
+        for day in range(self.n_days):
+            taken = class_busy.get((block.class_id, day), 0)
+            for f in block.faculty:
+                taken |= faculty_busy.get((f, day), 0)
+            allowed = _mask(free_starts(taken, block.duration, self.n_slots, base)) if taken else base
+            if blacked_out:
+                # A start stays if any eligible room is clear for the whole span
+                with_room = 0
+                for r in block.rooms:
+                    with_room |= _mask(free_starts(self.room_busy.get((r, day), 0), block.duration,
+                                                   self.n_slots, allowed))
+                allowed = with_room
+            masks.append(allowed)
+        return tuple(masks) if any(mask != base for mask in masks) else None
+
+    def _pin(self, entry, problem, day_index, room_index):
+        where = f"{entry.subject!r}{' for ' + entry.class_name if entry.class_name else ''} " \
+                f"on {entry.day} at {format_clock(entry.start)}"
+        day = day_index.get(entry.day)
+        start = self.grid.slot_at.get(format_clock(entry.start))
+        room = room_index.get(entry.room) if entry.room else None
+        if day is None or start is None or (entry.room and room is None):
+            self.unmatched.append(f"fixed {where}: day, start or room is not on the grid")
+            return
+
+        duration = None
+        if entry.end is not None:
+            located = self.grid.locate(format_clock(entry.start), format_clock(entry.end))
+            if located is None:
+                self.unmatched.append(f"fixed {where}: end time is not on the grid")
+                return
+            duration = located[1]
+
+        courses = {course.id for course in problem.courses if course.subject == entry.subject
+                   and (not entry.class_name or course.class_name == entry.class_name)}
+        if not courses:
+            self.unmatched.append(f"fixed {where}: no such course")
+            return
+
+        # One block per matching course: the first not yet pinned that fits the start
+        for course in sorted(courses):
+            block = next((b for b in self.blocks if b.course == course and b.rooms and b.id not in self.pinned
+                          and (duration is None or b.duration == duration)
+                          and start in self.grid.starts(b.duration)), None)
+            if block is None or (room is not None and room not in block.rooms):
+                self.unmatched.append(f"fixed {where}: no lecture of that length and room type left to pin")
+                continue
+            self.masks[block.id] = tuple(1 << start if d == day else 0 for d in range(self.n_days))
+            self.pinned[block.id] = (day, start, room)
+
+    def placements(self, b):
+        """Allowed (day, start) values of block b, day by day."""
+        masks = self.masks[b]
+        key = masks if masks is not None else self.blocks[b].duration
+        values = self._placements.get(key)
+        if values is None:
+            if masks is None:
+                starts = self.grid.starts(self.blocks[b].duration)
+                values = [(day, start) for day in range(self.n_days) for start in starts]
+            else:
+                values = [(day, start) for day, mask in enumerate(masks) for start in _starts(mask)]
+            self._placements[key] = values
+        return values
+
+    def free_starts(self, b, busy, day):
+        """Allowed starts of block b on day that are clear of the `busy` bitmask."""
+        masks = self.masks[b]
+        duration = self.blocks[b].duration
+        if masks is None:
+            return self.grid.free_starts(busy, duration)
+        return free_starts(busy, duration, self.n_slots, masks[day])
+
+    def rooms(self, b, day, start):
+        """Rooms block b may use from start on day, smallest adequate first."""
+        pin = self.pinned.get(b)
+        if pin is not None and pin[2] is not None:
+            return (pin[2],)
+        block = self.blocks[b]
+        if not self.room_busy:
+            return block.rooms
+        span = span_mask(start, block.duration)
+        rooms = tuple(r for r in block.rooms if not self.room_busy.get((r, day), 0) & span)
+        # A fixed lecture keeps its time even if every eligible room is blacked out then
+        return rooms if rooms or pin is None else block.rooms
+
+    def pin_room(self, b, room_grid):
+        """Room for pinned block b: the one it names, else the first allowed room free
+        in room_grid, else the first allowed room; None if the block has no room at all."""
+        day, start, room = self.pinned[b]
+        if room is not None:
+            return room
+        options = self.rooms(b, day, start)
+        span = span_mask(start, self.blocks[b].duration)
+        return next((r for r in options if not room_grid.mask(r, day) & span), options[0] if options else None)
+
+    def pin_problems(self, constraints):
+        """Fixed lectures that cannot be kept as given: no room, or more pinned periods
+        in a class or faculty day than the daily limits of constraints allow."""
+        problems = []
+        totals = {CLASS: {}, FACULTY: {}}
+        for b, (day, start, room) in self.pinned.items():
+            block = self.blocks[b]
+            if room is None and not self.rooms(b, day, start):
+                problems.append(f"fixed {self.problem.subject_names[block.subject_id]!r} for "
+                                f"{self.problem.class_names[block.class_id]} has no eligible room")
+            for scope, ids in ((CLASS, (block.class_id,)), (FACULTY, block.faculty)):
+                for entity in ids:
+                    totals[scope][(entity, day)] = totals[scope].get((entity, day), 0) + block.duration
+
+        limits = {CLASS: ('class_hours', self.problem.class_names),
+                  FACULTY: ('faculty_hours', self.problem.faculty_names)}
+        for scope, (rule, names) in limits.items():
+            limit = constraints.period_limit(rule, self.problem, self.n_slots)
+            for (entity, day), periods in sorted(totals[scope].items()):
+                if periods > limit:
+                    problems.append(f"fixed lectures give {scope} {names[entity]} {periods} periods on "
+                                    f"{self.grid.days[day]}, over the daily limit of {limit}")
+        return problems
+
+    def allows(self, b, day, start, room):
+        """True if (day, start, room) is in block b's domain (start assumed valid on the grid)."""
+        masks = self.masks[b]
+        if masks is not None and not masks[day] >> start & 1:
+            return False
+        pin = self.pinned.get(b)
+        if pin is not None and pin[2] is not None:
+            return room == pin[2]
+        return not self.room_busy.get((room, day), 0) & span_mask(start, self.blocks[b].duration)
+
+    def room_grid(self):
+        """Room OccupancyGrid with the blackout windows already taken."""
+        rooms = OccupancyGrid(self.n_slots)
+        rooms.masks.update(self.room_busy)
+        return rooms
+
+    def summary(self):
+        return {
+            'pinned': len(self.pinned),
+            'restricted': sum(1 for b, mask in enumerate(self.masks) if mask is not None and b not in self.pinned),
+            'no_options': sum(1 for block in self.blocks if block.rooms and not self.placements(block.id)),
+            'unmatched': len(self.unmatched),
+        }
+
+    def key(self):
+        """Plain description for hashing (see src.result_cache); the grid and problem are hashed there."""
+        return self.availability.key()
@@ -0,0 +1,30 @@
+import numpy as np
+
+from src.constraints import DEFAULT_CONSTRAINTS, ProblemTables
+
+
+class BatchFitness:
+    """Scores a whole population at once with NumPy.
+
+    Genomes are stacked into flat arrays of placed genes and every active
+    rule's full kernel is a bincount over (individual, day, slot, entity)
+    style keys (see src.constraints). The result matches
+    GeneticAlgorithmTimetable.calculate_fitness.
+    """
+
+    def __init__(self, problem, n_days, n_slots, constraints=DEFAULT_CONSTRAINTS):
+        self.tables = ProblemTables(problem, n_days, n_slots)
+        self.constraints = constraints
+
+    def score(self, population):
+        """Fitness of every individual, as a list of ints."""
+        if not population:
+            return []
+
+        penalty, placed_any = self.constraints.full(self.tables, population)
+        fitness = np.maximum(1000 - penalty, 1)
+        fitness[~placed_any] = 0
+        return fitness.tolist()
+
+    def breakdown(self, individual):
+        return self.constraints.breakdown(self.tables, individual)
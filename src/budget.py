@@ -0,0 +1,55 @@
+import time
+
+
+class Budget:
+    """Stop conditions for one GA run.
+
+    time_budget_s caps wall-clock time from start() (construction and
+    evolution; the final repair only gets what is left), max_evaluations
+    caps fitness evaluations, target_fitness stops as soon as it is
+    reached, and patience stops after that many generations without
+    improvement once the best fitness is above patience_min_fitness
+    (None: at any fitness). None disables the other conditions.
+    """
+
+    def __init__(self, time_budget_s=None, max_evaluations=None, target_fitness=None,
+                 patience=20, patience_min_fitness=500):
+        self.time_budget_s = time_budget_s
+        self.max_evaluations = max_evaluations
+        self.target_fitness = target_fitness
+        self.patience = patience
+        self.patience_min_fitness = patience_min_fitness
+        self.deadline = None
+
+    def start(self):
+        if self.time_budget_s is not None:
+            self.deadline = time.perf_counter() + self.time_budget_s
+        return self
+
+    def remaining_s(self):
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.perf_counter())
+
+    def out_of_time(self):
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def evaluations_left(self, evaluations):
+        if self.max_evaluations is None:
+            return None
+        return max(0, self.max_evaluations - evaluations)
+
+    def exhausted(self, evaluations):
+        """True once evaluations have reached max_evaluations."""
+        return self.max_evaluations is not None and evaluations >= self.max_evaluations
+
+    def stop_reason(self, best_fitness, stagnant_generations):
+        """Why the run should stop after a generation, or None to go on."""
+        if self.target_fitness is not None and best_fitness >= self.target_fitness:
+            return 'target_fitness'
+        if (self.patience is not None and stagnant_generations > self.patience
+                and (self.patience_min_fitness is None or best_fitness > self.patience_min_fitness)):
+            return 'stagnation'
+        if self.out_of_time():
+            return 'time_budget'
+        return None
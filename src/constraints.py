@@ -1,49 +1,449 @@
-class TimetableConstraints:
-    def __init__(self):
-        self.fixed_slots = {
-            'Math': ('Monday', '08:00-09:00'),
-            'ESC': ('Friday', '10:00-11:00'),
-        }
-    
-    def check_clashes(self, timetable):
-        """Check for any clashes in timetable."""
-        clashes = []
-        
-        # Check for same room same time
-        room_time = {}
-        for i, entry in enumerate(timetable):
-            key = (entry['Day'], entry['Time'], entry['Room'])
-            if key in room_time:
-                clashes.append(f"Room clash: {entry['Room']} at {entry['Day']} {entry['Time']}")
-            room_time[key] = entry
-        
-        # Check for same faculty same time
-        faculty_time = {}
-        for i, entry in enumerate(timetable):
-            key = (entry['Day'], entry['Time'], entry['Faculty'])
-            if key in faculty_time:
-                clashes.append(f"Faculty clash: {entry['Faculty']} at {entry['Day']} {entry['Time']}")
-            faculty_time[key] = entry
-        
-        return clashes
-    
-    def calculate_fitness(self, timetable):
-        """Calculate fitness score."""
-        fitness = 100
-        
-        # Penalize clashes
-        clashes = self.check_clashes(timetable)
-        fitness -= len(clashes) * 10
-        
-        # Check room utilization
-        room_usage = {}
-        for entry in timetable:
-            room = entry['Room']
-            room_usage[room] = room_usage.get(room, 0) + 1
-        
-        # Penalize underutilized rooms
-        for usage in room_usage.values():
-            if usage < 2:
-                fitness -= 5
-        
-        return max(fitness, 1)
\ No newline at end of file
+import numpy as np
+
+from src.genome import UNPLACED
+from src.timegrid import hours_to_periods
+
+# What a rule counts violations over
+ROOM = 'room'
+FACULTY = 'faculty'
+CLASS = 'class'
+DAY = 'day'
+COURSE = 'course'
+
+# Default weights and limits; the rule set below is the single place they are used from
+ROOM_CLASH = 100
+FACULTY_CLASH = 75
+CLASS_CLASH = 80
+SUBJECT_PER_DAY = 50
+CLASS_HOURS = 40
+FACULTY_HOURS = 30
+MISSING_HOURS = 10
+MAX_CLASS_HOURS = 4
+MAX_FACULTY_HOURS = 5
+
+
+class Rule:
+    """One declarative scoring rule.
+
+    A rule declares its name, weight, scope (what a violation is counted
+    over) and, for limits, the limit. It supplies two kernels:
+
+    - full(population) -> NumPy array of penalties, one per individual
+      of a StackedPopulation (vectorized full evaluation);
+    - incremental(problem, n_days, n_slots) -> a kernel object with
+      add(b, day, start, room) / remove(...) returning the penalty change
+      of placing / unplacing one block (used for single-gene moves).
+
+    base_penalty is the penalty of an empty timetable (non-zero only for
+    coverage rules). hard rules are the ones a clash-free timetable meets.
+    """
+
+    hard = False
+
+    def __init__(self, name, scope, weight, limit=None):
+        self.name = name
+        self.scope = scope
+        self.weight = weight
+        self.limit = limit
+
+    def with_weight(self, weight):
+        return type(self)(self.name, self.scope, weight, self.limit)
+
+    def base_penalty(self, problem):
+        return 0
+
+    def full(self, population):
+        raise NotImplementedError
+
+    def incremental(self, problem, n_days, n_slots):
+        raise NotImplementedError
+
+    def __repr__(self):
+        limit = f", limit={self.limit}" if self.limit is not None else ''
+        return f"{type(self).__name__}({self.name!r}, {self.scope!r}, weight={self.weight}{limit})"
+
+
+class SlotClash(Rule):
+    """At most one booking of a room, faculty member or class per (day, slot)."""
+
+    hard = True
+
+    def full(self, population):
+        ind, day, slot, duration, entity, n_entities = population.entity_genes(self.scope)
+        cells = population.n_days * population.n_slots * n_entities
+        keys = [((ind * population.n_days + day) * population.n_slots + slot + h)[duration > h] * n_entities
+                + entity[duration > h] for h in range(population.max_duration)]
+        return self.weight * population.excess(keys, cells, 1)
+
+    def incremental(self, problem, n_days, n_slots):
+        return _SlotClashKernel(self, problem, n_days, n_slots)
+
+
+class OncePerDay(Rule):
+    """A class is taught a subject at most once a day."""
+
+    def full(self, population):
+        ind, day, pair = population.ind, population.day, population.pair
+        keys = (ind * population.n_pairs + pair) * population.n_days + day
+        return self.weight * population.excess([keys], population.n_pairs * population.n_days, 1)
+
+    def incremental(self, problem, n_days, n_slots):
+        return _OncePerDayKernel(self, problem, n_days)
+
+
+class DailyLimit(Rule):
+    """Hours a class or faculty member is taught per day, charged per period over the limit.
+
+    The limit is in hours and is compared in grid periods (see CompiledProblem.periods).
+    """
+
+    def full(self, population):
+        ind, day, _, duration, entity, n_entities = population.entity_genes(self.scope)
+        keys = (ind * n_entities + entity) * population.n_days + day
+        periods = np.bincount(keys, weights=duration, minlength=population.n_pop * n_entities * population.n_days)
+        periods = periods.reshape(population.n_pop, -1)
+        limit = hours_to_periods(self.limit, population.tables.period_minutes)
+        return self.weight * np.maximum(periods - limit, 0).sum(axis=1).astype(np.int64)
+
+    def incremental(self, problem, n_days, n_slots):
+        return _DailyLimitKernel(self, problem, n_days)
+
+
+class Coverage(Rule):
+    """Every (class, subject) gets its required weekly periods; charged per missing period."""
+
+    def base_penalty(self, problem):
+        return self.weight * sum(problem.required_periods.values())
+
+    def full(self, population):
+        keys = population.ind * population.n_pairs + population.pair
+        scheduled = np.bincount(keys, weights=population.duration,
+                                minlength=population.n_pop * population.n_pairs).reshape(population.n_pop, -1)
+        return self.weight * np.maximum(population.required - scheduled, 0).sum(axis=1).astype(np.int64)
+
+    def incremental(self, problem, n_days, n_slots):
+        return _CoverageKernel(self, problem)
+
+
+# ================== INCREMENTAL KERNELS ==================
+def _block_entities(problem, scope):
+    """Per-block entity ids for a scope; None for ROOM, whose entity is the gene's room."""
+    if scope == CLASS:
+        return [(b.class_id,) for b in problem.blocks], len(problem.class_names)
+    if scope == FACULTY:
+        return [b.faculty for b in problem.blocks], len(problem.faculty_names)
+    if scope == ROOM:
+        return None, len(problem.room_names)
+    raise ValueError(f"Unsupported scope for this rule: {scope!r}")
+
+
+class _SlotClashKernel:
+    """Flat counters indexed by (day * n_slots + slot) * n_entities + entity."""
+
+    def __init__(self, rule, problem, n_days, n_slots):
+        self.rule = rule
+        self.weight = rule.weight
+        self.n_slots = n_slots
+        self.duration = [b.duration for b in problem.blocks]
+        self.entities, self.n_entities = _block_entities(problem, rule.scope)
+        # Plain lists keep single-cell updates cheaper than NumPy scalar indexing
+        self.count = [0] * (n_days * n_slots * self.n_entities)
+
+    def _cells(self, b, day, start, room):
+        n = self.n_entities
+        first = day * self.n_slots + start
+        cells = range(first * n, (first + self.duration[b]) * n, n)
+        if self.entities is None:
+            return [cell + room for cell in cells]
+        return [cell + entity for entity in self.entities[b] for cell in cells]
+
+    def add(self, b, day, start, room):
+        count = self.count
+        clashes = 0
+        n = self.n_entities
+        first = (day * self.n_slots + start) * n
+        last = first + self.duration[b] * n
+        for entity in (room,) if self.entities is None else self.entities[b]:
+            for i in range(first + entity, last + entity, n):
+                if count[i]:
+                    clashes += 1
+                count[i] += 1
+        return clashes * self.weight
+
+    def remove(self, b, day, start, room):
+        count = self.count
+        clashes = 0
+        n = self.n_entities
+        first = (day * self.n_slots + start) * n
+        last = first + self.duration[b] * n
+        for entity in (room,) if self.entities is None else self.entities[b]:
+            for i in range(first + entity, last + entity, n):
+                count[i] -= 1
+                if count[i]:
+                    clashes += 1
+        return -clashes * self.weight
+
+    def clashes(self, b, day, start, room):
+        """True if block b's cells are shared with another booking."""
+        count = self.count
+        return any(count[i] > 1 for i in self._cells(b, day, start, room))
+
+    def excess(self):
+        return sum(c - 1 for c in self.count if c > 1)
+
+
+class _OncePerDayKernel:
+    """Blocks per (class, subject) pair and day, in a flat list."""
+
+    def __init__(self, rule, problem, n_days):
+        self.rule = rule
+        self.weight = rule.weight
+        self.n_days = n_days
+        pairs = {pair: i for i, pair in enumerate(problem.required_periods)}
+        self.pair = [pairs[(b.class_id, b.subject_id)] for b in problem.blocks]
+        self.count = [0] * (len(pairs) * n_days)
+
+    def add(self, b, day, start, room):
+        i = self.pair[b] * self.n_days + day
+        count = self.count[i]
+        self.count[i] = count + 1
+        return self.weight if count else 0
+
+    def remove(self, b, day, start, room):
+        i = self.pair[b] * self.n_days + day
+        count = self.count[i] - 1
+        self.count[i] = count
+        return -self.weight if count else 0
+
+
+class _DailyLimitKernel:
+    """Periods per (entity, day), in a flat list."""
+
+    def __init__(self, rule, problem, n_days):
+        self.rule = rule
+        self.weight = rule.weight
+        self.limit = problem.periods(rule.limit)
+        self.n_days = n_days
+        self.duration = [b.duration for b in problem.blocks]
+        self.entities, n_entities = _block_entities(problem, rule.scope)
+        self.hours = [0] * (n_entities * n_days)
+
+    def add(self, b, day, start, room):
+        duration, limit, hours = self.duration[b], self.limit, self.hours
+        over = 0
+        for entity in self.entities[b]:
+            i = entity * self.n_days + day
+            before = hours[i]
+            hours[i] = before + duration
+            over += _excess(before + duration, limit) - _excess(before, limit)
+        return over * self.weight
+
+    def remove(self, b, day, start, room):
+        duration, limit, hours = self.duration[b], self.limit, self.hours
+        over = 0
+        for entity in self.entities[b]:
+            i = entity * self.n_days + day
+            before = hours[i]
+            hours[i] = before - duration
+            over += _excess(before - duration, limit) - _excess(before, limit)
+        return over * self.weight
+
+
+class _CoverageKernel:
+    """Scheduled periods per (class, subject) pair, in a flat list."""
+
+    def __init__(self, rule, problem):
+        self.rule = rule
+        self.weight = rule.weight
+        pairs = {pair: i for i, pair in enumerate(problem.required_periods)}
+        self.pair = [pairs[(b.class_id, b.subject_id)] for b in problem.blocks]
+        self.duration = [b.duration for b in problem.blocks]
+        self.required = list(problem.required_periods.values())
+        self.scheduled = [0] * len(pairs)
+
+    def add(self, b, day, start, room):
+        i, duration = self.pair[b], self.duration[b]
+        hours, required = self.scheduled[i], self.required[i]
+        self.scheduled[i] = hours + duration
+        return -self.weight * (min(hours + duration, required) - min(hours, required))
+
+    def remove(self, b, day, start, room):
+        i, duration = self.pair[b], self.duration[b]
+        hours, required = self.scheduled[i], self.required[i]
+        self.scheduled[i] = hours - duration
+        return self.weight * (min(hours, required) - min(hours - duration, required))
+
+
+def _excess(hours, limit):
+    return hours - limit if hours > limit else 0
+
+
+# ================== FULL EVALUATION ==================
+class StackedPopulation:
+    """A population stacked into flat NumPy arrays of its placed genes.
+
+    ind/day/slot/room/duration/pair hold one entry per placed gene;
+    entity_genes(scope) expands them per entity of a scope (labs can have
+    several faculty). Full kernels are bincounts over these arrays.
+    """
+
+    def __init__(self, tables, population):
+        self.n_pop = len(population)
+        self.n_days = tables.n_days
+        self.n_slots = tables.n_slots
+        self.n_pairs = tables.n_pairs
+        self.required = tables.required
+        self.max_duration = tables.max_duration
+        self.tables = tables
+
+        days = np.stack([individual.day for individual in population]).astype(np.int64)
+        slots = np.stack([individual.slot for individual in population]).astype(np.int64)
+        rooms = np.stack([individual.room for individual in population]).astype(np.int64)
+        placed = days != UNPLACED
+        self.placed_any = placed.any(axis=1)
+
+        ind, gene = np.nonzero(placed)
+        self.ind, self.gene = ind, gene
+        self.day, self.slot, self.room = days[placed], slots[placed], rooms[placed]
+        self.duration = tables.duration[gene]
+        self.pair = tables.pair[gene]
+
+    def entity_genes(self, scope):
+        """(ind, day, slot, duration, entity, n_entities) per placed (gene, entity) of scope."""
+        tables = self.tables
+        if scope == ROOM:
+            return self.ind, self.day, self.slot, self.duration, self.room, tables.n_rooms
+        if scope == CLASS:
+            return self.ind, self.day, self.slot, self.duration, tables.class_id[self.gene], tables.n_classes
+
+        if scope == FACULTY:
+            # Repeat each placed gene once per faculty member
+            counts = tables.faculty_count[self.gene]
+            starts = tables.faculty_start[self.gene]
+            rows = np.repeat(np.arange(len(self.gene)), counts)
+            offsets = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+            entity = tables.faculty_id[np.repeat(starts, counts) + offsets]
+            return (self.ind[rows], self.day[rows], self.slot[rows], self.duration[rows],
+                    entity, tables.n_faculty)
+        raise ValueError(f"Unsupported scope for this rule: {scope!r}")
+
+    def excess(self, key_parts, cells_per_individual, limit):
+        """Sum over each individual's cells of max(count - limit, 0)."""
+        keys = np.concatenate(key_parts) if key_parts else np.empty(0, dtype=np.int64)
+        counts = np.bincount(keys, minlength=self.n_pop * cells_per_individual).reshape(self.n_pop, -1)
+        return np.maximum(counts - limit, 0).sum(axis=1)
+
+
+class ProblemTables:
+    """Per-gene NumPy lookup tables of a compiled problem, built once for full evaluation."""
+
+    def __init__(self, problem, n_days, n_slots):
+        self.n_days = n_days
+        self.n_slots = n_slots
+        self.n_rooms = len(problem.room_names)
+        self.n_faculty = len(problem.faculty_names)
+        self.n_classes = len(problem.class_names)
+        self.period_minutes = problem.period_minutes
+
+        blocks = problem.blocks
+        self.duration = np.array([b.duration for b in blocks], dtype=np.int64)
+        self.class_id = np.array([b.class_id for b in blocks], dtype=np.int64)
+        self.max_duration = int(self.duration.max()) if len(blocks) else 0
+
+        # (class, subject) pairs with their required periods
+        pairs = list(problem.required_periods)
+        pair_index = {pair: i for i, pair in enumerate(pairs)}
+        self.n_pairs = len(pairs)
+        self.pair = np.array([pair_index[(b.class_id, b.subject_id)] for b in blocks], dtype=np.int64)
+        self.required = np.array([problem.required_periods[pair] for pair in pairs], dtype=np.int64)
+
+        # Faculty of gene g are faculty_id[faculty_start[g]:faculty_start[g] + faculty_count[g]]
+        self.faculty_count = np.array([len(b.faculty) for b in blocks], dtype=np.int64)
+        self.faculty_start = np.concatenate([[0], np.cumsum(self.faculty_count)[:-1]]).astype(np.int64)
+        self.faculty_id = np.array([f for b in blocks for f in b.faculty], dtype=np.int64)
+
+
+# ================== REGISTRY ==================
+DEFAULT_RULES = (
+    SlotClash('room_clash', ROOM, ROOM_CLASH),
+    SlotClash('faculty_clash', FACULTY, FACULTY_CLASH),
+    SlotClash('class_clash', CLASS, CLASS_CLASH),
+    OncePerDay('subject_per_day', DAY, SUBJECT_PER_DAY),
+    DailyLimit('class_hours', CLASS, CLASS_HOURS, limit=MAX_CLASS_HOURS),
+    DailyLimit('faculty_hours', FACULTY, FACULTY_HOURS, limit=MAX_FACULTY_HOURS),
+    Coverage('missing_hours', COURSE, MISSING_HOURS),
+)
+
+# Every known rule by name; register() adds new ones
+RULES = {rule.name: rule for rule in DEFAULT_RULES}
+
+
+def register(rule):
+    """Make a rule available to ConstraintSet by name."""
+    RULES[rule.name] = rule
+    return rule
+
+
+class ConstraintSet:
+    """The active rules of a run, compiled once per problem by every engine.
+
+    names picks rules from RULES (default: DEFAULT_RULES) and weights
+    overrides weights by rule name. The GA, annealing, rescheduling and
+    repair score through incremental(); population scoring through full().
+    """
+
+    def __init__(self, names=None, weights=None):
+        names = [rule.name for rule in DEFAULT_RULES] if names is None else list(names)
+        unknown = [name for name in names if name not in RULES]
+        if unknown:
+            raise ValueError(f"Unknown constraint rules {unknown} (known: {sorted(RULES)})")
+        weights = weights or {}
+        self.rules = tuple(RULES[name].with_weight(weights[name]) if name in weights else RULES[name]
+                           for name in names)
+        self.by_name = {rule.name: rule for rule in self.rules}
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def limit(self, name, default=None):
+        """Limit of an active rule, or default when the rule is not active."""
+        rule = self.by_name.get(name)
+        return rule.limit if rule is not None else default
+
+    def period_limit(self, name, problem, default=None):
+        """Limit of an active rule in grid periods of problem, or default when the rule is not active."""
+        rule = self.by_name.get(name)
+        return problem.periods(rule.limit) if rule is not None else default
+
+    def hard(self):
+        return [rule for rule in self.rules if rule.hard]
+
+    def base_penalty(self, problem):
+        return sum(rule.base_penalty(problem) for rule in self.rules)
+
+    def incremental(self, problem, n_days, n_slots):
+        """One incremental kernel per active rule, with fresh counters."""
+        return [rule.incremental(problem, n_days, n_slots) for rule in self.rules]
+
+    def full(self, tables, population):
+        """Penalty of every individual in population (an array), summed over the active rules."""
+        stacked = StackedPopulation(tables, population)
+        penalty = np.zeros(stacked.n_pop, dtype=np.int64)
+        for rule in self.rules:
+            penalty += rule.full(stacked)
+        return penalty, stacked.placed_any
+
+    def breakdown(self, tables, individual):
+        """{rule name: penalty} for one individual, from the full kernels."""
+        stacked = StackedPopulation(tables, [individual])
+        return {rule.name: int(rule.full(stacked)[0]) for rule in self.rules}
+
+    def key(self):
+        """Plain description of the active rules for hashing (see src.result_cache)."""
+        return [[rule.name, rule.weight, rule.limit] for rule in self.rules]
+
+
+DEFAULT_CONSTRAINTS = ConstraintSet()
@@ -0,0 +1,342 @@
+import time
+from functools import lru_cache
+
+from src.ga_timetable import GeneticAlgorithmTimetable
+from src.genome import Individual
+from src.occupancy import OccupancyGrid, popcount
+
+# Search outcomes kept in BacktrackingTimetable.last_search['status']
+FEASIBLE = 'feasible'      # every block placed with no hard-constraint violation
+OPTIMAL = 'optimal'        # proven minimum of unplaced periods (> 0: no full timetable exists)
+LIMIT = 'limit'            # node or time limit hit; best partial timetable returned
+
+# run()'s on_generation is called every CHECKPOINT search nodes, at least every
+# CHECKPOINT_S seconds on large problems, and once at the end
+CHECKPOINT = 4096
+CHECKPOINT_S = 1.0
+
+
+class BacktrackingTimetable(GeneticAlgorithmTimetable):
+    """Complete search engine with the GA's interface and output format.
+
+    Variables are lecture blocks; a block's domain is a bitset over
+    day * n_slots + start of the starts where its class and faculty are
+    free, daily hour limits hold, the subject is not already taught that
+    day and a room it may use is free for the whole span. The block with
+    the smallest domain is branched on first. Rooms are treated as pooled
+    capacity during search (one pool per eligible-room set, see
+    src.rooms.RoomIndex) and concrete rooms are assigned at the end by
+    interval partitioning, smallest adequate room first. Domains start
+    from the availability config (src.availability): a fixed lecture has
+    a single value and room blackouts take capacity out of their pools.
+
+    Leaving a block unplaced is allowed as a last value, so the search is
+    a branch and bound on unplaced periods, pruned with an exact per-class
+    packing bound (max_packed_hours). It stops at zero (a clash-free
+    timetable exists), when it has proven the best count optimal (no
+    complete timetable exists under the daily limits), or at node_limit /
+    time_limit_s with the best partial timetable found.
+    """
+
+    def run(self, node_limit=200000, time_limit_s=10.0, time_budget_s=None, on_generation=None, **ignored):
+        """Search for a timetable; returns (timetable, fitness) like the GA.
+
+        time_budget_s, the time limit the other engines take, overrides
+        time_limit_s. on_generation receives a progress dict (nodes, best
+        fitness and unplaced periods so far) at every checkpoint and once
+        at the end. A summary (status, nodes, unplaced periods, lower
+        bound) is kept in self.last_search.
+        """
+        if time_budget_s is not None:
+            time_limit_s = time_budget_s
+        started = time.perf_counter()
+        reports = {'best': None, 'fitness': 0, 'count': 0}  # best assignment last scored
+
+        def progress(search):
+            if search.best is not reports['best']:
+                reports['best'] = search.best
+                reports['fitness'] = (self.calculate_fitness(self.assign_rooms(search.best))
+                                      if search.best is not None else 0)
+            generation = reports['count']
+            reports['count'] += 1
+            on_generation({
+                'generation': generation,
+                'generations': max(-(-node_limit // CHECKPOINT), generation + 1),
+                'best_fitness': reports['fitness'],
+                'nodes': search.nodes,
+                'unplaced_periods': search.best_unplaced,
+            })
+
+        search = _Search(self, node_limit, started + time_limit_s, progress if on_generation else None)
+        best = search.solve()
+
+        individual = self.assign_rooms(best) if best is not None else None
+        fitness = self.calculate_fitness(individual) if individual is not None else 0
+        if on_generation:
+            progress(search)
+        self.last_search = {
+            'status': search.status,
+            'nodes': search.nodes,
+            'unplaced_periods': search.best_unplaced,
+            'lower_bound': search.lower_bound,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+        }
+        return (self.decode(individual) if individual is not None else None), fitness
+
+    def assign_rooms(self, assignment):
+        """Turn {block: (day, start)} into an Individual with concrete rooms.
+
+        Lectures with a fixed room go first; the other blocks of each day
+        are taken by start time and each gets the first (smallest) allowed
+        room free at its start (interval partitioning).
+        """
+        blocks = self.problem.blocks
+        individual = Individual(len(blocks))
+        rooms = self.domains.room_grid()
+        fixed = self.domains.fixed
+
+        for b, (day, start) in sorted(assignment.items(),
+                                      key=lambda item: (item[0] not in fixed, item[1][0], item[1][1], item[0])):
+            block = blocks[b]
+            allowed = self.domains.rooms(b, day, start)
+            room = next((r for r in allowed if rooms.is_free(r, day, start, block.duration)), allowed[0])
+            rooms.occupy(room, day, start, block.duration)
+            individual.place(b, day, start, room)
+        return individual
+
+
+@lru_cache(maxsize=None)
+def max_packed_hours(days, blocks):
+    """Most hours of `blocks` that fit into `days` under the per-day limits.
+
+    days is a sorted tuple of (free hours, subjects already taught) and
+    blocks a sorted tuple of (duration, subject); a day takes a subject at
+    most once. This is the exact per-class relaxation used as the search
+    bound (it ignores slot positions, faculty and rooms).
+    """
+    if not blocks or not days:
+        return 0
+    (duration, subject), rest = blocks[-1], blocks[:-1]
+    best = max_packed_hours(days, rest)  # leave the longest block out
+    tried = set()
+    for i, (free, subjects) in enumerate(days):
+        if free < duration or subject in subjects or (free, subjects) in tried:
+            continue
+        tried.add((free, subjects))
+        day = (free - duration, tuple(sorted(subjects + (subject,))))
+        packed = tuple(sorted(days[:i] + (day,) + days[i + 1:]))
+        best = max(best, duration + max_packed_hours(packed, rest))
+    return best
+
+
+class _Search:
+    """State of one branch-and-bound run over bitset domains."""
+
+    def __init__(self, ga, node_limit, deadline, on_checkpoint=None):
+        self.problem = ga.problem
+        self.grid = ga.grid
+        self.domains = ga.domains
+        self.n_days = ga.grid.n_days
+        self.n_slots = ga.grid.n_slots
+        self.max_class_hours = ga.constraints.period_limit('class_hours', ga.problem, self.n_slots)
+        self.max_faculty_hours = ga.constraints.period_limit('faculty_hours', ga.problem, self.n_slots)
+        self.node_limit = node_limit
+        self.deadline = deadline
+        self.on_checkpoint = on_checkpoint
+        self.next_checkpoint = time.perf_counter() + CHECKPOINT_S
+
+        self.blocks = [b for b in self.problem.blocks if b.rooms]
+
+        # Room pools: blocks with the same eligible rooms share one. Eligible sets
+        # are nested within a room type (rooms above a capacity), so a slot has a
+        # room for a block while every pool containing its set has one left.
+        pools = {block.rooms for block in self.blocks}
+        self.capacity = {pool: len(pool) for pool in pools}
+        self.covering = {pool: [other for other in pools if set(pool) <= set(other)] for pool in pools}
+
+        self.classes = OccupancyGrid(self.n_slots)
+        self.faculty = OccupancyGrid(self.n_slots)
+        self.room_use = {}  # (pool, day, slot) -> blocks using a room of that pool
+        self.room_full = OccupancyGrid(self.n_slots)  # keyed by pool
+        # A blacked-out room is a permanent booking in every pool holding it
+        for (room, day), mask in self.domains.room_busy.items():
+            for slot in range(self.n_slots):
+                if mask >> slot & 1:
+                    for pool in pools:
+                        if room in pool:
+                            self.book(pool, day, slot)
+        self.subject_days = {}  # (class, subject) -> bitmask of days already used
+
+        # (duration, subject) of each class's undecided blocks, for the in-search bound
+        self.class_open = {}
+        for block in self.blocks:
+            self.class_open.setdefault(block.class_id, []).append((block.duration, block.subject_id))
+
+        self.assignment = {}
+        self.unplaced = 0
+        self.nodes = 0
+        self.status = None
+        self.best = None
+        self.best_unplaced = None
+        self.lower_bound = self.unplaced_lower_bound()
+
+    def unplaced_lower_bound(self):
+        """Periods that cannot be placed under the daily limits, before any search."""
+        faculty_hours = {}
+        for block in self.blocks:
+            for f in block.faculty:
+                faculty_hours[f] = faculty_hours.get(f, 0) + block.duration
+
+        faculty_excess = max((max(0, h - self.n_days * self.max_faculty_hours) for h in faculty_hours.values()), default=0)
+        return max(self.open_bound(), faculty_excess)
+
+    def open_bound(self):
+        """Periods of undecided blocks that cannot fit in their class's remaining days."""
+        return sum(self.class_bound(class_id) for class_id, open_blocks in self.class_open.items() if open_blocks)
+
+    def class_days(self, class_id):
+        """Per-day (free hours, subjects taught) of a class, as max_packed_hours takes them."""
+        taught = [[] for _ in range(self.n_days)]
+        for (c, subject), used_days in self.subject_days.items():
+            if c == class_id:
+                for day in range(self.n_days):
+                    if used_days >> day & 1:
+                        taught[day].append(subject)
+        return [[max(0, self.max_class_hours - self.classes.hours(class_id, day)), tuple(sorted(taught[day]))]
+                for day in range(self.n_days)]
+
+    def class_bound(self, class_id, days=None):
+        open_blocks = self.class_open[class_id]
+        days = days if days is not None else self.class_days(class_id)
+        packed = max_packed_hours(tuple(sorted((free, subjects) for free, subjects in days)), tuple(sorted(open_blocks)))
+        return sum(duration for duration, _ in open_blocks) - packed
+
+    def class_bound_after(self, block, day):
+        """Unplaceable periods left in block's class if block went on day."""
+        days = self.class_days(block.class_id)
+        days[day][0] -= block.duration
+        days[day][1] = tuple(sorted(days[day][1] + (block.subject_id,)))
+        return self.class_bound(block.class_id, days)
+
+    def domain(self, block):
+        """Bitset of feasible day * n_slots + start values for block."""
+        used_days = self.subject_days.get((block.class_id, block.subject_id), 0)
+        domain = 0
+        for day in range(self.n_days):
+            if used_days >> day & 1:
+                continue
+            if self.classes.hours(block.class_id, day) + block.duration > self.max_class_hours:
+                continue
+            if any(self.faculty.hours(f, day) + block.duration > self.max_faculty_hours for f in block.faculty):
+                continue
+            busy = (self.classes.mask(block.class_id, day) | self.faculty.busy(block.faculty, day)
+                    | self.room_full.busy(self.covering[block.rooms], day))
+            for start in self.domains.free_starts(block.id, busy, day):
+                domain |= 1 << (day * self.n_slots + start)
+        return domain
+
+    def solve(self):
+        try:
+            self.branch(list(self.blocks))
+            complete = True
+        except _Stop:
+            complete = False
+        if self.status is None:
+            self.status = FEASIBLE if self.best_unplaced == 0 else (OPTIMAL if complete else LIMIT)
+        return self.best
+
+    def branch(self, remaining):
+        """Depth-first search over the remaining blocks; raises _Stop to end the whole search."""
+        self.nodes += 1
+        now = time.perf_counter()
+        if self.nodes > self.node_limit or now > self.deadline:
+            raise _Stop()
+        if self.on_checkpoint is not None and (self.nodes % CHECKPOINT == 0 or now >= self.next_checkpoint):
+            self.next_checkpoint = now + CHECKPOINT_S
+            self.on_checkpoint(self)
+
+        if not remaining:
+            if self.best_unplaced is None or self.unplaced < self.best_unplaced:
+                self.best = dict(self.assignment)
+                self.best_unplaced = self.unplaced
+            if self.unplaced <= self.lower_bound:
+                self.status = FEASIBLE if self.unplaced == 0 else OPTIMAL
+                raise _Stop()
+            return
+
+        if self.best_unplaced is not None and self.unplaced + self.open_bound() >= self.best_unplaced:
+            return
+
+        # Most-constrained variable: smallest domain, longest block on ties
+        chosen, chosen_domain, chosen_size = None, 0, None
+        for i, block in enumerate(remaining):
+            domain = self.domain(block)
+            size = popcount(domain)
+            if chosen_size is None or (size, -block.duration) < (chosen_size, -remaining[chosen].duration):
+                chosen, chosen_domain, chosen_size = i, domain, size
+                if size == 0:
+                    break
+        block = remaining[chosen]
+        rest = remaining[:chosen] + remaining[chosen + 1:]
+        self.class_open[block.class_id].remove((block.duration, block.subject_id))
+
+        # Values: days that hurt the class's packing bound least, fullest of those
+        # first (best fit), then earlier starts
+        values = []
+        while chosen_domain:
+            low = chosen_domain & -chosen_domain
+            value = low.bit_length() - 1
+            values.append(divmod(value, self.n_slots))
+            chosen_domain ^= low
+
+        day_cost = {}
+        for day in {day for day, _ in values}:
+            day_cost[day] = (self.class_bound_after(block, day), -self.classes.hours(block.class_id, day), day)
+        values.sort(key=lambda v: (day_cost[v[0]], v[1]))
+
+        for day, start in values:
+            self.place(block, day, start)
+            self.branch(rest)
+            self.unplace(block, day, start)
+
+        # Last value: leave the block out, if that can still beat the best found
+        if self.best_unplaced is None or self.unplaced + block.duration < self.best_unplaced:
+            self.unplaced += block.duration
+            self.branch(rest)
+            self.unplaced -= block.duration
+
+        self.class_open[block.class_id].append((block.duration, block.subject_id))
+
+    def place(self, block, day, start):
+        self.assignment[block.id] = (day, start)
+        self.classes.occupy(block.class_id, day, start, block.duration)
+        for f in block.faculty:
+            self.faculty.occupy(f, day, start, block.duration)
+        key = (block.class_id, block.subject_id)
+        self.subject_days[key] = self.subject_days.get(key, 0) | 1 << day
+        for slot in range(start, start + block.duration):
+            for pool in self.covering[block.rooms]:
+                self.book(pool, day, slot)
+
+    def book(self, pool, day, slot):
+        use = (pool, day, slot)
+        self.room_use[use] = self.room_use.get(use, 0) + 1
+        if self.room_use[use] >= self.capacity[pool]:
+            self.room_full.occupy(pool, day, slot)
+
+    def unplace(self, block, day, start):
+        del self.assignment[block.id]
+        self.classes.release(block.class_id, day, start, block.duration)
+        for f in block.faculty:
+            self.faculty.release(f, day, start, block.duration)
+        key = (block.class_id, block.subject_id)
+        self.subject_days[key] &= ~(1 << day)
+        for slot in range(start, start + block.duration):
+            for pool in self.covering[block.rooms]:
+                use = (pool, day, slot)
+                self.room_use[use] -= 1
+                self.room_full.release(pool, day, slot)
+
+
+class _Stop(Exception):
+    """Unwinds the search when a limit is hit or an optimal solution is found."""
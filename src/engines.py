@@ -0,0 +1,16 @@
+from src.annealing import AnnealingTimetable
+from src.cp_solver import BacktrackingTimetable
+from src.ga_timetable import GeneticAlgorithmTimetable
+
+# Scheduling engines by name; all take csv_file and share run() -> (timetable, fitness)
+ENGINES = {
+    'ga': GeneticAlgorithmTimetable,
+    'sa': AnnealingTimetable,
+    'cp': BacktrackingTimetable,
+}
+
+ENGINE_LABELS = {
+    'ga': "Genetic Algorithm",
+    'sa': "Simulated Annealing",
+    'cp': "Backtracking Search",
+}
@@ -0,0 +1,116 @@
+from src.constraints import DEFAULT_CONSTRAINTS, SlotClash
+from src.genome import UNPLACED
+
+
+class DeltaEvaluator:
+    """Keeps the rule counters and penalty total of one individual.
+
+    The active rules (a src.constraints.ConstraintSet) are compiled once
+    into incremental kernels. A move is a tuple (block, day, slot, room);
+    a day of UNPLACED removes the block from the timetable. delta() and
+    apply() cost O(block duration) per rule.
+    """
+
+    def __init__(self, problem, individual, n_days, n_slots, constraints=DEFAULT_CONSTRAINTS):
+        self.problem = problem
+        self.individual = individual
+        self.n_days = n_days
+        self.n_slots = n_slots
+
+        kernels = constraints.incremental(problem, n_days, n_slots)
+        self._adds = [kernel.add for kernel in kernels]
+        self._removes = [kernel.remove for kernel in kernels]
+        self._clashes = [kernel for kernel in kernels if isinstance(kernel.rule, SlotClash)]
+
+        self.penalty = constraints.base_penalty(problem)
+        self.placed = 0
+        for b in individual.placed_blocks():
+            self.penalty += self._add(b, int(individual.day[b]), int(individual.slot[b]),
+                                      int(individual.room[b]))
+
+    def reset(self, individual):
+        """Track another individual with the same compiled kernels.
+
+        The tracked individual's genes leave the counters and those of
+        `individual` go in: O(placed genes) instead of recompiling every
+        kernel. The tracked individual must still hold the genes the
+        counters saw (changed only through apply(); see detach()).
+        """
+        old = self.individual
+        for b in old.placed_blocks():
+            self.penalty += self._remove(b, int(old.day[b]), int(old.slot[b]), int(old.room[b]))
+        self.individual = individual
+        for b in individual.placed_blocks():
+            self.penalty += self._add(b, int(individual.day[b]), int(individual.slot[b]),
+                                      int(individual.room[b]))
+        return self
+
+    def detach(self):
+        """Go on tracking a private copy, so later edits of the individual cannot desync the counters."""
+        self.individual = self.individual.copy()
+
+    def fitness(self):
+        """Same score as GeneticAlgorithmTimetable.calculate_fitness for the tracked individual."""
+        if not self.placed:
+            return 0
+        return max(1000 - self.penalty, 1)
+
+    def in_conflict(self, b):
+        """True if block b shares a room, faculty or class slot with another block."""
+        individual = self.individual
+        day = int(individual.day[b])
+        if day == UNPLACED:
+            return False
+        start, room = int(individual.slot[b]), int(individual.room[b])
+        return any(kernel.clashes(b, day, start, room) for kernel in self._clashes)
+
+    def clash_count(self):
+        """Number of double-booked room, faculty and class hour slots."""
+        return sum(kernel.excess() for kernel in self._clashes)
+
+    def conflicting_blocks(self):
+        """Ids of all placed blocks involved in a room, faculty or class clash."""
+        return [b for b in self.individual.placed_blocks() if self.in_conflict(b)]
+
+    def delta(self, move):
+        """Penalty change the move would cause, without keeping it."""
+        block, day, slot, room = move
+        individual = self.individual
+        old = (int(individual.day[block]), int(individual.slot[block]), int(individual.room[block]))
+
+        change = self._move(block, old, (day, slot, room))
+        self._move(block, (day, slot, room), old)
+        return change
+
+    def apply(self, move):
+        """Apply the move to the individual and the counters; returns the penalty change."""
+        block, day, slot, room = move
+        individual = self.individual
+        old = (int(individual.day[block]), int(individual.slot[block]), int(individual.room[block]))
+
+        change = self._move(block, old, (day, slot, room))
+        self.penalty += change
+        individual.place(block, day, slot, room)
+        return change
+
+    def _move(self, block, old, new):
+        change = 0
+        if old[0] != UNPLACED:
+            change += self._remove(block, *old)
+        if new[0] != UNPLACED:
+            change += self._add(block, *new)
+        return change
+
+    def _add(self, b, day, start, room):
+        self.placed += 1
+        change = 0
+        for add in self._adds:
+            change += add(b, day, start, room)
+        return change
+
+    def _remove(self, b, day, start, room):
+        self.placed -= 1
+        change = 0
+        for remove in self._removes:
+            change += remove(b, day, start, room)
+        return change
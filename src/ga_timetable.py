@@ -1,440 +1,568 @@
 import random
+import time
 import pandas as pd
-from src.utils import generate_time_slots, generate_classrooms, load_data
+from src.availability import Domains, availability_for
+from src.batch_fitness import BatchFitness
+from src.budget import Budget
+from src.constraints import DEFAULT_CONSTRAINTS
+from src.evaluator import DeltaEvaluator
+from src.genome import Individual
+from src.islands import run_island_model
+from src.occupancy import OccupancyGrid
+from src.operators import OperatorConfig
+from src.parallel import make_pool
+from src.problem import compile_problem
+from src.result_cache import problem_key, run_key
+from src.rooms import rooms_for
+from src.seeding import GreedySeeder
+from src.telemetry import RunReport
+from src.timegrid import grid_for
+from src.utils import generate_classrooms, load_data
 
 class GeneticAlgorithmTimetable:
-    def __init__(self, csv_file="timetable_data.csv"):
+    def __init__(self, csv_file="timetable_data.csv", grid=None, constraints=None, availability=None):
         self.df = load_data(csv_file)
-        self.time_slots = generate_time_slots()
-        self.classrooms = generate_classrooms()
-        
-    def get_lecture_blocks(self, hours):
-        """Convert total hours to lecture blocks (1 hour = 1 slot)"""
+        self.constraints = constraints if constraints is not None else DEFAULT_CONSTRAINTS
+
+        # Rooms (type, capacity) from rooms_config.csv next to the course file
+        self.rooms = rooms_for(csv_file, default_names=generate_classrooms())
+        self.classrooms = list(self.rooms.names)
+
+        # Time grid from time_config.csv / days_config.csv next to the course file
+        self.grid = grid if grid is not None else grid_for(csv_file)
+        self.days = self.grid.days
+
+        # One-time problem compilation; every GA operator reads this table
+        self.problem = compile_problem(self.df, self.rooms, self.get_lecture_blocks, self.grid.period_minutes)
+
+        # Fixed lectures and unavailability from availability_config.csv, applied as domain reductions
+        self.availability = availability if availability is not None else availability_for(csv_file, self.grid)
+        self.domains = Domains(self.problem, self.grid, self.availability)
+        self._batch = None
+        self._seeder = None
+        self._scratch = None
+        self.move_evaluations = 0  # delta evaluations spent inside operators (see scratch_evaluator)
+        self.move_limit = None  # move_evaluations value at which operators stop scoring (None: no cap)
+
+    @classmethod
+    def from_problem(cls, problem, grid, constraints=None, domains=None):
+        """Build a GA around an already compiled problem and time grid (no CSV loading)."""
+        ga = cls.__new__(cls)
+        ga.df = None
+        ga.constraints = constraints if constraints is not None else DEFAULT_CONSTRAINTS
+        ga.rooms = problem.rooms
+        ga.classrooms = list(problem.room_names)
+        ga.grid = grid
+        ga.days = grid.days
+        ga.problem = problem
+        ga.domains = domains if domains is not None else Domains(problem, grid)
+        ga.availability = ga.domains.availability
+        ga._batch = None
+        ga._seeder = None
+        ga._scratch = None
+        ga.move_evaluations = 0
+        ga.move_limit = None
+        return ga
+
+    def get_lecture_blocks(self, periods):
+        """Convert weekly grid periods to lecture blocks (see TimeGrid.periods for the periods conversion)"""
         blocks = []
-        if hours <= 0:
+        if periods <= 0:
             return blocks
-        
-        # For 4-hour courses: 2 lectures of 2 hours each
-        if hours == 4:
-            blocks = [2, 2]  # Two 2-hour lectures
-        elif hours == 3:
-            blocks = [3]     # One 3-hour lecture
-        elif hours == 2:
-            blocks = [2]     # One 2-hour lecture
-        elif hours == 1:
-            blocks = [1]     # One 1-hour lecture
+
+        # For 4-period courses: 2 lectures of 2 periods each
+        if periods == 4:
+            blocks = [2, 2]  # Two 2-period lectures
+        elif periods == 3:
+            blocks = [3]     # One 3-period lecture
+        elif periods == 2:
+            blocks = [2]     # One 2-period lecture
+        elif periods == 1:
+            blocks = [1]     # One 1-period lecture
         else:
             # For other values, split into reasonable blocks
-            while hours > 0:
-                if hours >= 3:
+            while periods > 0:
+                if periods >= 3:
                     blocks.append(3)
-                    hours -= 3
-                elif hours >= 2:
+                    periods -= 3
+                elif periods >= 2:
                     blocks.append(2)
-                    hours -= 2
+                    periods -= 2
                 else:
                     blocks.append(1)
-                    hours -= 1
-        
+                    periods -= 1
+
         return blocks
-    
-    def find_consecutive_slots(self, day, duration, used_slots):
-        """Find consecutive time slots for a lecture"""
-        available_slots = []
-        
-        # Define time slot mapping
-        time_mapping = {
-            '08:00-09:00': 1,
-            '09:00-10:00': 2,
-            '10:00-11:00': 3,
-            '11:00-12:00': 4,
-            '12:00-13:00': 5,
-            '13:00-14:00': 6,
-            '14:00-15:00': 7,
-            '15:00-16:00': 8
-        }
-        
-        reverse_mapping = {v: k for k, v in time_mapping.items()}
-        
-        # Check all possible starting slots
-        for start_slot in range(1, 9 - duration + 1):
-            consecutive = True
-            slots_needed = []
-            
-            # Check if all needed slots are available
-            for i in range(duration):
-                slot_num = start_slot + i
-                time_slot = reverse_mapping[slot_num]
-                key = (day, time_slot)
-                if key in used_slots:
-                    consecutive = False
-                    break
-                slots_needed.append(time_slot)
-            
-            if consecutive:
-                available_slots.append({
-                    'start': reverse_mapping[start_slot],
-                    'slots': slots_needed,
-                    'duration': duration
-                })
-        
-        return available_slots
-    
-    def create_individual(self):
+
+    def find_consecutive_slots(self, duration, busy):
+        """Start slot indexes where `duration` consecutive slots are free.
+
+        busy is the bitmask of slots already taken on the day (see src/occupancy.py);
+        starts running across a break in the time grid are left out.
+        """
+        return self.grid.free_starts(busy, duration)
+
+    def create_individual(self, rng=None):
         """Create a random timetable with proper durations and STRICT conflict checking."""
-        timetable = []
-        used_slots = set()  # Track (day, time_slot_str, room) combinations
-        used_faculty_slots = set()  # Track (day, time_slot_str, faculty) combinations
-        used_class_slots = set()  # Track (day, time_slot_str, class) combinations
-        daily_class_hours = {}  # Track hours per class per day (max 4)
-        daily_faculty_hours = {}  # Track hours per faculty per day (max 5)
-        
-        # Define available time slots
-        available_times = ['08:00-09:00', '09:00-10:00', '10:00-11:00', 
-                          '11:00-12:00', '12:00-13:00', '14:00-15:00', '15:00-16:00']
-        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-        
-        # Process each course
-        for _, row in self.df.iterrows():
-            try:
-                hours = int(row['Hours']) if pd.notna(row['Hours']) else 0
-            except:
-                hours = 0
-            
-            if hours <= 0:
+        rng = rng or random
+        individual = Individual(len(self.problem))
+
+        # Bitmask occupancy per (entity, day) for rooms, faculty and classes
+        n_slots = self.grid.n_slots
+        faculty = OccupancyGrid(n_slots)
+        classes = OccupancyGrid(n_slots)
+
+        n_days = len(self.days)
+        domains = self.domains
+        rooms = domains.room_grid()  # blackout windows count as taken
+        max_class_hours = self.constraints.period_limit('class_hours', self.problem, n_slots)
+        max_faculty_hours = self.constraints.period_limit('faculty_hours', self.problem, n_slots)
+
+        # Fixed lectures go in first, exactly where the availability config puts them,
+        # even past a daily limit (Domains.pin_problems reports those); one with no room stays out
+        for b, (day, start, _) in domains.pinned.items():
+            block = self.problem.blocks[b]
+            room = domains.pin_room(b, rooms)
+            if room is None:
                 continue
-            
-            # Get lecture blocks for this course
-            lecture_blocks = self.get_lecture_blocks(hours)
-            
-            for block_duration in lecture_blocks:
-                placed = False
-                max_attempts = 100  # Increased from 50
-                
-                for attempt in range(max_attempts):
-                    # Select a random day
-                    day = random.choice(days)
-                    
-                    # Find consecutive slots for this duration
-                    available_slots = self.find_consecutive_slots(day, block_duration, used_slots)
-                    
+            individual.place(b, day, start, room)
+            rooms.occupy(room, day, start, block.duration)
+            classes.occupy(block.class_id, day, start, block.duration)
+            for f in block.faculty:
+                faculty.occupy(f, day, start, block.duration)
+
+        # Process each lecture block
+        for block in self.problem.blocks:
+            if block.id in domains.pinned:
+                continue
+            available_rooms = block.rooms
+            if not available_rooms:
+                continue
+
+            block_duration = block.duration
+            faculties = block.faculty
+            class_id = block.class_id
+
+            placed = False
+            max_attempts = 100  # Increased from 50
+
+            for attempt in range(max_attempts):
+                # Select a random day
+                day = rng.randrange(n_days)
+
+                # Daily limits of the active rules in grid periods (4 hours per class, 5 per faculty by default)
+                if classes.hours(class_id, day) + block_duration > max_class_hours:
+                    continue
+                if any(faculty.hours(f, day) + block_duration > max_faculty_hours for f in faculties):
+                    continue
+
+                # Allowed starts where the class and all of its faculty are free
+                busy = classes.mask(class_id, day) | faculty.busy(faculties, day)
+                available_slots = domains.free_starts(block.id, busy, day)
+
+                if not available_slots:
+                    continue  # Try another day
+
+                # Select a random available slot and room
+                start = rng.choice(available_slots)
+                room = rng.choice(available_rooms)
+
+                # Room conflict
+                if not rooms.is_free(room, day, start, block_duration):
+                    continue
+
+                # If all checks pass, schedule the lecture
+                individual.place(block.id, day, start, room)
+                rooms.occupy(room, day, start, block_duration)
+                classes.occupy(class_id, day, start, block_duration)
+                for f in faculties:
+                    faculty.occupy(f, day, start, block_duration)
+
+                placed = True
+                break
+
+            if not placed:
+                # Force placement only if really necessary - respects faculty/class
+                # availability but may double-book a room
+                for day in range(n_days):
+                    busy = classes.mask(class_id, day) | faculty.busy(faculties, day)
+                    available_slots = domains.free_starts(block.id, busy, day)
                     if not available_slots:
-                        continue  # Try another day
-                    
-                    # Select a random available slot
-                    slot_info = random.choice(available_slots)
-                    start_time = slot_info['start']
-                    
-                    # Calculate time range
-                    start_hour = int(start_time.split(':')[0])
-                    end_hour = start_hour + block_duration
-                    time_range = f"{start_hour:02d}:00-{end_hour:02d}:00"
-                    
-                    # Select appropriate room
-                    if 'Type' in row and 'Lab' in str(row['Type']):
-                        available_rooms = [r for r in self.classrooms if 'Lab' in r]
-                    else:
-                        available_rooms = [r for r in self.classrooms if 'Lab' not in r]
-                    
-                    if not available_rooms:
-                        continue
-                    
-                    room = random.choice(available_rooms)
-                    
-                    # Parse faculty (handle multiple faculty for labs)
-                    faculties = [f.strip() for f in str(row['FacultyID']).split(';')]
-                    class_name = str(row['Class'])
-                    
-                    # STRICT CONFLICT CHECK
-                    conflict = False
-                    
-                    # Check all slots in the block
-                    for slot in slot_info['slots']:
-                        # 1. Room conflict
-                        if (day, slot, room) in used_slots:
-                            conflict = True
-                            break
-                        
-                        # 2. Faculty conflicts
-                        for faculty in faculties:
-                            if (day, slot, faculty) in used_faculty_slots:
-                                conflict = True
-                                break
-                        
-                        # 3. Class conflict
-                        if (day, slot, class_name) in used_class_slots:
-                            conflict = True
-                            break
-                        
-                        if conflict:
-                            break
-                    
-                    if conflict:
-                        continue
-                    
-                    # Check daily hour limits
-                    daily_class_key = (class_name, day)
-                    daily_faculty_key = tuple([(f, day) for f in faculties])
-                    
-                    class_hours_today = daily_class_hours.get(daily_class_key, 0)
-                    if class_hours_today + block_duration > 4:  # Max 4 hours per day per class
                         continue
-                    
-                    # Check faculty hour limits
-                    faculty_conflict = False
-                    for faculty in faculties:
-                        faculty_hours_today = daily_faculty_hours.get((faculty, day), 0)
-                        if faculty_hours_today + block_duration > 5:  # Max 5 hours per day per faculty
-                            faculty_conflict = True
-                            break
-                    
-                    if faculty_conflict:
-                        continue
-                    
-                    # If all checks pass, schedule the lecture
-                    entry = {
-                        'Class': class_name,
-                        'Subject': str(row['Subject']),
-                        'Faculty': str(row['Faculty']),
-                        'Code': str(row['Code']) if 'Code' in row else '',
-                        'Type': str(row['Type']) if 'Type' in row else 'Theory',
-                        'Day': day,
-                        'Start Time': f"{start_hour:02d}:00",
-                        'End Time': f"{end_hour:02d}:00",
-                        'Duration': f"{block_duration} hour{'s' if block_duration > 1 else ''}",
-                        'Time Slot': time_range,
-                        'Room': room,
-                        'Total Hours': hours
-                    }
-                    
-                    timetable.append(entry)
-                    
-                    # Mark slots as used
-                    for slot in slot_info['slots']:
-                        used_slots.add((day, slot, room))
-                        
-                        # Mark faculty slots
-                        for faculty in faculties:
-                            used_faculty_slots.add((day, slot, faculty))
-                        
-                        # Mark class slots
-                        used_class_slots.add((day, slot, class_name))
-                    
-                    # Update daily hour counters
-                    daily_class_hours[daily_class_key] = class_hours_today + block_duration
-                    for faculty in faculties:
-                        faculty_key = (faculty, day)
-                        daily_faculty_hours[faculty_key] = daily_faculty_hours.get(faculty_key, 0) + block_duration
-                    
-                    placed = True
+
+                    start = available_slots[0]
+                    room = rng.choice(domains.rooms(block.id, day, start))
+                    individual.place(block.id, day, start, room)
+
+                    # Mark as used
+                    rooms.occupy(room, day, start, block_duration)
+                    classes.occupy(class_id, day, start, block_duration)
+                    for f in faculties:
+                        faculty.occupy(f, day, start, block_duration)
                     break
-                
-                if not placed:
-                    # Force placement only if really necessary - respects constraints
-                    for day in days:
-                        for time_slot in available_times:
-                            faculties = [f.strip() for f in str(row['Faculty']).split(';')]
-                            class_name = str(row['Class'])
-                            
-                            # Quick conflict check
-                            conflict = False
-                            for faculty in faculties:
-                                if (day, time_slot, faculty) in used_faculty_slots:
-                                    conflict = True
-                                    break
-                            if (day, time_slot, class_name) in used_class_slots:
-                                conflict = True
-                            
-                            if not conflict:
-                                if 'Type' in row and 'Lab' in str(row['Type']):
-                                    room = random.choice([r for r in self.classrooms if 'Lab' in r])
-                                else:
-                                    room = random.choice([r for r in self.classrooms if 'Lab' not in r])
-                                
-                                entry = {
-                                    'Class': class_name,
-                                    'Subject': str(row['Subject']),
-                                    'Faculty': str(row['Faculty']),
-                                    'Code': str(row['Code']) if 'Code' in row else '',
-                                    'Type': str(row['Type']) if 'Type' in row else 'Theory',
-                                    'Day': day,
-                                    'Start Time': time_slot.split('-')[0],
-                                    'End Time': time_slot.split('-')[1],
-                                    'Duration': '1 hour',
-                                    'Time Slot': time_slot,
-                                    'Room': room,
-                                    'Total Hours': hours
-                                }
-                                timetable.append(entry)
-                                
-                                # Mark as used
-                                used_class_slots.add((day, time_slot, class_name))
-                                for faculty in faculties:
-                                    used_faculty_slots.add((day, time_slot, faculty))
-                                
-                                placed = True
-                                break
-                        if placed:
-                            break
-        
+
+        return individual
+
+    def create_greedy_individual(self, rng=None):
+        """Most-constrained-first individual built from feasible domains (see src/seeding.py)."""
+        if self._seeder is None:
+            self._seeder = GreedySeeder(self)
+        return self._seeder.build(rng or random)
+
+    def calculate_fitness(self, individual):
+        """Fitness of one individual: 1000 minus the penalties of the active rules.
+
+        The rules (weights, limits) live in src.constraints; every engine
+        scores with the same ConstraintSet, so scores agree everywhere.
+        """
+        return self.calculate_fitness_batch([individual])[0]
+
+    def penalty_breakdown(self, individual):
+        """{rule name: penalty} of one individual under the active rules."""
+        return self.batch_scorer().breakdown(individual)
+
+    def calculate_fitness_batch(self, population):
+        """Score a whole population in one vectorized pass (same values as calculate_fitness)."""
+        return self.batch_scorer().score(population)
+
+    def batch_scorer(self):
+        """BatchFitness for this problem and rule set, built on first use."""
+        if self._batch is None:
+            self._batch = BatchFitness(self.problem, self.grid.n_days, self.grid.n_slots, self.constraints)
+        return self._batch
+
+    def repair_clashes(self, individual, max_moves=500, time_limit_ms=2000):
+        """Conflict-directed local search on a copy of individual.
+
+        Each step takes every block involved in a room, faculty or class
+        clash and moves it to its best-scoring (day, slot, room), as long as
+        that lowers the penalty. Stops when no clashing block can improve or
+        when max_moves / time_limit_ms is used up. A summary is kept in
+        self.last_repair.
+        """
+        started = time.perf_counter()
+        deadline = started + time_limit_ms / 1000.0
+
+        repaired = individual.copy()
+        evaluator = self.make_evaluator(repaired)
+        clashes_before = evaluator.clash_count()
+        penalty_before = evaluator.penalty
+        moves = 0
+
+        improved = True
+        while improved and moves < max_moves and time.perf_counter() < deadline:
+            improved = False
+            for b in evaluator.conflicting_blocks():
+                if moves >= max_moves or time.perf_counter() >= deadline:
+                    break
+                if not evaluator.in_conflict(b):
+                    continue  # an earlier move this pass already freed it
+
+                move, delta = self.best_move(evaluator, b)
+                if move is not None and delta < 0:
+                    evaluator.apply(move)
+                    moves += 1
+                    improved = True
+
+        clashes_after = evaluator.clash_count()
+        self.last_repair = {
+            'clashes_before': clashes_before,
+            'clashes_after': clashes_after,
+            'clashes_removed': clashes_before - clashes_after,
+            'penalty_change': evaluator.penalty - penalty_before,
+            'moves': moves,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+        }
+        return repaired
+
+    def polish(self, individual, iterations=5000, rng=None, time_limit_s=None, on_checkpoint=None):
+        """Simulated annealing on a copy of individual (see src/annealing.py).
+
+        Used by run(polish_iterations=...) as a post-GA intensification
+        phase; a summary is kept in self.last_anneal.
+        """
+        from src.annealing import SimulatedAnnealing
+
+        best, self.last_anneal = SimulatedAnnealing(self, iterations).search(
+            individual, rng, time_limit_s, on_checkpoint)
+        return best
+
+    def best_move(self, evaluator, b):
+        """Best (move, delta) for block b over its domain of days, start slots and rooms."""
+        best_move, best_delta = None, None
+        for day, slot in self.domains.placements(b):
+            for room in self.domains.rooms(b, day, slot):
+                move = (b, day, slot, room)
+                delta = evaluator.delta(move)
+                if best_delta is None or delta < best_delta:
+                    best_move, best_delta = move, delta
+        return best_move, best_delta
+
+    def make_evaluator(self, individual):
+        """Stateful evaluator for cheap single-gene moves on one individual."""
+        return DeltaEvaluator(self.problem, individual, self.grid.n_days, self.grid.n_slots, self.constraints)
+
+    def scratch_evaluator(self, individual):
+        """The GA's one reusable DeltaEvaluator, reset to track individual.
+
+        For operators that score a few moves per call: the kernels are
+        compiled once per GA instead of once per call. Callers detach()
+        it before handing the individual back.
+        """
+        if self._scratch is None:
+            self._scratch = self.make_evaluator(individual)
+        else:
+            self._scratch.reset(individual)
+        return self._scratch
+
+    def moves_left(self):
+        """Move deltas operators may still score before move_limit, or None when uncapped."""
+        if self.move_limit is None:
+            return None
+        return max(0, self.move_limit - self.move_evaluations)
+
+    def decode(self, individual):
+        """Expand an integer genome into the exported list-of-dicts timetable."""
+        timetable = []
+        for b in individual.placed_blocks():
+            block = self.problem.blocks[b]
+            course = self.problem.courses[block.course]
+            duration = block.duration
+            slot = int(individual.slot[b])
+            start_time = self.grid.start_time(slot)
+            end_time = self.grid.end_time(slot, duration)
+            hours = self.grid.span_minutes(slot, duration) / 60
+
+            timetable.append({
+                'Class': course.class_name,
+                'Subject': course.subject,
+                'Faculty': course.faculty_name,
+                'Code': course.code,
+                'Type': course.type,
+                'Day': self.days[int(individual.day[b])],
+                'Start Time': start_time,
+                'End Time': end_time,
+                'Duration': f"{hours:g} hour{'s' if hours != 1 else ''}",
+                'Time Slot': f"{start_time}-{end_time}",
+                'Room': self.problem.room_names[int(individual.room[b])],
+                'Total Hours': course.hours
+            })
+
         return timetable
-    
-    def calculate_fitness(self, timetable):
-        """Calculate fitness score with STRICT clash penalties."""
-        if not timetable:
-            return 0
-        
-        fitness = 1000  # Increased base fitness
-        penalty = 0
-        
-        # Track conflicts with strict detection
-        room_slots = {}
-        faculty_slots = {}
-        class_slots = {}
-        subject_per_day = {}  # (class, subject, day) -> count
-        daily_class_hours = {}  # (class, day) -> hours
-        daily_faculty_hours = {}  # (faculty, day) -> hours
-        
-        for entry in timetable:
-            # ROOM CLASH DETECTION
-            key = (entry['Day'], entry['Time Slot'], entry['Room'])
-            if key in room_slots:
-                penalty += 100  # HEAVY penalty for room clash
-            room_slots[key] = entry
-            
-            # FACULTY CLASH DETECTION
-            faculties = [f.strip() for f in str(entry['Faculty']).split(';')]
-            for faculty in faculties:
-                fkey = (entry['Day'], entry['Time Slot'], faculty)
-                if fkey in faculty_slots:
-                    penalty += 75  # HEAVY penalty for faculty clash
-                faculty_slots[fkey] = entry
-            
-            # CLASS CLASH DETECTION
-            ckey = (entry['Day'], entry['Time Slot'], entry['Class'])
-            if ckey in class_slots:
-                penalty += 80  # HEAVY penalty for class clash
-            class_slots[ckey] = entry
-            
-            # Check subject per day (max 1 per class per day)
-            subject_key = (entry['Class'], entry['Subject'], entry['Day'])
-            subject_per_day[subject_key] = subject_per_day.get(subject_key, 0) + 1
-            if subject_per_day[subject_key] > 1:
-                penalty += 50  # Penalty for multiple same subjects per day
-            
-            # Check daily hours per class (max 4 hours)
-            class_day_key = (entry['Class'], entry['Day'])
-            try:
-                duration = int(entry['Duration'].split()[0])
-            except:
-                duration = 1
-            daily_class_hours[class_day_key] = daily_class_hours.get(class_day_key, 0) + duration
-            if daily_class_hours[class_day_key] > 4:
-                penalty += 40  # Penalty for exceeding 4 hours per class per day
-            
-            # Check daily hours per faculty (max 5 hours)
-            for faculty in faculties:
-                faculty_day_key = (faculty, entry['Day'])
-                daily_faculty_hours[faculty_day_key] = daily_faculty_hours.get(faculty_day_key, 0) + duration
-                if daily_faculty_hours[faculty_day_key] > 5:
-                    penalty += 30  # Penalty for exceeding 5 hours per faculty per day
-        
-        # Check if total hours match requirements
-        total_required_hours = 0
-        total_scheduled_hours = 0
-        
-        for _, row in self.df.iterrows():
-            try:
-                required_hours = int(row['Hours']) if pd.notna(row['Hours']) else 0
-            except:
-                required_hours = 0
-            
-            if required_hours > 0:
-                total_required_hours += required_hours
-                scheduled_hours = sum(1 for entry in timetable 
-                                    if str(entry['Class']) == str(row['Class']) 
-                                    and str(entry['Subject']) == str(row['Subject']))
-                
-                total_scheduled_hours += scheduled_hours
-                
-                if scheduled_hours < required_hours:
-                    penalty += (required_hours - scheduled_hours) * 10
-        
-        fitness -= penalty
-        return max(fitness, 1)
-    
-    def run(self, generations=150, population_size=100):
-        """Run genetic algorithm with STRICT constraint satisfaction."""
-        # Create initial population
-        population = []
-        for _ in range(population_size):
-            population.append(self.create_individual())
-        
-        best_individual = None
-        best_fitness = 0
-        generations_without_improvement = 0
-        
-        for gen in range(generations):
-            # Evaluate fitness for all individuals
-            fitness_scores = []
-            for individual in population:
-                fitness = self.calculate_fitness(individual)
-                fitness_scores.append(fitness)
-                
-                if fitness > best_fitness:
-                    best_fitness = fitness
-                    best_individual = individual
-                    generations_without_improvement = 0
-            
-            # Early stopping if no improvement
-            generations_without_improvement += 1
-            if generations_without_improvement > 20 and best_fitness > 500:
-                # We have a good solution, apply repairs
-                if best_individual:
-                    best_individual = self.repair_clashes(best_individual)
-                break
-            
-            # Selection (elitism + tournament)
-            if len(population) > 2:
-                # Keep top 10% as elite
-                elite_count = max(2, population_size // 10)
-                indexed_fitness = [(i, fitness_scores[i]) for i in range(len(fitness_scores))]
-                indexed_fitness.sort(key=lambda x: x[1], reverse=True)
-                
-                elite_indices = [idx for idx, _ in indexed_fitness[:elite_count]]
-                new_population = [population[i] for i in elite_indices]
-                
-                # Tournament selection for rest
-                while len(new_population) < population_size:
-                    tournament_size = min(5, len(population))
-                    tournament_indices = random.sample(range(len(population)), tournament_size)
-                    tournament_fitness = [(idx, fitness_scores[idx]) for idx in tournament_indices]
-                    tournament_fitness.sort(key=lambda x: x[1], reverse=True)
-                    
-                    winner_idx = tournament_fitness[0][0]
-                    new_population.append(population[winner_idx])
-                
-                population = new_population[:population_size]
-            
-            # Mutation (lower rate to preserve good solutions)
-            for i in range(1, len(population)):
-                if random.random() < 0.05:  # 5% mutation rate
-                    population[i] = self.create_individual()
-        
-        # Apply final repair to best solution
+
+    def run(self, generations=150, population_size=100, workers=1, seed=None,
+            crossover='day_uniform', crossover_rate=0.8, mutation_rate=0.3, mutation_weights=None,
+            on_generation=None, time_budget_s=None, max_evaluations=None, target_fitness=None,
+            patience=20, patience_min_fitness=500, greedy_fraction=0.5, polish_iterations=0, cache=None):
+        """Run genetic algorithm with STRICT constraint satisfaction.
+
+        workers > 1 spreads population construction and fitness evaluation
+        over a process pool; for a given seed the result is the same for
+        any number of workers.
+
+        greedy_fraction of the initial population is built by the
+        constructive seeder (create_greedy_individual), the rest at random.
+
+        crossover names an operator from src.operators.CROSSOVERS (None
+        disables it); mutation_weights maps src.operators.MUTATIONS names
+        to relative selection weights.
+
+        Besides the generation count, the run stops when time_budget_s or
+        max_evaluations (population scorings plus the move deltas operators
+        score, see scratch_evaluator) is used up, when target_fitness is reached, or
+        after patience generations without improvement once the best fitness
+        is above patience_min_fitness (None: at any fitness; see src.budget).
+        The best individual found so far is then repaired and returned;
+        polish_iterations > 0 anneals it further before decoding.
+
+        cache, a src.result_cache.ResultCache, returns a stored result for
+        the same problem and parameters without running, and otherwise
+        seeds the population with the best stored individual for the same
+        problem (self.last_cache is 'hit', 'warm' or 'miss').
+
+        on_generation, if given, is called after each generation is scored
+        with that generation's row of the run report (best/mean/worst
+        fitness, evaluations per second, elapsed time). The full report,
+        with phase timings, is kept in self.last_report.
+        """
+        rng = random.Random(seed)
+        operators = OperatorConfig(crossover, crossover_rate, mutation_rate, mutation_weights)
+        budget = Budget(time_budget_s, max_evaluations, target_fitness, patience, patience_min_fitness).start()
+        params = dict(generations=generations, population_size=population_size, seed=seed,
+                      crossover=crossover, crossover_rate=crossover_rate, mutation_rate=mutation_rate,
+                      mutation_weights=mutation_weights, time_budget_s=time_budget_s,
+                      max_evaluations=max_evaluations, target_fitness=target_fitness, patience=patience,
+                      patience_min_fitness=patience_min_fitness,
+                      greedy_fraction=greedy_fraction, polish_iterations=polish_iterations)
+        report = RunReport(workers=workers, **params)
+        self.last_report = report
+        self.last_cache = None
+        stop_reason = 'generations'
+
+        # Identical inputs and parameters: return the stored result; same inputs
+        # with other parameters: start from the stored best individual
+        warm_start = None
+        if cache is not None:
+            problem_hash = problem_key(self.problem, self.grid, self.constraints, self.domains)
+            key = run_key(problem_hash, 'ga', params)
+            entry = cache.get(problem_hash, key)
+            if entry is not None:
+                self.last_cache = 'hit'
+                report.finish(entry['fitness'], 'cache')
+                return entry['timetable'], entry['fitness']
+
+            entry = cache.best_for_problem(problem_hash)
+            if entry is not None and entry['individual'] is not None:
+                warm_start = entry['individual']
+            self.last_cache = 'warm' if warm_start is not None else 'miss'
+
+        with make_pool(self, workers) as pool:
+            # Create initial population, in chunks so a time budget can cut it short
+            with report.phase('construction'):
+                seeds = [rng.getrandbits(64) for _ in range(population_size)]
+                n_greedy = round(population_size * greedy_fraction)
+                chunk = max(1, workers) * 4
+                population = []
+                for start in range(0, len(seeds), chunk):
+                    # Greedy seeds come first so a short budget still gets them
+                    greedy = [seed for i, seed in enumerate(seeds[start:start + chunk], start) if i < n_greedy]
+                    randoms = seeds[start + len(greedy):start + chunk]
+                    population.extend(pool.create(greedy, greedy=True) + pool.create(randoms))
+                    if budget.out_of_time():
+                        break
+                if warm_start is not None and population:
+                    population[0] = warm_start.copy()
+
+            best_individual = None
+            best_fitness = 0
+            generations_without_improvement = 0
+
+            for gen in range(generations):
+                # Only score as many individuals as the evaluation budget allows
+                evaluations_left = budget.evaluations_left(report.evaluations + report.move_evaluations)
+                if budget.exhausted(report.evaluations + report.move_evaluations):
+                    stop_reason = 'max_evaluations'
+                    break
+                if evaluations_left is not None:
+                    population = population[:evaluations_left]
+
+                # Evaluate fitness for all individuals
+                eval_start = time.perf_counter()
+                with report.phase('evaluation'):
+                    fitness_scores = pool.fitness(population)
+                eval_seconds = time.perf_counter() - eval_start
+
+                for individual, fitness in zip(population, fitness_scores):
+                    if fitness > best_fitness:
+                        best_fitness = fitness
+                        best_individual = individual
+                        generations_without_improvement = 0
+
+                stats = report.record_generation(gen, fitness_scores, best_fitness, eval_seconds)
+                if on_generation:
+                    on_generation(stats)
+
+                # Early stopping: target reached, no improvement, or out of time;
+                # the final repair below polishes the best so far
+                generations_without_improvement += 1
+                reason = budget.stop_reason(best_fitness, generations_without_improvement)
+                if reason:
+                    stop_reason = reason
+                    break
+
+                # Operators may only score what is left of the evaluation budget
+                with report.phase('selection'):
+                    moves_before = self.move_evaluations
+                    evaluations_left = budget.evaluations_left(report.evaluations + report.move_evaluations)
+                    self.move_limit = None if evaluations_left is None else moves_before + evaluations_left
+                    try:
+                        population = self.next_generation(population, fitness_scores, population_size, rng, operators)
+                    finally:
+                        self.move_limit = None
+                    report.move_evaluations += self.move_evaluations - moves_before
+
+        # Apply final repair to best solution, within whatever time is left
+        if best_individual:
+            time_limit_ms = 2000
+            if budget.remaining_s() is not None:
+                time_limit_ms = min(time_limit_ms, budget.remaining_s() * 1000)
+            with report.phase('repair'):
+                best_individual = self.repair_clashes(best_individual, time_limit_ms=time_limit_ms)
+                best_fitness = self.calculate_fitness(best_individual)
+
+            if polish_iterations:
+                with report.phase('polish'):
+                    best_individual = self.polish(best_individual, polish_iterations, rng, budget.remaining_s())
+                    best_fitness = self.calculate_fitness(best_individual)
+
+        report.finish(best_fitness, stop_reason)
+
+        # Only the final timetable is expanded into the dict form
+        timetable = self.decode(best_individual) if best_individual else None
+        if cache is not None and timetable:
+            cache.put(problem_hash, key, timetable, best_fitness, best_individual)
+        return timetable, best_fitness
+
+    def next_generation(self, population, fitness_scores, population_size, rng, operators):
+        """Build the next population: elites survive, the rest are bred by tournament
+        selection, crossover and mutation (see src/operators.py).
+
+        When move_limit is set, breeding stops as soon as operators reach it,
+        so the population can come back short."""
+        if len(population) <= 2:
+            return list(population)
+
+        # Keep top 10% as elite
+        elite_count = max(2, population_size // 10)
+        indexed_fitness = [(i, fitness_scores[i]) for i in range(len(fitness_scores))]
+        indexed_fitness.sort(key=lambda x: x[1], reverse=True)
+        new_population = [population[idx] for idx, _ in indexed_fitness[:elite_count]]
+
+        def tournament():
+            tournament_size = min(5, len(population))
+            tournament_indices = rng.sample(range(len(population)), tournament_size)
+            winner_idx = max(tournament_indices, key=lambda idx: fitness_scores[idx])
+            return population[winner_idx]
+
+        # Offspring for the rest; stop breeding once operators have used up move_limit
+        while len(new_population) < population_size and self.moves_left() != 0:
+            child = tournament()
+            if rng.random() < operators.crossover_rate:
+                child = operators.crossover_fn()(self, child, tournament(), rng)
+            if rng.random() < operators.mutation_rate:
+                mutation = operators.choose_mutation(rng)
+                if mutation:
+                    child = mutation(self, child, rng)
+            new_population.append(child)
+
+        return new_population[:population_size]
+
+    def run_islands(self, islands=4, generations=150, population_size=50, migration_interval=10,
+                    migrants=2, topology='ring', seed=None, on_progress=None, operators=None):
+        """Island-model GA: one sub-population per process, exchanging elites.
+
+        Every migration_interval generations each island sends its top
+        `migrants` individuals to its neighbours ('ring' or 'full' topology).
+        on_progress receives one dict per island and generation; operators
+        is an optional src.operators.OperatorConfig.
+        """
+        best_individual, best_fitness = run_island_model(
+            self, islands, generations, population_size, migration_interval,
+            migrants, topology, seed, operators or OperatorConfig(), on_progress)
+
         if best_individual:
             best_individual = self.repair_clashes(best_individual)
             best_fitness = self.calculate_fitness(best_individual)
-        
-        return best_individual, best_fitness
-    
+
+        return (self.decode(best_individual) if best_individual else None), best_fitness
+
     def get_statistics(self, timetable):
         """Get statistics about generated timetable."""
         if not timetable:
             return {}
-        
+
         df_timetable = pd.DataFrame(timetable)
-        
+
         stats = {
             'total_classes': len(timetable),
             'unique_classes': df_timetable['Class'].nunique(),
@@ -442,14 +570,14 @@ class GeneticAlgorithmTimetable:
             'rooms_used': df_timetable['Room'].nunique(),
             'total_hours_scheduled': df_timetable['Total Hours'].sum() if 'Total Hours' in df_timetable.columns else 0,
         }
-        
+
         # Calculate duration distribution
         if 'Duration' in df_timetable.columns:
             duration_counts = df_timetable['Duration'].value_counts()
             stats['duration_distribution'] = dict(duration_counts)
-        
+
         # Calculate room utilization
         room_usage = df_timetable['Room'].value_counts().to_dict()
         stats['room_utilization'] = room_usage
-        
-        return stats
\ No newline at end of file
+
+        return stats
@@ -0,0 +1,42 @@
+import numpy as np
+
+UNPLACED = -1
+
+
+class Individual:
+    """Compact integer genome for one timetable.
+
+    Gene ``i`` is lecture block ``i`` of the GA's block table. The three
+    parallel arrays hold its day index, start-slot index and room index;
+    a day of ``UNPLACED`` means the block could not be scheduled.
+    """
+
+    __slots__ = ('day', 'slot', 'room')
+
+    def __init__(self, n_blocks):
+        self.day = np.full(n_blocks, UNPLACED, dtype=np.int8)
+        self.slot = np.full(n_blocks, UNPLACED, dtype=np.int8)
+        self.room = np.full(n_blocks, UNPLACED, dtype=np.int16)
+
+    def __len__(self):
+        return len(self.day)
+
+    def place(self, block, day, slot, room):
+        """Assign a block to (day, start slot, room)."""
+        self.day[block] = day
+        self.slot[block] = slot
+        self.room[block] = room
+
+    def placed_blocks(self):
+        """Return the ids of all scheduled blocks."""
+        return np.flatnonzero(self.day != UNPLACED)
+
+    def copy(self):
+        clone = Individual.__new__(Individual)
+        clone.day = self.day.copy()
+        clone.slot = self.slot.copy()
+        clone.room = self.room.copy()
+        return clone
+
+    def nbytes(self):
+        return self.day.nbytes + self.slot.nbytes + self.room.nbytes
@@ -0,0 +1,158 @@
+import multiprocessing as mp
+import queue
+import random
+
+from src.parallel import SerialPool
+
+TOPOLOGIES = ('ring', 'full')
+
+# Put in every inbox when an island dies so the others stop waiting for migrants
+STOP = None
+
+
+def neighbours(island, islands, topology):
+    """Islands that receive migrants from `island`."""
+    if islands < 2:
+        return []
+    if topology == 'ring':
+        return [(island + 1) % islands]
+    if topology == 'full':
+        return [i for i in range(islands) if i != island]
+    raise ValueError(f"Unknown island topology: {topology!r} (expected one of {TOPOLOGIES})")
+
+
+def _island_main(island, problem, grid, constraints, domains, seed, generations, population_size,
+                 migration_interval, migrants, operators, targets, n_sources, inboxes, progress, results):
+    from src.ga_timetable import GeneticAlgorithmTimetable
+
+    ga = GeneticAlgorithmTimetable.from_problem(problem, grid, constraints, domains)
+    rng = random.Random(seed)
+    pool = SerialPool(ga)
+
+    population = pool.create([rng.getrandbits(64) for _ in range(population_size)])
+    best_individual = None
+    best_fitness = 0
+
+    for gen in range(generations):
+        fitness_scores = pool.fitness(population)
+        for individual, fitness in zip(population, fitness_scores):
+            if fitness > best_fitness:
+                best_fitness = fitness
+                best_individual = individual
+
+        progress.put({
+            'island': island,
+            'generation': gen,
+            'best_fitness': best_fitness,
+            'mean_fitness': sum(fitness_scores) / len(fitness_scores),
+        })
+
+        # Migration: send our elites, then replace our worst with the arrivals
+        if n_sources and (gen + 1) % migration_interval == 0 and gen + 1 < generations:
+            ranked = sorted(range(len(population)), key=lambda i: fitness_scores[i], reverse=True)
+            elites = [(population[i], fitness_scores[i]) for i in ranked[:migrants]]
+            for target in targets:
+                inboxes[target].put(elites)
+
+            arrivals = []
+            for _ in range(n_sources):
+                batch = inboxes[island].get()
+                if batch is STOP:
+                    return
+                arrivals.extend(batch)
+
+            worst = ranked[::-1][:len(arrivals)]
+            for i, (individual, fitness) in zip(worst, arrivals):
+                population[i] = individual
+                fitness_scores[i] = fitness
+
+        population = ga.next_generation(population, fitness_scores, population_size, rng, operators)
+
+    results.put((island, best_individual, best_fitness))
+
+
+def _stop_islands(processes, inboxes):
+    """Wake islands blocked on their inbox with STOP, then end any that are still running."""
+    for inbox in inboxes:
+        inbox.put(STOP)
+    for process in processes:
+        process.join(timeout=1.0)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+
+def run_island_model(ga, islands, generations, population_size, migration_interval,
+                     migrants, topology, seed, operators, on_progress=None):
+    """Evolve `islands` sub-populations in separate processes; returns (best genome, fitness).
+
+    If an island process dies the others are stopped and RuntimeError is raised.
+    """
+    targets = [neighbours(i, islands, topology) for i in range(islands)]
+    sources = [sum(1 for t in targets if i in t) for i in range(islands)]
+    migration_interval = max(1, migration_interval)
+
+    master = random.Random(seed)
+    island_seeds = [master.getrandbits(64) for _ in range(islands)]
+
+    inboxes = [mp.Queue() for _ in range(islands)]
+    progress = mp.Queue()
+    results = mp.Queue()
+
+    processes = [
+        mp.Process(
+            target=_island_main,
+            args=(i, ga.problem, ga.grid, ga.constraints, ga.domains, island_seeds[i], generations,
+                  population_size, migration_interval, migrants, operators, targets[i], sources[i],
+                  inboxes, progress, results),
+            daemon=True,
+        )
+        for i in range(islands)
+    ]
+    for process in processes:
+        process.start()
+
+    finished = {}
+    while len(finished) < islands:
+        try:
+            report = progress.get(timeout=0.1)
+            if on_progress:
+                on_progress(report)
+            continue
+        except queue.Empty:
+            pass
+
+        try:
+            while True:
+                island, individual, fitness = results.get_nowait()
+                finished[island] = (individual, fitness)
+        except queue.Empty:
+            pass
+
+        # A dead island would leave its neighbours waiting for migrants: fail the whole run
+        failed = [i for i, p in enumerate(processes) if i not in finished and not p.is_alive() and p.exitcode]
+        if failed:
+            _stop_islands(processes, inboxes)
+            raise RuntimeError(f"Island {failed[0]} died (exit code {processes[failed[0]].exitcode}); "
+                               f"island run stopped")
+        if len(finished) < islands and not any(p.is_alive() for p in processes) and results.empty():
+            raise RuntimeError("Island process exited without returning a result")
+
+    # Flush progress reports still queued after the last island finished
+    if on_progress:
+        try:
+            while True:
+                on_progress(progress.get_nowait())
+        except queue.Empty:
+            pass
+
+    for process in processes:
+        process.join()
+
+    best_individual, best_fitness = None, 0
+    for island in range(islands):
+        individual, fitness = finished[island]
+        if fitness > best_fitness:
+            best_individual, best_fitness = individual, fitness
+
+    return best_individual, best_fitness
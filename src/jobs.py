@@ -0,0 +1,131 @@
+import itertools
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class Job:
+    def __init__(self, job_id, key):
+        self.id = job_id
+        self.key = key
+        self.status = PENDING
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def snapshot(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'progress': dict(self.progress),
+            'error': self.error,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class JobRunner:
+    """Runs schedule-generation tasks in a bounded background pool.
+
+    A task is a callable taking one argument, report(**progress), which it
+    calls to publish progress (e.g. generation and best fitness). Submitting
+    a task whose key matches a pending or running job returns that job's id
+    instead of queueing a duplicate.
+    """
+
+    def __init__(self, max_workers=2, history=100):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='schedule-job')
+        self.history = history
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def submit(self, task, key=None):
+        with self.lock:
+            if key is not None:
+                for job in self.jobs.values():
+                    if job.key == key and job.status in (PENDING, RUNNING):
+                        return job.id
+
+            job = Job(f"job-{next(self._ids)}", key)
+            self.jobs[job.id] = job
+            self._trim()
+
+        self.executor.submit(self._run, job, task)
+        return job.id
+
+    def _run(self, job, task):
+        job.status = RUNNING
+        job.started_at = time.time()
+
+        def report(**progress):
+            job.progress.update(progress)
+
+        try:
+            job.result = task(report)
+            job.status = DONE
+        except Exception as e:
+            job.error = f"{e}\n{traceback.format_exc()}"
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _trim(self):
+        """Forget the oldest finished jobs beyond the history limit."""
+        finished = [job for job in self.jobs.values() if job.status in (DONE, FAILED)]
+        for job in finished[:max(0, len(self.jobs) - self.history)]:
+            del self.jobs[job.id]
+
+    def status(self, job_id):
+        job = self.jobs.get(job_id)
+        return job.snapshot() if job else None
+
+    def result(self, job_id):
+        job = self.jobs.get(job_id)
+        return job.result if job and job.status == DONE else None
+
+    def latest(self, key):
+        """Id of the most recent job submitted with this key, if any."""
+        with self.lock:
+            matches = [job for job in self.jobs.values() if job.key == key]
+        return matches[-1].id if matches else None
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+
+def timetable_job(csv_file="timetable_data.csv", engine='ga', **run_options):
+    """Task that runs a scheduling engine on csv_file and returns (timetable, fitness).
+
+    Progress carries the convergence history so far (one row per
+    generation or annealing checkpoint) and, for the GA, the run report
+    as a dict once finished.
+    """
+    def task(report):
+        from src.engines import ENGINES
+
+        ga = ENGINES[engine](csv_file=csv_file)
+        total = run_options.get('generations', 150)
+        history = []
+
+        def on_generation(stats):
+            history.append(stats)
+            report(generation=stats['generation'] + 1, generations=stats.get('generations', total),
+                   best_fitness=stats['best_fitness'], history=list(history))
+
+        result = ga.run(on_generation=on_generation, **run_options)
+        if getattr(ga, 'last_report', None):
+            report(run_report=ga.last_report.to_dict())
+        return result
+
+    return task
@@ -0,0 +1,69 @@
+def span_mask(start, duration=1):
+    """Bitmask covering `duration` slots from `start`."""
+    return ((1 << duration) - 1) << start
+
+
+def popcount(mask):
+    return bin(mask).count('1')
+
+
+def free_starts(busy, duration, n_slots, allowed=None):
+    """Start slots where `duration` consecutive slots are clear of the `busy` mask.
+
+    All starts are found at once with shifts and ANDs over the free mask
+    instead of testing each window slot by slot. allowed, a bitmask of
+    permitted starts (TimeGrid.start_masks), filters the result.
+    """
+    free = ~busy & ((1 << n_slots) - 1)
+    runs = free
+    for i in range(1, duration):
+        runs &= free >> i  # bit s stays set only if slot s + i is free too
+    if allowed is not None:
+        runs &= allowed
+
+    starts = []
+    while runs:
+        low = runs & -runs
+        starts.append(low.bit_length() - 1)
+        runs ^= low
+    return starts
+
+
+class OccupancyGrid:
+    """One integer bitmask per (entity, day); bit s is set when slot s is taken.
+
+    Entities and days can be any hashable ids (integer indexes in the GA,
+    names in the Streamlit resolver). A double booking is not counted:
+    release() clears the bits regardless of how many bookings set them.
+    """
+
+    def __init__(self, n_slots):
+        self.n_slots = n_slots
+        self.masks = {}
+
+    def mask(self, entity, day):
+        return self.masks.get((entity, day), 0)
+
+    def busy(self, entities, day):
+        """Combined mask of several entities (e.g. all faculty of a lab) on a day."""
+        combined = 0
+        for entity in entities:
+            combined |= self.masks.get((entity, day), 0)
+        return combined
+
+    def is_free(self, entity, day, start, duration=1):
+        return not self.masks.get((entity, day), 0) & span_mask(start, duration)
+
+    def hours(self, entity, day):
+        return popcount(self.masks.get((entity, day), 0))
+
+    def occupy(self, entity, day, start, duration=1):
+        key = (entity, day)
+        self.masks[key] = self.masks.get(key, 0) | span_mask(start, duration)
+
+    def release(self, entity, day, start, duration=1):
+        key = (entity, day)
+        self.masks[key] = self.masks.get(key, 0) & ~span_mask(start, duration)
+
+    def free_starts(self, entity, day, duration):
+        return free_starts(self.mask(entity, day), duration, self.n_slots)
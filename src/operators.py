@@ -0,0 +1,184 @@
+from src.genome import UNPLACED
+
+
+def random_placement(ga, b, rng):
+    """A random (day, start slot, room) from block b's domain (see src.availability.Domains)."""
+    domains = ga.domains
+    if domains.masks[b] is None:
+        day = rng.randrange(ga.grid.n_days)
+        slot = rng.choice(ga.grid.starts(ga.problem.blocks[b].duration))
+    else:
+        day, slot = rng.choice(domains.placements(b))
+    return day, slot, rng.choice(domains.rooms(b, day, slot))
+
+
+# ================== CROSSOVER ==================
+def day_preserving_crossover(ga, a, b, rng):
+    """Uniform crossover over days.
+
+    A random subset of days is taken from parent a, the other days from
+    parent b, so each parent's per-day arrangement survives intact. Blocks
+    that would end up on a day owned by neither parent keep parent a's gene.
+    """
+    days_from_a = {d for d in range(len(ga.days)) if rng.random() < 0.5}
+    child = a.copy()
+
+    for g in range(len(child)):
+        day_a = int(a.day[g])
+        day_b = int(b.day[g])
+        if day_a in days_from_a:
+            continue
+        if day_b != UNPLACED and day_b not in days_from_a:
+            child.place(g, day_b, b.slot[g], b.room[g])
+
+    return child
+
+
+# ================== MUTATIONS ==================
+def block_swap(ga, individual, rng):
+    """Swap the day/start of two placed blocks of equal duration (rooms stay).
+
+    Fixed lectures are never picked and a partner qualifies only if both
+    blocks may take the other's time with their own rooms.
+    """
+    domains = ga.domains
+    child = individual.copy()
+    placed = child.placed_blocks()
+    if domains.fixed:
+        placed = [g for g in placed if g not in domains.fixed]
+    if len(placed) < 2:
+        return child
+
+    first = int(rng.choice(placed))
+    duration = ga.problem.blocks[first].duration
+    partners = [int(g) for g in placed if g != first and ga.problem.blocks[g].duration == duration]
+    if domains.restricted:
+        day, slot, room = int(child.day[first]), int(child.slot[first]), int(child.room[first])
+        partners = [g for g in partners
+                    if domains.allows(g, day, slot, int(child.room[g]))
+                    and domains.allows(first, int(child.day[g]), int(child.slot[g]), room)]
+    if not partners:
+        return child
+
+    second = rng.choice(partners)
+    day, slot = child.day[first], child.slot[first]
+    child.place(first, child.day[second], child.slot[second], child.room[first])
+    child.place(second, day, slot, child.room[second])
+    return child
+
+
+def block_shift(ga, individual, rng):
+    """Move one block to a random day and start slot, keeping its room when it has one
+    (and may use it there)."""
+    child = individual.copy()
+    movable = ga.domains.movable
+    if not movable:
+        return child
+    g = movable[rng.randrange(len(movable))]
+    day, slot, room = random_placement(ga, g, rng)
+    if child.room[g] != UNPLACED and ga.domains.allows(g, day, slot, int(child.room[g])):
+        room = int(child.room[g])
+    child.place(g, day, slot, room)
+    return child
+
+
+def room_reassign(ga, individual, rng):
+    """Give one placed block a different room from its domain."""
+    domains = ga.domains
+    child = individual.copy()
+    placed = child.placed_blocks()
+    if domains.fixed:
+        placed = [g for g in placed if g not in domains.fixed]
+    if len(placed) == 0:
+        return child
+
+    g = int(rng.choice(placed))
+    child.room[g] = rng.choice(domains.rooms(g, int(child.day[g]), int(child.slot[g])))
+    return child
+
+
+def conflict_directed(ga, individual, rng, candidates=24):
+    """Move one clashing block to the best of a sample of alternative placements.
+
+    Scores through the GA's reusable evaluator; the candidate deltas are
+    counted in ga.move_evaluations (charged to the run's evaluation budget)
+    and capped by ga.moves_left(). With no moves left the copy is returned as is.
+    """
+    moves_left = ga.moves_left()
+    if moves_left is not None:
+        candidates = min(candidates, moves_left)
+    child = individual.copy()
+    if candidates <= 0:
+        return child
+    evaluator = ga.scratch_evaluator(child)
+    conflicting = evaluator.conflicting_blocks()
+    if ga.domains.fixed:
+        conflicting = [g for g in conflicting if g not in ga.domains.fixed]
+    if not conflicting:
+        # Nothing clashes: place a missing block if there is one, otherwise shift
+        missing = [g for g in ga.domains.movable if child.day[g] == UNPLACED]
+        if not missing:
+            evaluator.detach()
+            return block_shift(ga, child, rng)
+        conflicting = missing
+
+    g = rng.choice(conflicting)
+    best_move, best_delta = None, 0
+    for _ in range(candidates):
+        move = (g,) + random_placement(ga, g, rng)
+        delta = evaluator.delta(move)
+        if best_move is None or delta < best_delta:
+            best_move, best_delta = move, delta
+    ga.move_evaluations += candidates
+
+    evaluator.apply(best_move)
+    evaluator.detach()
+    return child
+
+
+CROSSOVERS = {
+    'day_uniform': day_preserving_crossover,
+}
+
+MUTATIONS = {
+    'swap': block_swap,
+    'shift': block_shift,
+    'room': room_reassign,
+    'conflict': conflict_directed,
+}
+
+DEFAULT_MUTATION_WEIGHTS = {
+    'swap': 1.0,
+    'shift': 1.0,
+    'room': 0.5,
+    'conflict': 2.0,
+}
+
+
+class OperatorConfig:
+    """Which variation operators run() applies, and how often."""
+
+    def __init__(self, crossover='day_uniform', crossover_rate=0.8, mutation_rate=0.3,
+                 mutation_weights=None):
+        if crossover is not None and crossover not in CROSSOVERS:
+            raise ValueError(f"Unknown crossover: {crossover!r} (expected one of {sorted(CROSSOVERS)})")
+
+        weights = dict(DEFAULT_MUTATION_WEIGHTS if mutation_weights is None else mutation_weights)
+        unknown = set(weights) - set(MUTATIONS)
+        if unknown:
+            raise ValueError(f"Unknown mutation operators: {sorted(unknown)} (expected {sorted(MUTATIONS)})")
+
+        self.crossover = crossover
+        self.crossover_rate = crossover_rate if crossover else 0.0
+        self.mutation_rate = mutation_rate
+        self.mutation_names = [name for name, weight in weights.items() if weight > 0]
+        self.mutation_weights = [weights[name] for name in self.mutation_names]
+
+    def crossover_fn(self):
+        return CROSSOVERS[self.crossover]
+
+    def choose_mutation(self, rng):
+        if not self.mutation_names:
+            return None
+        name = rng.choices(self.mutation_names, weights=self.mutation_weights)[0]
+        return MUTATIONS[name]
@@ -0,0 +1,90 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+# Per-process GA rebuilt once from the compiled problem by the pool initializer
+_worker_ga = None
+
+
+def _init_worker(problem, grid, constraints, domains):
+    global _worker_ga
+    from src.ga_timetable import GeneticAlgorithmTimetable
+    _worker_ga = GeneticAlgorithmTimetable.from_problem(problem, grid, constraints, domains)
+
+
+def _create_individual(seed):
+    return _worker_ga.create_individual(random.Random(seed))
+
+
+def _create_greedy_individual(seed):
+    return _worker_ga.create_greedy_individual(random.Random(seed))
+
+
+def _calculate_fitness_batch(individuals):
+    return _worker_ga.calculate_fitness_batch(individuals)
+
+
+class SerialPool:
+    """In-process stand-in for PopulationPool when workers <= 1."""
+
+    def __init__(self, ga):
+        self.ga = ga
+
+    def create(self, seeds, greedy=False):
+        build = self.ga.create_greedy_individual if greedy else self.ga.create_individual
+        return [build(random.Random(seed)) for seed in seeds]
+
+    def fitness(self, population):
+        return self.ga.calculate_fitness_batch(population)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PopulationPool(SerialPool):
+    """Builds and scores individuals across a ProcessPoolExecutor.
+
+    The compiled problem is sent to each worker once through the pool
+    initializer; tasks only carry seeds or genomes. Every individual is
+    built from its own seed, so results do not depend on the worker count.
+    Scoring sends one contiguous chunk per worker through the vectorized
+    batch scorer, so it pays the per-task overhead once per worker.
+    """
+
+    def __init__(self, ga, workers):
+        super().__init__(ga)
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(ga.problem, ga.grid, ga.constraints, ga.domains),
+        )
+
+    def _chunksize(self, n):
+        return max(1, n // (self.workers * 4))
+
+    def create(self, seeds, greedy=False):
+        build = _create_greedy_individual if greedy else _create_individual
+        return list(self.executor.map(build, seeds, chunksize=self._chunksize(len(seeds))))
+
+    def fitness(self, population):
+        size = max(1, -(-len(population) // self.workers))
+        chunks = [population[i:i + size] for i in range(0, len(population), size)]
+        scores = []
+        for chunk_scores in self.executor.map(_calculate_fitness_batch, chunks):
+            scores.extend(chunk_scores)
+        return scores
+
+    def close(self):
+        self.executor.shutdown()
+
+
+def make_pool(ga, workers):
+    if workers and workers > 1:
+        return PopulationPool(ga, workers)
+    return SerialPool(ga)
@@ -0,0 +1,158 @@
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+from src.rooms import RoomIndex
+from src.timegrid import hours_to_periods
+
+# One course row of the input data, with its display fields; periods is hours in grid slots
+Course = namedtuple('Course', [
+    'id', 'class_id', 'subject_id', 'faculty', 'hours', 'periods',
+    'class_name', 'subject', 'faculty_name', 'code', 'type',
+])
+
+# One schedulable lecture block (the unit a gene places); duration is in grid slots
+# and rooms holds eligible room ids
+LectureBlock = namedtuple('LectureBlock', [
+    'id', 'course', 'class_id', 'subject_id', 'faculty', 'duration', 'room_type', 'rooms',
+])
+
+
+class CompiledProblem:
+    """Immutable, integer-indexed view of the course data used by every GA operator.
+
+    Durations, required coverage and (through periods()) the hour-based
+    rule limits are counted in grid periods of period_minutes.
+    """
+
+    def __init__(self, courses, blocks, class_names, subject_names, faculty_names,
+                 rooms, compile_seconds, period_minutes=60):
+        self.courses = tuple(courses)
+        self.blocks = tuple(blocks)
+        self.period_minutes = period_minutes
+
+        # (class id, subject id) -> weekly periods required
+        self.required_periods = {}
+        for course in self.courses:
+            key = (course.class_id, course.subject_id)
+            self.required_periods[key] = self.required_periods.get(key, 0) + course.periods
+
+        self.class_names = tuple(class_names)
+        self.subject_names = tuple(subject_names)
+        self.faculty_names = tuple(faculty_names)
+        self.rooms = rooms  # src.rooms.RoomIndex
+        self.room_names = rooms.names
+        self.compile_seconds = compile_seconds
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def periods(self, hours):
+        """Grid periods covering `hours` (see src.timegrid.hours_to_periods)."""
+        return hours_to_periods(hours, self.period_minutes)
+
+    def summary(self):
+        return {
+            'courses': len(self.courses),
+            'blocks': len(self.blocks),
+            'classes': len(self.class_names),
+            'faculty': len(self.faculty_names),
+            'rooms': len(self.room_names),
+            'compile_ms': round(self.compile_seconds * 1000, 2),
+        }
+
+
+def _intern(name, names, index):
+    """Return the id of name, adding it to the lookup table if new."""
+    if name not in index:
+        index[name] = len(names)
+        names.append(name)
+    return index[name]
+
+
+def _row_hours(value):
+    try:
+        return int(value) if pd.notna(value) else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+def room_type_for(course_type):
+    return 'Lab' if 'Lab' in str(course_type) else 'Lecture'
+
+
+def class_sizes(df):
+    """Largest Enrollment given for each class (0 when the data has none)."""
+    if 'Enrollment' not in df.columns:
+        return {}
+    sizes = pd.to_numeric(df['Enrollment'], errors='coerce').fillna(0).groupby(df['Class'].astype(str)).max()
+    return {name: int(size) for name, size in sizes.items()}
+
+
+def compile_problem(df, rooms, split_periods, period_minutes=60):
+    """Turn the course DataFrame into an immutable table of lecture blocks.
+
+    A course's weekly hours become ceil(hours * 60 / period_minutes) grid
+    periods (pass TimeGrid.period_minutes), and split_periods maps those
+    to its list of block durations.
+    rooms is a src.rooms.RoomIndex (or a list of room names); each block's
+    eligible rooms come from it for the course's room type and the class's
+    enrolment, smallest adequate room first.
+    All string parsing (hours, faculty lists, room filtering) happens here once.
+    """
+    started = time.perf_counter()
+
+    class_names, subject_names, faculty_names = [], [], []
+    class_index, subject_index, faculty_index = {}, {}, {}
+    if not isinstance(rooms, RoomIndex):
+        rooms = RoomIndex.from_names(rooms)
+    sizes = class_sizes(df)
+
+    has_faculty_id = 'FacultyID' in df.columns
+    has_code = 'Code' in df.columns
+    has_type = 'Type' in df.columns
+
+    courses = []
+    blocks = []
+
+    for row in df.to_dict('records'):
+        hours = _row_hours(row['Hours'])
+        if hours <= 0:
+            continue
+
+        faculty_field = row['FacultyID'] if has_faculty_id else row['Faculty']
+        course_type = str(row['Type']) if has_type else 'Theory'
+        room_type = room_type_for(course_type)
+
+        course = Course(
+            id=len(courses),
+            class_id=_intern(str(row['Class']), class_names, class_index),
+            subject_id=_intern(str(row['Subject']), subject_names, subject_index),
+            faculty=tuple(_intern(f.strip(), faculty_names, faculty_index)
+                          for f in str(faculty_field).split(';')),
+            hours=hours,
+            periods=hours_to_periods(hours, period_minutes),
+            class_name=str(row['Class']),
+            subject=str(row['Subject']),
+            faculty_name=str(row['Faculty']),
+            code=str(row['Code']) if has_code else '',
+            type=course_type,
+        )
+        courses.append(course)
+        eligible = rooms.eligible(room_type, sizes.get(course.class_name, 0))
+
+        for duration in split_periods(course.periods):
+            blocks.append(LectureBlock(
+                id=len(blocks),
+                course=course.id,
+                class_id=course.class_id,
+                subject_id=course.subject_id,
+                faculty=course.faculty,
+                duration=duration,
+                room_type=room_type,
+                rooms=eligible,
+            ))
+
+    return CompiledProblem(courses, blocks, class_names, subject_names, faculty_names,
+                           rooms, time.perf_counter() - started, period_minutes)
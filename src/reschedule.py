@@ -0,0 +1,299 @@
+import json
+import random
+import time
+
+import pandas as pd
+
+from src.annealing import SimulatedAnnealing
+from src.availability import Domains
+from src.ga_timetable import GeneticAlgorithmTimetable
+from src.genome import Individual, UNPLACED
+from src.problem import compile_problem
+from src.schema import canonical_columns, validate_courses
+
+DIFF_COLUMNS = ['Change', 'Class', 'Subject', 'Faculty', 'Old Day', 'Old Time Slot', 'Old Room',
+                'New Day', 'New Time Slot', 'New Room']
+
+
+def load_changeset(path):
+    """Read a JSON changeset.
+
+    Recognised keys (all optional):
+      "faculty":        [{"Class", "Subject", "Faculty", "FacultyID"?}]  reassign a course
+      "rooms_out":      ["Room-03", ...]                              rooms out of service
+      "remove_courses": [{"Class", "Subject"}]                        drop courses
+      "add_courses":    [{course row as in timetable_data.csv}]       new courses (CSV or canonical column names)
+    """
+    with open(path) as f:
+        return json.load(f)
+
+
+def added_courses(changeset):
+    """The changeset's add_courses rows as a frame with canonical columns (see src.schema.COLUMN_MAP)."""
+    return canonical_columns(pd.DataFrame(changeset.get('add_courses', [])))
+
+
+def changed_courses(changeset):
+    """(class, subject) pairs the changeset adds or reassigns."""
+    changed = {(str(c['Class']), str(c['Subject'])) for c in changeset.get('faculty', [])}
+    added = added_courses(changeset)
+    if 'Class' in added.columns and 'Subject' in added.columns:
+        changed.update(zip(added['Class'].astype(str), added['Subject'].astype(str)))
+    return changed
+
+
+def apply_changeset(df, rooms, changeset):
+    """Course table and src.rooms.RoomIndex with the changeset applied."""
+    # Categorical columns cannot take new names; edit as text and re-apply the schema at the end
+    df = df.astype({c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+
+    for change in changeset.get('faculty', []):
+        rows = (df['Class'] == change['Class']) & (df['Subject'] == change['Subject'])
+        df.loc[rows, 'Faculty'] = change['Faculty']
+        if 'FacultyID' in df.columns:
+            df.loc[rows, 'FacultyID'] = change.get('FacultyID', change['Faculty'])
+
+    for course in changeset.get('remove_courses', []):
+        df = df[~((df['Class'] == course['Class']) & (df['Subject'] == course['Subject']))]
+
+    if changeset.get('add_courses'):
+        df = pd.concat([df, added_courses(changeset)], ignore_index=True).fillna('')
+
+    rooms = rooms.without(changeset.get('rooms_out', []))
+    return validate_courses(df.reset_index(drop=True), 'changeset'), rooms
+
+
+class Rescheduler:
+    """Repairs a published timetable after a changeset instead of regenerating it.
+
+    Every lecture of the previous timetable that still matches a block
+    (same class, subject and duration) keeps its day, start and room. Only
+    displaced blocks are re-solved: unscheduled blocks of changed_courses
+    ((class, subject) pairs added or reassigned; None means every course),
+    blocks whose room went out of service and reassigned blocks that now
+    clash. Each is first put at
+    its cheapest placement; blocks that still clash pull the lectures they
+    clash with into the free set (their conflict neighbourhood), and the
+    free set is then annealed with everything else pinned. A lecture whose
+    old placement the availability config now forbids (or fixes
+    elsewhere) is displaced too.
+    """
+
+    def __init__(self, ga, changed_courses=None, iterations=3000, neighbourhood_rounds=2):
+        self.ga = ga
+        self.changed_courses = changed_courses
+        self.iterations = iterations
+        self.neighbourhood_rounds = neighbourhood_rounds
+
+    @classmethod
+    def from_csv(cls, csv_file, changeset, **options):
+        """Rescheduler for csv_file's courses with the changeset applied."""
+        base = GeneticAlgorithmTimetable(csv_file=csv_file)
+        df, rooms = apply_changeset(base.df, base.rooms, changeset)
+        problem = compile_problem(df, rooms, base.get_lecture_blocks, base.grid.period_minutes)
+        ga = GeneticAlgorithmTimetable.from_problem(
+            problem, base.grid, base.constraints, Domains(problem, base.grid, base.availability))
+        ga.df = df
+        return cls(ga, changed_courses(changeset), **options)
+
+    def pin(self, previous):
+        """Individual holding the previous timetable's placements.
+
+        Returns (individual, displaced, was_at) where was_at maps each
+        block found in previous to its old (day, slot).
+        """
+        ga = self.ga
+        problem = ga.problem
+        day_index = {day: i for i, day in enumerate(ga.days)}
+        room_index = {room: i for i, room in enumerate(problem.room_names)}
+
+        # Previous lectures by (class, subject, duration in slots), in file order
+        rows = {}
+        for row in previous.to_dict('records'):
+            located = ga.grid.locate(row['Start Time'], row['End Time'])
+            if located is None:
+                continue  # off the current time grid: its block is re-placed
+            row['_slot'], duration = located
+            rows.setdefault((str(row['Class']), str(row['Subject']), duration), []).append(row)
+
+        individual = Individual(len(problem))
+        displaced, reassigned = set(), set()
+        was_at = {}
+        for block in problem.blocks:
+            course = problem.courses[block.course]
+            matches = rows.get((course.class_name, course.subject, block.duration))
+            row = matches.pop(0) if matches else None
+
+            day = day_index.get(row['Day']) if row else None
+            slot = row['_slot'] if row else None
+            room = room_index.get(row['Room']) if row else None
+            if row is None:
+                # Lectures the previous timetable left out stay out unless the changeset touches
+                # them or the availability config fixes them
+                if (self.changed_courses is None or block.id in ga.domains.pinned
+                        or (course.class_name, course.subject) in self.changed_courses):
+                    displaced.add(block.id)
+                continue
+            if day is not None and slot is not None:
+                was_at[block.id] = (day, slot)
+            if (day is None or slot is None or room is None or room not in block.rooms
+                    or not ga.domains.allows(block.id, day, slot, room)):
+                displaced.add(block.id)
+                continue
+
+            individual.place(block.id, day, slot, room)
+            if str(row['Faculty']) != course.faculty_name:
+                reassigned.add(block.id)
+
+        # A reassigned lecture stays where it was unless the new faculty clashes there
+        evaluator = ga.make_evaluator(individual)
+        displaced.update(b for b in reassigned if evaluator.in_conflict(b))
+        return individual, displaced, was_at
+
+    def run(self, previous, seed=None):
+        """Reschedule; returns (timetable, fitness, diff DataFrame).
+
+        previous is the published timetable as a DataFrame (e.g.
+        final_timetable.csv). A summary is kept in self.last_reschedule.
+        """
+        started = time.perf_counter()
+        ga = self.ga
+        rng = random.Random(seed)
+
+        individual, displaced, was_at = self.pin(previous)
+        for b in displaced:
+            individual.place(b, UNPLACED, UNPLACED, UNPLACED)
+        held = set(individual.placed_blocks().tolist())
+
+        evaluator = ga.make_evaluator(individual)
+        free = set(displaced)
+        pending = sorted(displaced, key=lambda b: len(ga.problem.blocks[b].rooms))
+        for _ in range(self.neighbourhood_rounds + 1):
+            for b in pending:
+                move = self.best_placement(evaluator, b, was_at.get(b))
+                if move is not None:
+                    evaluator.apply(move)
+
+            # Lectures clashing with a re-placed block join the free set
+            neighbours = set()
+            for b in free:
+                if evaluator.in_conflict(b):
+                    neighbours.update(self.clashing_with(evaluator, b))
+            neighbours -= free
+            if not neighbours:
+                break
+            free |= neighbours
+            pending = sorted(neighbours)
+
+        stats = {}
+        if free and evaluator.clash_count():
+            annealer = SimulatedAnnealing(ga, self.iterations, initial_temperature=20.0, drop_rate=0.0)
+            individual, stats = annealer.search(individual, rng, movable=sorted(free))
+
+        timetable = ga.decode(individual)
+        diff = timetable_diff(previous, pd.DataFrame(timetable))
+        self.last_reschedule = {
+            'displaced': len(displaced),
+            'resolved': len(free),
+            'pinned': len(held - free),  # kept at their previous placement
+            'changed_rows': int((diff['Change'] != 'unchanged').sum()) if not diff.empty else 0,
+            'anneal_evaluations': stats.get('evaluations', 0),
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+        }
+        return timetable, ga.calculate_fitness(individual), diff
+
+    def best_placement(self, evaluator, b, was_at=None):
+        """Cheapest (block, day, slot, room) for b; among equal costs, the
+        one closest to its old (day, slot) so published lectures move least."""
+        domains = self.ga.domains
+        best, best_key = None, None
+        for day, slot in domains.placements(b):
+            if was_at is None:
+                distance = 0
+            else:
+                distance = 0 if (day, slot) == was_at else (1 if day == was_at[0] else 2)
+            for room in domains.rooms(b, day, slot):
+                move = (b, day, slot, room)
+                key = (evaluator.delta(move), distance)
+                if best_key is None or key < best_key:
+                    best, best_key = move, key
+        return best
+
+    def clashing_with(self, evaluator, b):
+        """Placed blocks sharing a room, faculty or class hour with block b."""
+        problem, individual = self.ga.problem, evaluator.individual
+        block = problem.blocks[b]
+        day, start, room = int(individual.day[b]), int(individual.slot[b]), int(individual.room[b])
+
+        clashing = []
+        for other in individual.placed_blocks():
+            other = int(other)
+            if other == b or int(individual.day[other]) != day:
+                continue
+            other_block = problem.blocks[other]
+            other_start = int(individual.slot[other])
+            if other_start >= start + block.duration or start >= other_start + other_block.duration:
+                continue
+            if (int(individual.room[other]) == room or other_block.class_id == block.class_id
+                    or set(other_block.faculty) & set(block.faculty)):
+                clashing.append(other)
+        return clashing
+
+
+def timetable_diff(previous, current):
+    """Row-level diff of two timetables: moved, added, removed and unchanged lectures."""
+    def keyed(df):
+        lectures = {}
+        for row in df.to_dict('records'):
+            key = (str(row['Class']), str(row['Subject']), _duration(row))
+            lectures.setdefault(key, []).append(row)
+        return lectures
+
+    old, new = keyed(previous), keyed(current)
+    diff = []
+    for key in sorted(set(old) | set(new)):
+        # Same-time lectures pair up first so a swap between a course's blocks is not a move
+        olds, news = list(old.get(key, [])), list(new.get(key, []))
+        pairs = []
+        for row in list(olds):
+            same = next((n for n in news if _at(n) == _at(row)), None)
+            if same is not None:
+                olds.remove(row)
+                news.remove(same)
+                pairs.append((row, same))
+        pairs += list(zip(olds, news))
+        pairs += [(row, None) for row in olds[len(news):]]
+        pairs += [(None, row) for row in news[len(olds):]]
+
+        for before, after in pairs:
+            if before is None:
+                change = 'added'
+            elif after is None:
+                change = 'removed'
+            elif _at(before) == _at(after) and str(before['Faculty']) == str(after['Faculty']):
+                change = 'unchanged'
+            else:
+                change = 'moved' if _at(before) != _at(after) else 'reassigned'
+            row = after or before
+            diff.append({
+                'Change': change,
+                'Class': key[0],
+                'Subject': key[1],
+                'Faculty': row['Faculty'],
+                'Old Day': before['Day'] if before else '',
+                'Old Time Slot': before['Time Slot'] if before else '',
+                'Old Room': before['Room'] if before else '',
+                'New Day': after['Day'] if after else '',
+                'New Time Slot': after['Time Slot'] if after else '',
+                'New Room': after['Room'] if after else '',
+            })
+    return pd.DataFrame(diff, columns=DIFF_COLUMNS)
+
+
+def _duration(row):
+    """Lecture length in hours from a timetable row ('1.5 hours' or 2)."""
+    return float(str(row['Duration']).split()[0])
+
+
+def _at(row):
+    return row['Day'], row['Time Slot'], row['Room']
@@ -0,0 +1,137 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+
+DEFAULT_CACHE_DIR = ".timetable_cache"
+
+logger = logging.getLogger(__name__)
+
+
+def problem_key(problem, grid, constraints=None, domains=None):
+    """Hash of the compiled courses, blocks, rooms, time grid, active rules and availability.
+
+    Built from the compiled problem rather than the raw CSV, so formatting
+    differences that compile to the same table (whitespace, '3' vs 3.0
+    hours, extra columns) share a key; row order is kept because it fixes
+    the block ids a seeded run depends on.
+    """
+    data = {
+        'courses': [[c.class_name, c.subject, [problem.faculty_names[f] for f in c.faculty],
+                     c.hours, c.code, c.type] for c in problem.courses],
+        'blocks': [[b.course, b.duration, b.room_type, list(b.rooms)] for b in problem.blocks],
+        'rooms': [list(room) for room in problem.rooms.rooms],
+        'grid': grid.key(),
+        'constraints': constraints.key() if constraints is not None else None,
+        'availability': domains.key() if domains is not None else None,
+    }
+    return _digest(data)
+
+
+def run_key(problem_hash, engine, params):
+    """Hash of a problem plus the engine name and every result-affecting parameter."""
+    return _digest({'problem': problem_hash, 'engine': engine, 'params': params})
+
+
+def _digest(data):
+    text = json.dumps(data, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """On-disk cache of finished runs, one pickle per run key.
+
+    Files are named <problem hash prefix>-<run key>.pkl so every stored
+    run of the same problem can be found for warm starts. Reads refresh a
+    file's mtime and writes evict the least recently used files beyond
+    max_entries / max_bytes.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_entries=50, max_bytes=50 * 1024 * 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def _path(self, problem_hash, key):
+        return os.path.join(self.directory, f"{problem_hash[:16]}-{key}.pkl")
+
+    def _load(self, path):
+        """Entry stored at path, or None; a file that cannot be read back is deleted."""
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            if not isinstance(entry, dict):
+                raise TypeError(f"expected a dict, got {type(entry).__name__}")
+        except FileNotFoundError:
+            return None  # evicted by another process
+        except Exception as error:
+            # Truncated, from an incompatible version of the code, or not ours: a cache miss
+            logger.warning("Discarding unreadable cache entry %s: %r", path, error)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return entry
+
+    def get(self, problem_hash, key):
+        """Stored entry for this exact run, or None."""
+        path = self._path(problem_hash, key)
+        return self._load(path) if os.path.exists(path) else None
+
+    def best_for_problem(self, problem_hash):
+        """Highest-fitness stored entry for the problem under any parameters, or None."""
+        best = None
+        for path in glob.glob(os.path.join(self.directory, f"{problem_hash[:16]}-*.pkl")):
+            entry = self._load(path)
+            if entry and entry.get('problem') == problem_hash and (best is None or entry['fitness'] > best['fitness']):
+                best = entry
+        return best
+
+    def put(self, problem_hash, key, timetable, fitness, individual=None):
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {
+            'problem': problem_hash,
+            'key': key,
+            'timetable': timetable,
+            'fitness': fitness,
+            'individual': individual,
+            'created': time.time(),
+        }
+        path = self._path(problem_hash, key)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)  # readers never see a half-written file
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries beyond the size limits."""
+        files = []
+        for path in glob.glob(os.path.join(self.directory, '*.pkl')):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort(reverse=True)  # most recently used first
+
+        total = 0
+        for i, (_, size, path) in enumerate(files):
+            total += size
+            if i >= self.max_entries or (self.max_bytes is not None and total > self.max_bytes):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def clear(self):
+        for path in glob.glob(os.path.join(self.directory, '*.pkl')):
+            os.remove(path)
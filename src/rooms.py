@@ -0,0 +1,79 @@
+import os
+from bisect import bisect_left
+from collections import namedtuple
+
+import pandas as pd
+
+ROOMS_CONFIG = 'rooms_config.csv'
+
+# One bookable room; capacity 0 means unknown (fits any section)
+Room = namedtuple('Room', ['id', 'name', 'type', 'capacity'])
+
+
+class RoomIndex:
+    """Rooms grouped by type, each group sorted by capacity (smallest first).
+
+    eligible(room_type, size) returns the ids of the rooms of that type
+    that seat `size` students, smallest first, so taking the first free
+    one is a best-fit assignment and large rooms are kept for large
+    sections. The answer for every capacity threshold is precomputed, so
+    a lookup is a dictionary hit after one bisect. When no room of the
+    type is large enough, all rooms of the type are eligible, largest first.
+    """
+
+    def __init__(self, rooms):
+        self.rooms = tuple(Room(i, str(name), str(room_type), int(capacity))
+                           for i, (name, room_type, capacity) in enumerate(rooms))
+        self.names = tuple(room.name for room in self.rooms)
+
+        by_type = {}
+        for room in self.rooms:
+            by_type.setdefault(room.type, []).append(room)
+
+        # (room type, capacity threshold) -> eligible room ids, smallest rooms first
+        self.thresholds = {}
+        self.index = {}
+        for room_type, rooms in by_type.items():
+            rooms.sort(key=lambda room: (room.capacity, room.id))
+            capacities = sorted({room.capacity for room in rooms})
+            self.thresholds[room_type] = capacities
+            for capacity in capacities:
+                self.index[(room_type, capacity)] = tuple(
+                    room.id for room in rooms if room.capacity >= capacity or room.capacity == 0)
+            self.index[(room_type, None)] = tuple(room.id for room in reversed(rooms))
+
+    @classmethod
+    def from_names(cls, names):
+        """Index over bare room names, typed by name ('Lab-01' is a lab) with unknown capacity."""
+        return cls((name, 'Lab' if 'Lab' in name else 'Lecture', 0) for name in names)
+
+    @classmethod
+    def from_config(cls, path=ROOMS_CONFIG, default_names=None):
+        """Index from rooms_config.csv (Room, Type, Capacity); default_names if it is missing."""
+        if not os.path.exists(path):
+            return cls.from_names(default_names or [])
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        capacity = pd.to_numeric(df['Capacity'], errors='coerce').fillna(0).astype(int) if 'Capacity' in df else 0
+        df = df.assign(Capacity=capacity)
+        return cls(zip(df['Room'].str.strip(), df['Type'].str.strip(), df['Capacity']))
+
+    def eligible(self, room_type, size=0):
+        """Ids of rooms of room_type seating at least size students, smallest first."""
+        capacities = self.thresholds.get(room_type)
+        if not capacities:
+            return ()
+        i = bisect_left(capacities, size) if size else 0
+        return self.index[(room_type, capacities[i] if i < len(capacities) else None)]
+
+    def without(self, names):
+        """Index with the named rooms taken out of service."""
+        names = set(names)
+        return RoomIndex((room.name, room.type, room.capacity) for room in self.rooms if room.name not in names)
+
+    def __len__(self):
+        return len(self.rooms)
+
+
+def rooms_for(csv_file, default_names=None):
+    """Room index from the rooms_config.csv next to a course CSV."""
+    return RoomIndex.from_config(os.path.join(os.path.dirname(csv_file), ROOMS_CONFIG), default_names)
@@ -0,0 +1,48 @@
+import pandas as pd
+
+
+class ScheduleStore:
+    """One institution-wide timetable with class and faculty indexes.
+
+    Built once per dataset version; the student and teacher views are
+    slices looked up by class or faculty name instead of separate
+    scheduling runs, so every view agrees on room and faculty use.
+    warnings are the messages generation produced for the user.
+    """
+
+    def __init__(self, timetable_df, clash_log=None, warnings=None):
+        self.timetable = timetable_df.reset_index(drop=True)
+        self.clash_log = list(clash_log or [])
+        self.warnings = list(warnings or [])
+        self.by_class = {}
+        self.by_faculty = {}
+
+        if self.timetable.empty:
+            return
+
+        for position, (class_name, faculty) in enumerate(zip(self.timetable['Class'], self.timetable['Faculty'])):
+            self.by_class.setdefault(class_name, []).append(position)
+            # Labs can list several faculty separated by ';'
+            for name in str(faculty).split(';'):
+                self.by_faculty.setdefault(name.strip(), []).append(position)
+
+    def _slice(self, positions):
+        if not positions:
+            return pd.DataFrame()
+
+        rows = self.timetable.iloc[positions].reset_index(drop=True)
+        pairs = set(zip(rows['Class'], rows['Subject']))
+        rows.attrs['clash_log'] = [e for e in self.clash_log if (e['Class'], e['Subject']) in pairs]
+        return rows
+
+    def for_class(self, class_name):
+        return self._slice(self.by_class.get(class_name, []))
+
+    def for_faculty(self, faculty_name):
+        return self._slice(self.by_faculty.get(faculty_name, []))
+
+    def classes(self):
+        return sorted(self.by_class)
+
+    def faculty(self):
+        return sorted(self.by_faculty)
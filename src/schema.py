@@ -0,0 +1,150 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Source column -> canonical column; timetable_data.csv ships with the left-hand names
+COLUMN_MAP = {
+    'StudentGroup': 'Class',
+    'FacultyName': 'Faculty',
+}
+
+# Canonical course columns and their in-memory dtypes; anything else in the file is not read
+COURSE_SCHEMA = {
+    'Class': 'category',
+    'Subject': 'str',
+    'Code': 'str',
+    'Type': 'category',
+    'Hours': 'int16',
+    'Enrollment': 'int16',
+    'FacultyID': 'category',
+    'Faculty': 'category',
+    'RoomType': 'category',
+}
+REQUIRED_COLUMNS = ('Class', 'Subject', 'Hours', 'Faculty')
+# Whole non-negative numbers up to the int16 max; blank means 0 (Enrollment 0: section size unknown)
+COUNT_COLUMNS = ('Hours', 'Enrollment')
+
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+
+
+def _source_columns(names, column_map):
+    """{source name: canonical name} for the file columns the schema needs."""
+    present = set(names)
+    wanted = {}
+    for name in names:
+        canonical = column_map.get(name, name)
+        # A column already named canonically wins over a mapped alias
+        if canonical in COURSE_SCHEMA and (canonical == name or canonical not in present):
+            wanted[name] = canonical
+    return wanted
+
+
+def _read_arrow_columns(path, parquet):
+    try:
+        import pyarrow.parquet as pq
+        import pyarrow.ipc as ipc
+    except ImportError:
+        raise ImportError(f"❌ Reading {os.path.basename(path)} needs pyarrow (pip install pyarrow)")
+
+    if parquet:
+        return pq.read_schema(path).names
+    with ipc.open_file(path) as reader:
+        return reader.schema.names
+
+
+def _per_value(series, check):
+    """Apply a vectorized check to each distinct value only and broadcast it back.
+
+    Course columns repeat a handful of values over many rows, so this
+    avoids string work per row.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    result = check(pd.Series(uniques, dtype=object)).to_numpy()
+    return pd.Series(result[codes], index=series.index)
+
+
+def _is_blank(values):
+    return values.isna() | (values.astype(str).str.strip() == '')
+
+
+def load_courses(path, column_map=None):
+    """Read a course table (CSV, Parquet or Arrow IPC) into the canonical typed frame.
+
+    Only schema columns are read; column_map (default COLUMN_MAP) renames
+    source columns. Text columns are categoricals or str with '' for blanks
+    and Hours / Enrollment are int16; invalid rows raise ValueError.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"❌ File not found: {path}")
+    column_map = COLUMN_MAP if column_map is None else column_map
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension in PARQUET_EXTENSIONS or extension in ARROW_EXTENSIONS:
+        parquet = extension in PARQUET_EXTENSIONS
+        wanted = _source_columns(_read_arrow_columns(path, parquet), column_map)
+        reader = pd.read_parquet if parquet else pd.read_feather
+        df = reader(path, columns=list(wanted))
+    else:
+        wanted = _source_columns(pd.read_csv(path, nrows=0).columns, column_map)
+        # Counts are read as text so blanks and typos can be reported, not guessed
+        dtypes = {source: 'str' if canonical in COUNT_COLUMNS else COURSE_SCHEMA[canonical]
+                  for source, canonical in wanted.items()}
+        df = pd.read_csv(path, usecols=list(wanted), dtype=dtypes, keep_default_na=False)
+
+    return validate_courses(canonical_columns(df, column_map), path)
+
+
+def canonical_columns(df, column_map=None):
+    """df with source columns renamed by column_map (default COLUMN_MAP) and only schema columns kept."""
+    column_map = COLUMN_MAP if column_map is None else column_map
+    wanted = _source_columns(df.columns, column_map)
+    df = df[list(wanted)].rename(columns=wanted)
+    return df[[c for c in COURSE_SCHEMA if c in df.columns]]
+
+
+def validate_courses(df, source='courses'):
+    """Check a canonical course frame in one vectorized pass and apply the schema dtypes."""
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"❌ {source} is missing required columns {missing} "
+                         f"(found {list(df.columns)}; map other names with column_map)")
+
+    counts = {}
+    invalid = pd.Series(False, index=df.index)
+    for column in COUNT_COLUMNS:
+        if column in df.columns:
+            raw = df[column]
+            counts[column] = _per_value(raw, lambda values: pd.to_numeric(values, errors='coerce'))
+            blank = _per_value(raw, _is_blank)
+            values = counts[column]
+            # Larger counts would wrap around in the int16 cast below
+            too_big = values > np.iinfo(COURSE_SCHEMA[column]).max
+            invalid |= ~blank & (values.isna() | (values < 0) | (values % 1 != 0) | too_big)
+
+    # Rows that will be scheduled need a class, subject and faculty
+    scheduled = counts['Hours'].fillna(0) > 0
+    for column in ('Class', 'Subject', 'Faculty'):
+        invalid |= scheduled & _per_value(df[column], _is_blank)
+
+    if invalid.any():
+        rows = (df.index[invalid] + 2).tolist()  # 1-based data rows after the header line
+        raise ValueError(f"❌ {source} has {len(rows)} invalid course rows "
+                         f"(bad Hours/Enrollment or blank Class/Subject/Faculty), e.g. lines {rows[:10]}")
+
+    df = df.copy()
+    for column, values in counts.items():
+        df[column] = values.fillna(0).astype(COURSE_SCHEMA[column])
+    for column in df.columns:
+        dtype = COURSE_SCHEMA[column]
+        if column in counts:
+            continue
+        if dtype == 'category':
+            if not isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].fillna('').astype(str).astype('category')
+            elif df[column].isna().any():
+                df[column] = df[column].cat.add_categories('').fillna('')
+        else:
+            df[column] = df[column].fillna('').astype(str)
+    return df.reset_index(drop=True)
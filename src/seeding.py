@@ -0,0 +1,168 @@
+from src.genome import Individual
+from src.occupancy import OccupancyGrid, span_mask
+
+
+class GreedySeeder:
+    """Most-constrained-first construction with forward checking.
+
+    Static data (neighbours sharing a class or faculty, faculty load) is
+    computed once per problem; build() then makes one individual:
+
+    - the next block is the unplaced one with the fewest feasible
+      (day, start) placements left, ties broken by scarcer rooms (labs),
+      heavier faculty load, then at random;
+    - its candidates come from the per-day feasible start lists, keeping
+      only starts with a free eligible room (a random sample of
+      max_candidates when there are more);
+    - a candidate that would empty a neighbour's domain is skipped when
+      another exists, and the one removing the fewest neighbour options
+      wins (least-constraining value).
+
+    A block with no feasible start is placed ignoring daily limits if the
+    class and faculty are free somewhere, as create_individual does.
+    Starts and rooms come from the block's domain (src.availability), and
+    fixed lectures are placed before anything else.
+    """
+
+    def __init__(self, ga, max_candidates=8):
+        self.problem = ga.problem
+        self.max_candidates = max_candidates
+        self.n_days = len(ga.days)
+        self.grid = ga.grid
+        self.domains = ga.domains
+        self.n_slots = ga.grid.n_slots
+        self.max_class_hours = ga.constraints.period_limit('class_hours', ga.problem, self.n_slots)
+        self.max_faculty_hours = ga.constraints.period_limit('faculty_hours', ga.problem, self.n_slots)
+
+        blocks = self.problem.blocks
+        by_class, by_faculty, faculty_load = {}, {}, {}
+        for block in blocks:
+            by_class.setdefault(block.class_id, []).append(block.id)
+            for f in block.faculty:
+                by_faculty.setdefault(f, []).append(block.id)
+                faculty_load[f] = faculty_load.get(f, 0) + block.duration
+
+        self.neighbours = []
+        for block in blocks:
+            linked = set(by_class[block.class_id])
+            for f in block.faculty:
+                linked.update(by_faculty[f])
+            linked.discard(block.id)
+            self.neighbours.append(tuple(sorted(linked)))
+
+        self.load = [max((faculty_load[f] for f in block.faculty), default=0) for block in blocks]
+
+    def build(self, rng):
+        blocks = self.problem.blocks
+        individual = Individual(len(blocks))
+        rooms = self.domains.room_grid()
+        faculty = OccupancyGrid(self.n_slots)
+        classes = OccupancyGrid(self.n_slots)
+
+        def occupy(block, day, start, room):
+            individual.place(block.id, day, start, room)
+            rooms.occupy(room, day, start, block.duration)
+            classes.occupy(block.class_id, day, start, block.duration)
+            for f in block.faculty:
+                faculty.occupy(f, day, start, block.duration)
+
+        def day_starts(block, day):
+            """Feasible starts for block on day: class/faculty free and within daily limits."""
+            if classes.hours(block.class_id, day) + block.duration > self.max_class_hours:
+                return []
+            if any(faculty.hours(f, day) + block.duration > self.max_faculty_hours for f in block.faculty):
+                return []
+            busy = classes.mask(block.class_id, day) | faculty.busy(block.faculty, day)
+            return self.domains.free_starts(block.id, busy, day)
+
+        for b, (day, start, _) in self.domains.pinned.items():
+            room = self.domains.pin_room(b, rooms)
+            if room is not None:
+                occupy(blocks[b], day, start, room)
+
+        # Domain size per (block, day); only neighbours' entries change after a placement
+        unplaced = {block.id for block in blocks if block.rooms and block.id not in self.domains.pinned}
+        sizes = {b: [len(day_starts(blocks[b], day)) for day in range(self.n_days)] for b in unplaced}
+
+        while unplaced:
+            b = min(unplaced, key=lambda b: (sum(sizes[b]), len(blocks[b].rooms), -self.load[b], rng.random()))
+            block = blocks[b]
+            unplaced.discard(b)
+
+            # Feasible starts in random order; rooms are only checked until enough candidates are found
+            starts = [(day, start) for day in range(self.n_days) for start in day_starts(block, day)]
+            rng.shuffle(starts)
+            candidates = []
+            for day, start in starts:
+                span = span_mask(start, block.duration)
+                free_rooms = [r for r in block.rooms if not rooms.mask(r, day) & span]
+                if free_rooms:
+                    candidates.append((day, start, free_rooms))
+                    if len(candidates) == self.max_candidates:
+                        break
+
+            if candidates:
+                day, start, room = self._least_constraining(block, candidates, sizes, unplaced, classes, faculty, rng)
+            else:
+                placement = self._fallback(block, classes, faculty, rooms, rng)
+                if placement is None:
+                    continue
+                day, start, room = placement
+
+            occupy(block, day, start, room)
+
+            # Forward checking: refresh the neighbours' domains on that day
+            for n in self.neighbours[b]:
+                if n in unplaced:
+                    sizes[n][day] = len(day_starts(blocks[n], day))
+
+        return individual
+
+    def _least_constraining(self, block, candidates, sizes, unplaced, classes, faculty, rng):
+        """Pick the candidate that leaves the neighbours the most options."""
+        blocks = self.problem.blocks
+        neighbours = [blocks[n] for n in self.neighbours[block.id] if n in unplaced]
+
+        best, best_key = None, None
+        for day, start, free_rooms in candidates:
+            span = span_mask(start, block.duration)
+            lost, wiped = 0, 0
+            for other in neighbours:
+                # Neighbours share the class or a faculty, so the span is taken for them
+                same_class = other.class_id == block.class_id
+                shared = [f for f in other.faculty if f in block.faculty]
+                if same_class and classes.hours(other.class_id, day) + block.duration + other.duration > self.max_class_hours:
+                    after = 0
+                elif any(faculty.hours(f, day) + block.duration + other.duration > self.max_faculty_hours for f in shared):
+                    after = 0
+                else:
+                    busy = classes.mask(other.class_id, day) | faculty.busy(other.faculty, day) | span
+                    after = len(self.domains.free_starts(other.id, busy, day))
+
+                before = sizes[other.id]
+                lost += before[day] - after
+                if sum(before) - before[day] + after == 0:
+                    wiped += 1
+
+            key = (wiped, lost)
+            if best_key is None or key < best_key:
+                best, best_key = (day, start, free_rooms), key
+
+        day, start, free_rooms = best
+        return day, start, free_rooms[0]  # best fit: block.rooms is smallest first
+
+    def _fallback(self, block, classes, faculty, rooms, rng):
+        """Class/faculty-free start ignoring daily limits; prefers a free room."""
+        options = []
+        for day in range(self.n_days):
+            busy = classes.mask(block.class_id, day) | faculty.busy(block.faculty, day)
+            for start in self.domains.free_starts(block.id, busy, day):
+                options.append((day, start))
+        if not options:
+            return None
+
+        day, start = rng.choice(options)
+        span = span_mask(start, block.duration)
+        allowed = self.domains.rooms(block.id, day, start)
+        free_rooms = [r for r in allowed if not rooms.mask(r, day) & span]
+        return day, start, free_rooms[0] if free_rooms else rng.choice(allowed)
@@ -0,0 +1,92 @@
+import csv
+import json
+import time
+from contextlib import contextmanager
+
+GENERATION_FIELDS = ['generation', 'best_fitness', 'generation_best', 'mean_fitness', 'worst_fitness',
+                     'evaluations', 'evals_per_sec', 'elapsed_s']
+
+
+class RunReport:
+    """Per-generation convergence statistics and phase timings of one GA run.
+
+    Phases (construction, evaluation, selection, repair) accumulate wall
+    time across the run; each generation adds one row of fitness stats.
+    """
+
+    def __init__(self, **settings):
+        self.settings = settings
+        self.generations = []
+        self.phases = {}
+        self.evaluations = 0
+        self.move_evaluations = 0  # single-move deltas scored by operators
+        self.started = time.perf_counter()
+        self.finished = None
+        self.final_fitness = None
+        self.stop_reason = None
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def record_generation(self, generation, fitness_scores, best_fitness, eval_seconds):
+        """Add one generation's row and return it."""
+        self.evaluations += len(fitness_scores)
+        n = max(len(fitness_scores), 1)
+        row = {
+            'generation': generation,
+            'best_fitness': best_fitness,
+            'generation_best': max(fitness_scores, default=0),
+            'mean_fitness': round(sum(fitness_scores) / n, 2),
+            'worst_fitness': min(fitness_scores, default=0),
+            'evaluations': self.evaluations,
+            'evals_per_sec': round(len(fitness_scores) / eval_seconds, 1) if eval_seconds > 0 else None,
+            'elapsed_s': round(time.perf_counter() - self.started, 4),
+        }
+        self.generations.append(row)
+        return row
+
+    def finish(self, final_fitness, stop_reason):
+        self.finished = time.perf_counter()
+        self.final_fitness = final_fitness
+        self.stop_reason = stop_reason
+
+    def total_seconds(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def to_dict(self):
+        total = self.total_seconds()
+        evaluation = self.phases.get('evaluation', 0.0)
+        return {
+            'settings': self.settings,
+            'final_fitness': self.final_fitness,
+            'stop_reason': self.stop_reason,
+            'generations_run': len(self.generations),
+            'evaluations': self.evaluations,
+            'move_evaluations': self.move_evaluations,
+            'evals_per_sec': round(self.evaluations / evaluation, 1) if evaluation > 0 else None,
+            'total_s': round(total, 4),
+            'phases_s': {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            'generations': self.generations,
+        }
+
+    def to_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+
+    def to_csv(self, path):
+        """Per-generation rows only; phase timings are in the JSON form."""
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=GENERATION_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.generations)
+
+    def summary(self):
+        phases = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in self.phases.items())
+        return (f"{len(self.generations)} generations, {self.evaluations} evaluations "
+                f"(+{self.move_evaluations} move deltas) "
+                f"in {self.total_seconds():.2f}s ({phases})")
@@ -0,0 +1,201 @@
+import os
+from collections import Counter
+
+import pandas as pd
+
+from src.occupancy import free_starts
+
+TIME_CONFIG = 'time_config.csv'
+DAYS_CONFIG = 'days_config.csv'
+DEFAULT_DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+
+# time_config.csv rows with these Slot names are shift windows, not teaching slots
+SHIFT_LABELS = ('morning', 'afternoon', 'evening', 'night')
+
+
+def parse_clock(text, after=None, earliest=None):
+    """Minutes after midnight for '13:30' or '01:30 PM'; bare times are 24-hour.
+
+    A bare morning time that would not come after `after` (an end time
+    read against its start) is taken 12 hours later. In a 12-hour file
+    (see clock_floor) pass the day's first start as `earliest`: a bare
+    time before it is the same time in the afternoon.
+    """
+    text = str(text).strip().upper()
+    suffix = None
+    if text.endswith(('AM', 'PM')):
+        text, suffix = text[:-2].strip(), text[-2:]
+    hour, minute = (int(part) for part in text.split(':'))
+    if suffix == 'PM' and hour < 12:
+        hour += 12
+    elif suffix == 'AM' and hour == 12:
+        hour = 0
+    elif suffix is None and earliest is not None and hour < 12 and hour * 60 + minute < earliest:
+        hour += 12
+    if suffix is None and after is not None and hour < 12 and hour * 60 + minute <= after:
+        hour += 12
+    return hour * 60 + minute
+
+
+def is_shift(row):
+    return str(row['Slot']).strip().lower() in SHIFT_LABELS
+
+
+def clock_floor(rows):
+    """First start of a 12-hour time_config (rows as dicts), or None for a 24-hour one.
+
+    A file is 12-hour when its teaching slots, read as 24-hour times, run
+    backwards (S3 11:30-01:00); bare times before the returned start are
+    then afternoon times (pass it to parse_clock as `earliest`).
+    """
+    times = []
+    for row in rows:
+        if not is_shift(row):
+            times += [str(row['Start_Time']).strip(), str(row['End_Time']).strip()]
+    if any(text.upper().endswith(('AM', 'PM')) for text in times):
+        return None
+    minutes = [parse_clock(text) for text in times]
+    if all(a <= b for a, b in zip(minutes, minutes[1:])):
+        return None
+    return minutes[0]
+
+
+def format_clock(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def hours_to_periods(hours, period_minutes):
+    """Whole periods of period_minutes needed to cover `hours` (rounded up)."""
+    return -(-round(hours * 60) // period_minutes)
+
+
+class TimeGrid:
+    """Working days and teaching slots of the week, with the lookups engines need precomputed.
+
+    Slots are (start, end) minutes after midnight, indexed 0..n_slots-1 in
+    time order; a lecture block occupies `duration` consecutive slot
+    indexes. breaks[i] is the gap in minutes between slot i and slot i + 1,
+    and a block may only run across gaps of at most max_gap_minutes, so
+    lectures never straddle lunch. valid_starts[duration] holds the start
+    indexes where a block of that length fits and start_masks[duration]
+    the same starts as a bitmask for the occupancy helpers.
+
+    period_minutes is the usual slot length; course hours and hour-based
+    limits become slot counts with periods() (1 hour = 1 slot only on an
+    hourly grid). clock_floor is set for a 12-hour time_config so bare
+    clock times (locate) are read the way the file was.
+    """
+
+    def __init__(self, days, slots, labels=None, max_gap_minutes=0, clock_floor=None):
+        if not days:
+            raise ValueError("❌ Time grid needs at least one working day")
+        if not slots:
+            raise ValueError("❌ Time grid needs at least one time slot")
+
+        self.days = list(days)
+        self.slots = [(int(start), int(end)) for start, end in slots]
+        self.labels = list(labels) if labels is not None else [
+            f"{format_clock(start)}-{format_clock(end)}" for start, end in self.slots]
+        self.max_gap_minutes = max_gap_minutes
+        self.n_days = len(self.days)
+        self.clock_floor = clock_floor
+        self.n_slots = len(self.slots)
+
+        # Most common slot length, shortest on ties
+        lengths = Counter(end - start for start, end in self.slots)
+        self.period_minutes = min(lengths, key=lambda length: (-lengths[length], length)) if lengths else 60
+
+        self.breaks = [self.slots[i + 1][0] - self.slots[i][1] for i in range(self.n_slots - 1)]
+        self.valid_starts = {}
+        self.start_masks = {}
+        for duration in range(1, self.n_slots + 1):
+            starts = tuple(s for s in range(self.n_slots - duration + 1)
+                           if all(gap <= max_gap_minutes for gap in self.breaks[s:s + duration - 1]))
+            self.valid_starts[duration] = starts
+            self.start_masks[duration] = sum(1 << s for s in starts)
+
+        self.slot_at = {format_clock(start): i for i, (start, _) in enumerate(self.slots)}
+
+    @classmethod
+    def hourly(cls, days=DEFAULT_DAYS, first_hour=8, n_slots=8):
+        """Back-to-back one-hour slots; the default is 08:00-16:00, Monday to Friday."""
+        hours = range(first_hour, first_hour + n_slots)
+        return cls(days, [(h * 60, (h + 1) * 60) for h in hours])
+
+    @classmethod
+    def from_config(cls, time_config=TIME_CONFIG, days_config=DAYS_CONFIG, max_gap_minutes=0):
+        """Grid from time_config.csv (Slot, Start_Time, End_Time) and days_config.csv (Day, Working).
+
+        Rows named Morning, Afternoon, Evening or Night are shift windows
+        rather than teaching slots and are skipped; the remaining slots must
+        run forward in time. Bare times are 24-hour unless the slots wrap
+        backwards (see clock_floor). A missing file falls back to the hourly
+        defaults.
+        """
+        days = DEFAULT_DAYS
+        if os.path.exists(days_config):
+            days_df = pd.read_csv(days_config, dtype=str, keep_default_na=False)
+            working = days_df['Working'].str.strip().str.lower() == 'yes'
+            days = days_df.loc[working, 'Day'].str.strip().tolist()
+
+        if not os.path.exists(time_config):
+            return cls.hourly(days)
+
+        rows = pd.read_csv(time_config, dtype=str, keep_default_na=False).to_dict('records')
+        earliest = clock_floor(rows)
+        slots, labels = [], []
+        for row in rows:
+            if is_shift(row):
+                continue
+            start = parse_clock(row['Start_Time'], earliest=earliest)
+            end = parse_clock(row['End_Time'], after=start, earliest=earliest)
+            if end <= start:
+                raise ValueError(f"❌ {time_config}: slot {row['Slot']} ends before it starts")
+            if slots and start < slots[-1][1]:
+                raise ValueError(f"❌ {time_config}: slot {row['Slot']} starts at {format_clock(start)}, "
+                                 f"before slot {labels[-1]} ends at {format_clock(slots[-1][1])}")
+            slots.append((start, end))
+            labels.append(row['Slot'])
+        return cls(days, slots, labels, max_gap_minutes, earliest)
+
+    def periods(self, hours):
+        """Slots needed for `hours` of teaching: ceil(hours * 60 / period_minutes)."""
+        return hours_to_periods(hours, self.period_minutes)
+
+    def starts(self, duration):
+        """Start indexes where `duration` consecutive slots fit (no long break inside)."""
+        return self.valid_starts.get(duration, ())
+
+    def free_starts(self, busy, duration):
+        """Valid starts for `duration` slots that are clear of the `busy` bitmask."""
+        return free_starts(busy, duration, self.n_slots, self.start_masks.get(duration, 0))
+
+    def start_time(self, slot):
+        return format_clock(self.slots[slot][0])
+
+    def end_time(self, slot, duration=1):
+        return format_clock(self.slots[slot + duration - 1][1])
+
+    def span_minutes(self, slot, duration=1):
+        return self.slots[slot + duration - 1][1] - self.slots[slot][0]
+
+    def locate(self, start_time, end_time):
+        """(start slot, duration) of a lecture given as clock times, or None off the grid."""
+        start = self.slot_at.get(format_clock(parse_clock(start_time, earliest=self.clock_floor)))
+        if start is None:
+            return None
+        end = parse_clock(end_time, after=self.slots[start][0], earliest=self.clock_floor)
+        for duration in range(1, self.n_slots - start + 1):
+            if self.slots[start + duration - 1][1] == end:
+                return start, duration
+        return None
+
+    def key(self):
+        """Plain description of the grid for hashing (see src.result_cache)."""
+        return {'days': self.days, 'slots': self.slots, 'max_gap_minutes': self.max_gap_minutes}
+
+
+def grid_for(csv_file):
+    """Time grid from the config files next to a course CSV."""
+    directory = os.path.dirname(csv_file)
+    return TimeGrid.from_config(os.path.join(directory, TIME_CONFIG), os.path.join(directory, DAYS_CONFIG))
@@ -2,15 +2,12 @@ import pandas as pd
 import random
 import os
 from datetime import datetime
+from src.schema import load_courses
+from src.timegrid import TimeGrid
 
-def load_data(filepath="timetable_data.csv"):
-    """Load timetable data from CSV file."""
-    if not os.path.exists(filepath):
-        raise FileNotFoundError(f"❌ File not found: {filepath}")
-    
-    df = pd.read_csv(filepath)
-    df = df.fillna('')
-    return df
+def load_data(filepath="timetable_data.csv", column_map=None):
+    """Load timetable data (CSV, Parquet or Arrow) through the typed course schema."""
+    return load_courses(filepath, column_map)
 
 def get_unique_values(df):
     """Get unique values from dataset."""
@@ -21,18 +18,11 @@ def get_unique_values(df):
         'types': sorted(df['Type'].unique()),
     }
 
-def generate_time_slots():
-    """Generate time slots for timetable."""
-    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-    periods = ['08:00-09:00', '09:00-10:00', '10:00-11:00', 
-               '11:00-12:00', '12:00-13:00', '14:00-15:00', '15:00-16:00']
-    
-    slots = []
-    for day in days:
-        for period in periods:
-            slots.append(f"{day} {period}")
-    
-    return slots
+def generate_time_slots(grid=None):
+    """Generate 'Day HH:MM-HH:MM' time slot labels from the time grid."""
+    grid = grid if grid is not None else TimeGrid.from_config()
+    return [f"{day} {grid.start_time(slot)}-{grid.end_time(slot)}"
+            for day in grid.days for slot in range(grid.n_slots)]
 
 def generate_classrooms():
     """Generate classroom list."""
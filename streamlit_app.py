@@ -1,6 +1,8 @@
+import time
 import streamlit as st
 import pandas as pd
-from src.ga_timetable import GeneticAlgorithmTimetable
+from src.engines import ENGINE_LABELS
+from src.jobs import JobRunner, timetable_job, PENDING, RUNNING, DONE, FAILED
 
 # Set page config
 st.set_page_config(page_title="Timetable Scheduler", layout="wide", initial_sidebar_state="expanded")
@@ -48,14 +50,52 @@ st.markdown('<div class="main-header">📚 INTELLIGENT TIMETABLE GA SYSTEM</div>
 
 # Sidebar controls
 st.sidebar.header("⚙️ Configuration")
+engine = st.sidebar.selectbox("Engine", list(ENGINE_LABELS), format_func=ENGINE_LABELS.get)
 generations = st.sidebar.slider("Generations", 10, 100, 50)
 population_size = st.sidebar.slider("Population Size", 5, 50, 20)
+time_budget = st.sidebar.number_input("Time Budget (s, 0 = no limit)", min_value=0, max_value=600, value=0)
 
-# Generate timetable button
+@st.cache_resource
+def get_job_runner():
+    """Background generation pool shared by all sessions"""
+    return JobRunner(max_workers=2)
+
+runner = get_job_runner()
+
+# Generate timetable button: queue a background job instead of blocking this script
 if st.sidebar.button("🚀 Generate Timetable", key="generate"):
-    with st.spinner("Generating timetable..."):
-        ga = GeneticAlgorithmTimetable(csv_file="timetable_data.csv")
-        timetable, fitness = ga.run(generations=generations, population_size=population_size)
+    st.session_state.job_id = runner.submit(
+        timetable_job("timetable_data.csv", engine=engine, generations=generations,
+                      population_size=population_size, time_budget_s=time_budget or None),
+        key=("timetable_data.csv", engine, generations, population_size, time_budget),
+    )
+
+# Follow the running job
+if 'job_id' in st.session_state:
+    job = runner.status(st.session_state.job_id)
+    
+    if job is None:
+        del st.session_state.job_id
+    elif job['status'] in (PENDING, RUNNING):
+        progress = job['progress']
+        generation = progress.get('generation', 0)
+        total = progress.get('generations', generations)
+        if job['status'] == PENDING:
+            st.info("⏳ Waiting for a free generation worker...")
+        else:
+            st.progress(min(generation / max(total, 1), 1.0),
+                        text=f"🧬 Generation {generation}/{total} | Best fitness: {progress.get('best_fitness', 0)}")
+            
+            # Live convergence plot
+            if progress.get('history'):
+                history = pd.DataFrame(progress['history']).set_index('generation')
+                series = [c for c in ('best_fitness', 'mean_fitness', 'worst_fitness', 'current_fitness') if c in history]
+                st.line_chart(history[series])
+        time.sleep(0.5)
+        st.rerun()
+    elif job['status'] == DONE:
+        timetable, fitness = runner.result(st.session_state.job_id)
+        del st.session_state.job_id
         
         if timetable:
             df_tt = pd.DataFrame(timetable)
@@ -64,9 +104,13 @@ if st.sidebar.button("🚀 Generate Timetable", key="generate"):
             # Store in session state
             st.session_state.df_timetable = df_tt
             st.session_state.fitness = fitness
+            st.session_state.run_report = job['progress'].get('run_report')
             st.success("✅ Timetable generated successfully!")
         else:
             st.error("❌ Failed to generate timetable!")
+    elif job['status'] == FAILED:
+        del st.session_state.job_id
+        st.error(f"❌ Failed to generate timetable! {job['error'].splitlines()[0]}")
 
 # Check if timetable exists in session
 if 'df_timetable' in st.session_state:
@@ -78,6 +122,31 @@ if 'df_timetable' in st.session_state:
     with col2:
         st.markdown(f'<div class="fitness-box">Fitness Score: {fitness}</div>', unsafe_allow_html=True)
     
+    # Convergence and timing of the run that produced this timetable
+    run_report = st.session_state.get('run_report')
+    if run_report:
+        with st.expander("📈 Convergence & Run Report"):
+            history = pd.DataFrame(run_report['generations'])
+            if not history.empty:
+                st.line_chart(history.set_index('generation')[['best_fitness', 'mean_fitness', 'worst_fitness']])
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Generations", run_report['generations_run'])
+            with col2:
+                st.metric("Evaluations/sec", run_report['evals_per_sec'] or 0)
+            with col3:
+                st.metric("Total Time (s)", run_report['total_s'])
+            
+            st.write("**Phase Timings (s):**")
+            st.dataframe(pd.DataFrame([run_report['phases_s']]), use_container_width=True, hide_index=True)
+            st.download_button(
+                label="📥 Download Run Report (CSV)",
+                data=history.to_csv(index=False),
+                file_name="run_report.csv",
+                mime="text/csv"
+            )
+    
     # Create tabs
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Daily Schedule", "📚 Subjects", "🏫 By Section", "👨‍🏫 By Faculty", "📥 Download"])
     
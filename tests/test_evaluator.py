@@ -0,0 +1,60 @@
+import os
+import random
+
+import pytest
+
+from benchmark_fitness import random_move, reference_fitness
+from src.ga_timetable import GeneticAlgorithmTimetable
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'timetable_data.csv')
+MOVES = 300
+
+
+@pytest.fixture(scope='module')
+def ga():
+    return GeneticAlgorithmTimetable(csv_file=DATA)
+
+
+def individuals(ga, rng, count=4):
+    population = [ga.create_individual(rng) for _ in range(count)]
+    population.append(ga.create_greedy_individual(rng))
+    return population
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_delta_evaluator_matches_reference(ga, seed):
+    rng = random.Random(seed)
+    for individual in individuals(ga, rng):
+        evaluator = ga.make_evaluator(individual)
+        assert evaluator.fitness() == reference_fitness(ga, individual)
+        for _ in range(MOVES):
+            move = random_move(ga, individual, rng)
+            before = evaluator.penalty
+            predicted = evaluator.delta(move)
+            evaluator.apply(move)
+            assert evaluator.penalty - before == predicted
+            assert evaluator.fitness() == reference_fitness(ga, individual)
+
+
+def test_reset_evaluator_matches_reference(ga):
+    rng = random.Random(4)
+    evaluator = None
+    for individual in individuals(ga, rng):
+        if evaluator is None:
+            evaluator = ga.make_evaluator(individual)
+        else:
+            evaluator.reset(individual)
+        for _ in range(MOVES // 3):
+            evaluator.apply(random_move(ga, individual, rng))
+            assert evaluator.fitness() == reference_fitness(ga, individual)
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_batch_fitness_matches_reference(ga, seed):
+    rng = random.Random(seed)
+    population = individuals(ga, rng)
+    for _ in range(MOVES // 10):
+        for individual in population:
+            ga.make_evaluator(individual).apply(random_move(ga, individual, rng))
+        expected = [reference_fitness(ga, individual) for individual in population]
+        assert ga.calculate_fitness_batch(population) == expected
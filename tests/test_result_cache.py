@@ -0,0 +1,18 @@
+import os
+
+from src.result_cache import ResultCache
+
+PROBLEM = 'a' * 64
+
+
+def test_unreadable_entry_is_a_miss_and_deleted(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put(PROBLEM, 'good', [], 500)
+    cache.put(PROBLEM, 'bad', [], 600)
+    path = cache._path(PROBLEM, 'bad')
+    with open(path, 'wb') as f:
+        f.write(b'\x80\x04truncated')
+
+    assert cache.get(PROBLEM, 'bad') is None
+    assert not os.path.exists(path)
+    assert cache.best_for_problem(PROBLEM)['fitness'] == 500
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from src.schema import validate_courses
+
+
+def courses(**columns):
+    base = {
+        'Class': ['BSCS-4A', 'BSCS-4A'],
+        'Subject': ['Data Structures', 'Seminar'],
+        'Hours': ['3', '3'],
+        'Faculty': ['Mr. Usman Ali', 'Dr. Ayesha Khan'],
+    }
+    base.update(columns)
+    return pd.DataFrame(base)
+
+
+def test_blank_hours_is_zero():
+    df = validate_courses(courses(Hours=['3', '']))
+    assert df['Hours'].tolist() == [3, 0]
+    assert df['Hours'].dtype == 'int16'
+
+
+def test_bad_hours_are_rejected():
+    for bad in ('-1', '1.5', 'three', '40000'):
+        with pytest.raises(ValueError, match='1 invalid course rows'):
+            validate_courses(courses(Hours=['3', bad]))
+
+
+def test_mostly_blank_enrollment_is_valid():
+    df = validate_courses(courses(Enrollment=['45', '']))
+    assert df['Enrollment'].tolist() == [45, 0]
+    assert df['Enrollment'].dtype == 'int16'